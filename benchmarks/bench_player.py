@@ -0,0 +1,375 @@
+# benchmarks/bench_player.py - GuildPlayer / YouTubeMixQueue 오프라인 성능 측정
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.bench_player --output bench_output.json
+#   python -m benchmarks.bench_player --compare baseline.json
+#
+# 네트워크, Discord 토큰, YouTube API 키, FFmpeg 없이 실행됩니다.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from benchmarks import fakes
+from benchmarks.fakes import Latency
+
+# 비교 시 값이 클수록 좋은 지표 (나머지는 작을수록 좋음)
+HIGHER_IS_BETTER = ('ops_per_s', 'added')
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except Exception:
+        return ''
+
+
+def percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def wait_for(predicate, timeout: float, interval: float = 0.005) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(interval)
+    return predicate()
+
+
+def _mix_track(index: int) -> Dict:
+    video_id = fakes.fake_video_id(f'queue:{index}')
+    return {
+        "title": f"Queued track {index}",
+        "duration": 200,
+        "user": "<@1>",
+        "id": video_id,
+        "video_url": f"https://www.youtube.com/watch?v={video_id}",
+        "stream_url": f"fake://stream/{video_id}",
+        "uploader": "Benchmark",
+    }
+
+
+# ---------- 측정 항목 ----------
+
+async def bench_queue_ops(env: fakes.FakeEnvironment, iterations: int) -> Dict:
+    """이벤트 루프에서 실행되는 대기열 관련 연산 처리량 (ops/s)"""
+    from ui.controls import MusicView
+
+    guild = env.create_guild()
+    player = env.get_player(guild)
+    await player.initialize()
+    player.queue = [_mix_track(i) for i in range(25)]
+    player.current = [_mix_track(-1)]
+    mix_songs = [
+        {'id': fakes.fake_video_id(f'mix:{i}'), 'title': f'Mix {i}', 'duration': 100 + i,
+         'uploader': 'Benchmark', 'url': f"https://www.youtube.com/watch?v={fakes.fake_video_id(f'mix:{i}')}"}
+        for i in range(25)
+    ]
+    extra = _mix_track(1000)
+
+    async def enqueue_remove():
+        async with player._processing_lock:
+            player.queue.append(extra)
+        async with player._processing_lock:
+            player.queue.remove(extra)
+
+    async def build_view():
+        view = MusicView(player)
+        view.stop()
+
+    async def queue_info():
+        player.get_queue_info()
+
+    async def filter_songs():
+        player.youtube_mix_queue.filter_songs(mix_songs, 20)
+
+    results = {}
+    for name, operation in (('enqueue_remove', enqueue_remove), ('build_view', build_view),
+                            ('queue_info', queue_info), ('filter_songs', filter_songs)):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await operation()
+        elapsed = time.perf_counter() - started
+        results[f'{name}_ops_per_s'] = round(iterations / elapsed, 1) if elapsed else 0.0
+
+    player.current = []
+    player.queue = []
+    await env.cleanup_player(guild)
+    return results
+
+
+async def bench_time_to_first_audio(env: fakes.FakeEnvironment, requests: int) -> Dict:
+    """메시지 수신 → vc.play 호출까지 걸린 시간 (빈 서버에 첫 곡 요청)"""
+    samples = []
+    failures = 0
+    for i in range(requests):
+        guild = env.create_guild()
+        player = env.get_player(guild)
+        started = time.monotonic()
+        await player.handle_message(fakes.user_message(guild, f'benchmark song {i}'))
+
+        played = await wait_for(lambda: player.vc is not None and player.vc.play_calls, timeout=30.0)
+        if played:
+            samples.append(player.vc.play_calls[0] - started)
+        else:
+            failures += 1
+        await env.cleanup_player(guild)
+
+    return {
+        'samples': len(samples),
+        'failures': failures,
+        'p50_s': round(percentile(samples, 50), 4),
+        'p95_s': round(percentile(samples, 95), 4),
+        'max_s': round(max(samples, default=0.0), 4),
+        'mean_s': round(statistics.mean(samples), 4) if samples else 0.0,
+    }
+
+
+async def bench_mix_fill(env: fakes.FakeEnvironment, count: int) -> Dict:
+    """"+20" 버튼과 같은 경로로 믹스 추가 시 첫 곡 / 전체 추가까지 걸린 시간"""
+    guild = env.create_guild()
+    player = env.get_player(guild)
+    await player.handle_message(fakes.user_message(guild, 'benchmark mix seed'))
+    await wait_for(lambda: bool(player.current), timeout=30.0)
+
+    current_url = player.current[0]['video_url']
+    video_id = player.youtube_mix_queue.extract_video_id(current_url)
+    mix_queue = player.youtube_mix_queue
+
+    started = time.monotonic()
+    result = await mix_queue.add_mix_songs_by_command(video_id, count)
+    list_s = time.monotonic() - started
+
+    first_track_s = None
+    task = mix_queue._processing_tasks.get(video_id)
+    if task:
+        await wait_for(lambda: any(t.get('from_mix') for t in player.queue) or task.done(), timeout=60.0)
+        first_track_s = time.monotonic() - started
+        await task
+    total_s = time.monotonic() - started
+
+    added = sum(1 for t in player.queue if t.get('from_mix'))
+    await env.cleanup_player(guild)
+    return {
+        'requested': result.get('added_count', 0),
+        'added': added,
+        'list_s': round(list_s, 4),
+        'first_track_s': round(first_track_s, 4) if first_track_s is not None else None,
+        'total_s': round(total_s, 4),
+    }
+
+
+async def bench_playlist_import(env: fakes.FakeEnvironment) -> Dict:
+    """재생목록 URL 요청 → 첫 재생 / 전체 대기열 채움까지 걸린 시간"""
+    guild = env.create_guild()
+    player = env.get_player(guild)
+    started = time.monotonic()
+    await player.handle_message(
+        fakes.user_message(guild, 'https://www.youtube.com/playlist?list=PLbenchmark'))
+
+    played = await wait_for(lambda: player.vc is not None and player.vc.play_calls, timeout=30.0)
+    first_audio_s = player.vc.play_calls[0] - started if played else None
+
+    expected = min(fakes.FakeYoutubeDL.playlist_size, env.player_module.PLAYLIST_MAX_TRACKS)
+    await wait_for(lambda: len(player.queue) + len(player.current) >= expected, timeout=60.0)
+    total_s = time.monotonic() - started
+
+    added = len(player.queue) + len(player.current)
+    await env.cleanup_player(guild)
+    return {
+        'requested': expected,
+        'added': added,
+        'first_audio_s': round(first_audio_s, 4) if first_audio_s is not None else None,
+        'total_s': round(total_s, 4),
+    }
+
+
+async def bench_ui_edits(env: fakes.FakeEnvironment, seconds: float) -> Dict:
+    """한 서버에서 요청/믹스/건너뛰기를 섞은 세션 동안 발생한 메시지 편집 수"""
+    guild = env.create_guild()
+    player = env.get_player(guild)
+    member = fakes.FakeMember(guild.voice_channel)
+    rng = random.Random(7)
+
+    started = time.monotonic()
+    deadline = started + seconds
+    actions = 0
+    mixed = False
+    while time.monotonic() < deadline:
+        roll = rng.random()
+        if roll < 0.5 or not player.current:
+            await player.handle_message(fakes.user_message(guild, f'session song {actions}', member))
+        elif roll < 0.7 and not mixed:
+            video_id = player.youtube_mix_queue.extract_video_id(player.current[0]['video_url'])
+            await player.youtube_mix_queue.add_mix_songs_by_command(video_id, 20)
+            mixed = True
+        elif player.vc and player.vc.is_playing():
+            player.vc.stop()
+        actions += 1
+        await asyncio.sleep(min(rng.uniform(1.0, 4.0), max(0.0, deadline - time.monotonic())))
+
+    elapsed = time.monotonic() - started
+    edits = guild.text_channel.edit_count
+    sends = guild.text_channel.send_count
+    await env.cleanup_player(guild)
+    return {
+        'seconds': round(elapsed, 1),
+        'actions': actions,
+        'edits': edits,
+        'sends': sends,
+        'edits_per_minute': round(edits / (elapsed / 60), 2) if elapsed else 0.0,
+    }
+
+
+BENCHMARKS = ('queue_ops', 'time_to_first_audio', 'mix_fill', 'playlist_import', 'ui_edits')
+
+
+async def run(args) -> Dict:
+    fakes.search_latency = Latency(args.search_latency)
+    fakes.FakeYoutubeDL.configure(
+        extract_latency=Latency(args.extract_latency),
+        mix_latency=Latency(args.mix_latency)
+    )
+    env = fakes.FakeEnvironment(
+        asyncio.get_running_loop(),
+        api_latency=Latency(args.api_latency),
+        connect_latency=Latency(args.connect_latency)
+    )
+
+    from music import extractor
+    await extractor.wait_ready()
+
+    selected = args.only or BENCHMARKS
+    results = {}
+    if 'queue_ops' in selected:
+        results['queue_ops'] = await bench_queue_ops(env, args.iterations)
+    if 'time_to_first_audio' in selected:
+        fakes.FakeAudioSource.track_seconds = 600.0
+        results['time_to_first_audio'] = await bench_time_to_first_audio(env, args.requests)
+    if 'mix_fill' in selected:
+        fakes.FakeAudioSource.track_seconds = 600.0
+        results['mix_fill'] = await bench_mix_fill(env, 20)
+    if 'playlist_import' in selected:
+        fakes.FakeAudioSource.track_seconds = 600.0
+        results['playlist_import'] = await bench_playlist_import(env)
+    if 'ui_edits' in selected:
+        fakes.FakeAudioSource.track_seconds = args.track_seconds
+        results['ui_edits'] = await bench_ui_edits(env, args.ui_seconds)
+
+    return {
+        'suite': 'player',
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'settings': {
+            'search_latency': Latency(args.search_latency).to_dict(),
+            'extract_latency': Latency(args.extract_latency).to_dict(),
+            'mix_latency': Latency(args.mix_latency).to_dict(),
+            'connect_latency': Latency(args.connect_latency).to_dict(),
+            'api_latency': Latency(args.api_latency).to_dict(),
+            'iterations': args.iterations,
+            'requests': args.requests,
+            'ui_seconds': args.ui_seconds,
+            'track_seconds': args.track_seconds,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+
+def _flatten(results: Dict) -> Dict[str, float]:
+    flat = {}
+    for group, values in results.items():
+        for name, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                flat[f'{group}.{name}'] = float(value)
+    return flat
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """기준 결과 대비 threshold 비율 이상 나빠진 지표 목록"""
+    regressions = []
+    now = _flatten(current['results'])
+    before = _flatten(baseline.get('results', {}))
+    for key, old in sorted(before.items()):
+        new = now.get(key)
+        if new is None or old == 0 or key.endswith(('samples', 'requested', 'seconds', 'actions')):
+            continue
+        change = (new - old) / abs(old)
+        worse = -change if key.endswith(HIGHER_IS_BETTER) else change
+        marker = '❌' if worse > threshold else '  '
+        print(f"{marker} {key:45s} {old:12.4f} → {new:12.4f} ({change:+.1%})")
+        if worse > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='GuildPlayer 오프라인 벤치마크 (가짜 Discord / yt-dlp)')
+    parser.add_argument('--output', default='bench_output.json', help='결과 JSON 경로 (- 이면 stdout)')
+    parser.add_argument('--compare', metavar='BASELINE', help='이전 결과 JSON과 비교')
+    parser.add_argument('--threshold', type=float, default=0.15, help='회귀로 판단할 악화 비율 (기본 0.15)')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='일부 항목만 실행')
+    parser.add_argument('--iterations', type=int, default=5000, help='대기열 연산 반복 횟수')
+    parser.add_argument('--requests', type=int, default=10, help='첫 재생 시간 측정 요청 수')
+    parser.add_argument('--ui-seconds', type=float, default=60.0, help='UI 편집 측정 세션 길이 (초)')
+    parser.add_argument('--track-seconds', type=float, default=8.0, help='UI 세션에서 가짜 곡 길이 (초)')
+    parser.add_argument('--search-latency', type=float, default=0.15, help='검색 API 지연 (초)')
+    parser.add_argument('--extract-latency', type=float, default=0.4, help='yt-dlp 정보 추출 지연 (초)')
+    parser.add_argument('--mix-latency', type=float, default=1.5, help='믹스 목록 추출 지연 (초)')
+    parser.add_argument('--connect-latency', type=float, default=0.5, help='음성 연결 지연 (초)')
+    parser.add_argument('--api-latency', type=float, default=0.08, help='메시지 전송/편집 지연 (초)')
+    parser.add_argument('--seed', type=int, default=1, help='지연 지터 난수 시드')
+    parser.add_argument('--verbose', action='store_true', help='봇 로그 출력')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    random.seed(args.seed)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"📊 결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"❌ 성능 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            return 1
+        print("✅ 성능 회귀 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
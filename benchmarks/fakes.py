@@ -0,0 +1,570 @@
+# benchmarks/fakes.py - 네트워크 없이 GuildPlayer를 구동하기 위한 Discord / yt-dlp 대역
+
+import asyncio
+import bisect
+import hashlib
+import itertools
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+from typing import Dict, List, Optional
+
+# discord.py 음성 프레임 (20ms, 48kHz 스테레오 16비트 PCM)
+FRAME_SECONDS = 0.02
+FRAME_BYTES = 3840
+
+_ids = itertools.count(10_000_000_000)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+def install_stand_in_config():
+    """config.py가 없으면 (비밀 값이 들어 있어 저장소에 없음) 벤치마크용 대체 모듈 등록
+
+    반드시 music / utils 모듈을 import 하기 전에 호출해야 합니다.
+    """
+    try:
+        import config  # noqa: F401
+        return False
+    except ImportError:
+        pass
+
+    stand_in = types.ModuleType('config')
+    stand_in.BOT_TOKEN = ''
+    stand_in.YOUTUBE_API_KEY = 'benchmark'
+    stand_in.COOKIES_FILE = os.devnull
+    stand_in.GUILD_SETTINGS_FILE = os.path.join(tempfile.mkdtemp(prefix='musicbot-bench-'), 'guild_settings.json')
+    stand_in.METRICS_PORT = 0
+    stand_in.TRACE_SAMPLE_RATE = 0.0
+    sys.modules['config'] = stand_in
+    return True
+
+
+class Latency:
+    """평균 지연 ± 비율 지터 (초)"""
+
+    def __init__(self, seconds: float, jitter: float = 0.2):
+        self.seconds = seconds
+        self.jitter = jitter
+
+    def sample(self, rng: random.Random = random) -> float:
+        if self.seconds <= 0:
+            return 0.0
+        return max(0.0, self.seconds * rng.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def to_dict(self) -> Dict:
+        return {'seconds': self.seconds, 'jitter': self.jitter}
+
+
+def fake_video_id(seed: str) -> str:
+    return hashlib.sha1(seed.encode('utf-8')).hexdigest()[:11]
+
+
+# ---------- yt-dlp ----------
+
+class FakeYoutubeDL:
+    """yt_dlp.YoutubeDL 대역 - extract_info 호출 시 설정된 지연만큼 스레드를 막음"""
+
+    extract_latency = Latency(0.4)
+    mix_latency = Latency(1.5)
+    mix_size = 25
+    # 일반 재생목록 (list=PL...) 전체 곡 수 - 페이지 하나당 mix_latency만큼 걸림
+    playlist_size = 200
+    # 장애 흉내: 이 player_client 조합은 broken_latency만큼 기다린 뒤 실패
+    broken_clients = set()
+    broken_latency = Latency(5.0)
+    # 차단 흉내: True면 모든 추출이, throttled_cookies에 있는 쿠키 파일로는 해당 추출이 429로 실패
+    throttled = False
+    throttled_cookies = set()
+    calls = 0
+    _calls_lock = threading.Lock()
+
+    def __init__(self, params: Dict = None):
+        self.params = params or {}
+        self.cookiejar = object()
+
+    def close(self):
+        pass
+
+    @classmethod
+    def configure(cls, extract_latency: Latency = None, mix_latency: Latency = None, mix_size: int = None,
+                  playlist_size: int = None):
+        if extract_latency is not None:
+            cls.extract_latency = extract_latency
+        if mix_latency is not None:
+            cls.mix_latency = mix_latency
+        if mix_size is not None:
+            cls.mix_size = mix_size
+        if playlist_size is not None:
+            cls.playlist_size = playlist_size
+
+    def extract_info(self, url: str, download: bool = False) -> Dict:
+        with FakeYoutubeDL._calls_lock:
+            FakeYoutubeDL.calls += 1
+
+        if self.params.get('extract_flat') and 'list=RD' in url:
+            time.sleep(self.mix_latency.sample())
+            seed = url.split('list=RD', 1)[1]
+            rng = random.Random(seed)
+            return {
+                'id': f'RD{seed}',
+                'entries': [
+                    {
+                        'id': fake_video_id(f'{seed}:{i}'),
+                        'title': f'Mix track {i} of {seed}',
+                        # 일부는 길이 필터(30초~20분)에 걸리도록
+                        'duration': rng.choice((20, 95, 180, 240, 300, 420, 1500)),
+                        'uploader': 'Benchmark',
+                    }
+                    for i in range(self.mix_size)
+                ]
+            }
+
+        if self.params.get('extract_flat') and 'list=' in url:
+            time.sleep(self.mix_latency.sample())
+            seed = url.split('list=', 1)[1].split('&', 1)[0]
+            start = self.params.get('playliststart') or 1
+            end = min(self.params.get('playlistend') or self.playlist_size, self.playlist_size)
+            return {
+                'id': seed,
+                'entries': [
+                    {
+                        'id': fake_video_id(f'{seed}:{i}'),
+                        'title': f'Playlist track {i} of {seed}',
+                        'duration': 180,
+                        'uploader': 'Benchmark',
+                    }
+                    for i in range(start, end + 1)
+                ]
+            }
+
+        if self.throttled or self.params.get('cookiefile') in self.throttled_cookies:
+            time.sleep(self.extract_latency.sample())
+            raise RuntimeError('ERROR: Unable to download webpage: HTTP Error 429: Too Many Requests')
+
+        client = tuple(self.params.get('extractor_args', {}).get('youtube', {}).get('player_client', ()))
+        if client in self.broken_clients:
+            time.sleep(self.broken_latency.sample())
+            raise RuntimeError(f'fake extraction failure for client {client}')
+
+        time.sleep(self.extract_latency.sample())
+        video_id = url.rsplit('v=', 1)[-1][:11]
+        return {
+            'id': video_id,
+            'title': f'Track {video_id}',
+            # 가짜 스트림 길이와 맞춰야 조기 종료(이어듣기 복구)로 판정되지 않음
+            'duration': max(1, round(FakeAudioSource.track_seconds)),
+            'uploader': 'Benchmark',
+            'url': f'fake://stream/{video_id}',
+        }
+
+
+# ---------- 오디오 ----------
+
+class FakeAudioSource:
+    """FFmpegPCMAudio 대역 - 정해진 길이만큼 무음 프레임을 돌려줌 (자식 프로세스 없음)"""
+
+    track_seconds = 3.0
+
+    def __init__(self, stream_url: str, **options):
+        self.stream_url = stream_url
+        self.options = options
+        self._process = None
+        self._remaining = int(self.track_seconds / FRAME_SECONDS)
+        self._frame = bytes(FRAME_BYTES)
+
+    def read(self) -> bytes:
+        if self._remaining <= 0:
+            return b''
+        self._remaining -= 1
+        return self._frame
+
+    def is_opus(self) -> bool:
+        return False
+
+    def cleanup(self):
+        self._remaining = 0
+
+
+class FrameStats:
+    """음성 스레드의 프레임 전송 지연(예정 시각 대비) 집계 - 여러 스레드에서 기록"""
+
+    BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 40, 80, 160)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.frames = 0
+            self.late_frames = 0
+            self.max_ms = 0.0
+            self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+
+    def record(self, lateness: float):
+        ms = lateness * 1000
+        index = bisect.bisect_left(self.BUCKETS_MS, ms)
+        with self._lock:
+            self.frames += 1
+            self.counts[index] += 1
+            if ms > FRAME_SECONDS * 1000:
+                self.late_frames += 1
+            if ms > self.max_ms:
+                self.max_ms = ms
+
+    def percentile(self, percent: float) -> float:
+        """버킷 상한 기준 백분위수 (ms)"""
+        with self._lock:
+            total = self.frames
+            counts = list(self.counts)
+        if not total:
+            return 0.0
+        target = total * percent / 100
+        cumulative = 0
+        for bound, count in zip(self.BUCKETS_MS + (self.max_ms,), counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return self.max_ms
+
+    def summary(self) -> Dict:
+        return {
+            'frames': self.frames,
+            'late_frames': self.late_frames,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max_ms, 2),
+        }
+
+
+class FakeVoiceClient:
+    """discord.VoiceClient 대역 - 실제와 같이 스레드 하나가 20ms마다 read() 호출"""
+
+    def __init__(self, channel, frame_stats: Optional[FrameStats] = None):
+        self.channel = channel
+        self.guild = channel.guild
+        self.source = None
+        self.frame_stats = frame_stats
+        self.play_calls: List[float] = []
+        self._connected = True
+        self._stop_event = None
+        self._resumed = None
+        self._thread = None
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def is_playing(self) -> bool:
+        return (self._thread is not None and self._thread.is_alive() and
+                not self._stop_event.is_set() and self._resumed.is_set())
+
+    def is_paused(self) -> bool:
+        return (self._thread is not None and self._thread.is_alive() and
+                not self._stop_event.is_set() and not self._resumed.is_set())
+
+    def play(self, source, *, after=None):
+        if not self._connected:
+            raise RuntimeError('Not connected to voice.')
+        if self.is_playing() or self.is_paused():
+            raise RuntimeError('Already playing audio.')
+
+        self.source = source
+        self.play_calls.append(time.monotonic())
+        self._stop_event = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._thread = threading.Thread(
+            target=self._run, args=(source, after, self._stop_event, self._resumed),
+            name=f'fake-voice-{self.guild.id}', daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, source, after, stop_event: threading.Event, resumed: threading.Event):
+        error = None
+        try:
+            started = time.perf_counter()
+            frames = 0
+            while not stop_event.is_set():
+                if not resumed.is_set():
+                    resumed.wait()
+                    started = time.perf_counter()
+                    frames = 0
+                    continue
+
+                data = source.read()
+                if not data:
+                    break
+
+                if self.frame_stats is not None:
+                    self.frame_stats.record(max(0.0, time.perf_counter() - (started + frames * FRAME_SECONDS)))
+                frames += 1
+                delay = started + frames * FRAME_SECONDS - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        except Exception as e:
+            error = e
+        finally:
+            source.cleanup()
+            if self.source is source:
+                self.source = None
+            if after is not None:
+                after(error)
+
+    def pause(self):
+        if self._resumed is not None:
+            self._resumed.clear()
+
+    def resume(self):
+        if self._resumed is not None:
+            self._resumed.set()
+
+    def stop(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._resumed.set()
+
+    async def move_to(self, channel):
+        await asyncio.sleep(self.channel.connect_latency.sample())
+        self.channel = channel
+
+    async def disconnect(self, *, force: bool = False):
+        self.stop()
+        self._connected = False
+
+
+# ---------- 채널 / 메시지 ----------
+
+class FakeMessage:
+    def __init__(self, channel, content: str = '', author=None, embed=None, view=None):
+        self.id = next_id()
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.author = author
+        self.embed = embed
+        self.view = view
+        self.deleted = False
+        self.edits: List[float] = []
+
+    async def edit(self, **fields):
+        await asyncio.sleep(self.channel.api_latency.sample())
+        self.edits.append(time.monotonic())
+        self.channel.edit_count += 1
+        self.embed = fields.get('embed', self.embed)
+        self.view = fields.get('view', self.view)
+        return self
+
+    async def delete(self):
+        await asyncio.sleep(self.channel.api_latency.sample())
+        self.deleted = True
+
+
+class FakeTextChannel:
+    def __init__(self, guild, api_latency: Latency):
+        self.id = next_id()
+        self.guild = guild
+        self.name = 'music'
+        self.api_latency = api_latency
+        self.messages: Dict[int, FakeMessage] = {}
+        self.send_count = 0
+        self.edit_count = 0
+
+    async def send(self, content: str = '', *, embed=None, view=None, **kwargs):
+        await asyncio.sleep(self.api_latency.sample())
+        message = FakeMessage(self, content, embed=embed, view=view)
+        self.messages[message.id] = message
+        self.send_count += 1
+        return message
+
+    def get_partial_message(self, message_id: int):
+        # 실제 PartialMessage처럼 조회 없이 편집 가능한 객체 반환
+        message = self.messages.get(message_id)
+        if message is None:
+            message = FakeMessage(self)
+            message.id = message_id
+            self.messages[message_id] = message
+        return message
+
+    async def fetch_message(self, message_id: int):
+        await asyncio.sleep(self.api_latency.sample())
+        message = self.messages.get(message_id)
+        if message is None:
+            import discord
+            raise discord.NotFound(_FakeResponse(404), 'Unknown Message')
+        return message
+
+
+class _FakeResponse:
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = 'Not Found'
+
+
+class FakeVoiceChannel:
+    def __init__(self, guild, connect_latency: Latency, frame_stats: Optional[FrameStats] = None):
+        self.id = next_id()
+        self.guild = guild
+        self.name = 'voice'
+        self.connect_latency = connect_latency
+        self.frame_stats = frame_stats
+
+    async def connect(self, **kwargs):
+        await asyncio.sleep(self.connect_latency.sample())
+        return FakeVoiceClient(self, self.frame_stats)
+
+
+class FakeGuild:
+    def __init__(self, api_latency: Latency, connect_latency: Latency, frame_stats: Optional[FrameStats] = None):
+        self.id = next_id()
+        self.name = f'bench-{self.id}'
+        self.text_channel = FakeTextChannel(self, api_latency)
+        self.voice_channel = FakeVoiceChannel(self, connect_latency, frame_stats)
+
+
+class FakeMember:
+    def __init__(self, voice_channel: Optional[FakeVoiceChannel]):
+        self.id = next_id()
+        self.bot = False
+        self.display_name = f'user-{self.id}'
+        self.mention = f'<@{self.id}>'
+        self.voice = types.SimpleNamespace(channel=voice_channel) if voice_channel else None
+
+
+class _FakeInteractionResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self):
+        if self._done:
+            raise RuntimeError('This interaction has already been responded to before')
+        self._done = True
+        await asyncio.sleep(self._interaction.api_latency.sample())
+
+    async def send_message(self, content: str = '', **kwargs):
+        await self._respond()
+        self._interaction.replies.append(content)
+
+    async def edit_message(self, **kwargs):
+        await self._respond()
+
+    async def defer(self, **kwargs):
+        await self._respond()
+
+
+class _FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send(self, content: str = '', **kwargs):
+        await asyncio.sleep(self._interaction.api_latency.sample())
+        self._interaction.replies.append(content)
+
+
+class FakeInteraction:
+    """버튼 클릭 대역 - view.<button>.callback(interaction) 으로 전달"""
+
+    def __init__(self, guild: 'FakeGuild', user: FakeMember):
+        self.id = next_id()
+        self.guild = guild
+        self.guild_id = guild.id
+        self.channel = guild.text_channel
+        self.user = user
+        self.api_latency = guild.text_channel.api_latency
+        self.replies: List[str] = []
+        self.response = _FakeInteractionResponse(self)
+        self.followup = _FakeFollowup(self)
+
+
+class FakeBot:
+    """GuildPlayer가 사용하는 bot 속성(loop, get_channel)만 제공"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.guilds: List[FakeGuild] = []
+        self._channels: Dict[int, object] = {}
+
+    def add_guild(self, guild: FakeGuild):
+        self.guilds.append(guild)
+        self._channels[guild.text_channel.id] = guild.text_channel
+        self._channels[guild.voice_channel.id] = guild.voice_channel
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+
+def user_message(guild: FakeGuild, content: str, member: FakeMember = None) -> FakeMessage:
+    """음악 채널에 사용자가 입력한 메시지"""
+    member = member or FakeMember(guild.voice_channel)
+    return FakeMessage(guild.text_channel, content, author=member)
+
+
+# ---------- 검색 ----------
+
+search_latency = Latency(0.15)
+
+
+async def fake_search_and_extract(player, query: str):
+    """GuildPlayer._sync_search_and_extract 대역 (YouTube Data API 호출 대신 지연만 발생)"""
+    await asyncio.sleep(search_latency.sample())
+    video_url = f'https://www.youtube.com/watch?v={fake_video_id(query)}'
+    track_info = await player._extract_track_info(video_url)
+    if track_info:
+        return video_url, track_info
+    return None, None
+
+
+# ---------- 설치 ----------
+
+class FakeEnvironment:
+    """대역을 봇 모듈에 연결하고 가짜 서버를 만들어 주는 진입점"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, api_latency: Latency = None,
+                 connect_latency: Latency = None, frame_stats: Optional[FrameStats] = None):
+        install_stand_in_config()
+
+        from music import extractor
+        from music import history
+        from music import player as player_module
+        from music.ffmpeg_supervisor import supervisor
+        from utils.guild_settings import GuildSettings
+
+        extractor._youtube_dl_class = FakeYoutubeDL
+        supervisor.source_factory = FakeAudioSource
+        player_module.GuildPlayer._sync_search_and_extract = fake_search_and_extract
+
+        # 실제 guild_settings.json을 건드리지 않도록 임시 파일 사용
+        self.settings = GuildSettings(
+            path=os.path.join(tempfile.mkdtemp(prefix='musicbot-bench-'), 'guild_settings.json')
+        )
+        player_module.guild_settings = self.settings
+        # 재생 기록도 임시 DB에 저장
+        history.play_history.path = os.path.join(os.path.dirname(self.settings.path), 'play_history.db')
+
+        self.player_module = player_module
+        self.bot = FakeBot(loop)
+        self.api_latency = api_latency or Latency(0.08)
+        self.connect_latency = connect_latency or Latency(0.5)
+        self.frame_stats = frame_stats
+
+    def create_guild(self) -> FakeGuild:
+        guild = FakeGuild(self.api_latency, self.connect_latency, self.frame_stats)
+        self.bot.add_guild(guild)
+        self.settings.set_music_channel(guild.id, guild.text_channel.id)
+        return guild
+
+    def get_player(self, guild: FakeGuild):
+        return self.player_module.get_player(guild.id, self.bot)
+
+    async def cleanup_player(self, guild: FakeGuild):
+        await self.player_module.cleanup_player(guild.id)
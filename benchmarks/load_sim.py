@@ -0,0 +1,306 @@
+# benchmarks/load_sim.py - 다중 서버 부하 시뮬레이터 (호스트/샤드 수 산정용 용량 곡선)
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.load_sim --steps 25 50 100 200 400 --step-seconds 30
+#
+# 단계마다 서버 수를 늘리면서 검색 / "+20" / 건너뛰기 / 중지를 섞어 재생하고,
+# 이벤트 루프 지연, 음성 프레임 전송 지터, CPU, RSS, 스레드 수를 기록합니다.
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from benchmarks import fakes
+from benchmarks.bench_player import git_commit, percentile, wait_for
+from benchmarks.fakes import Latency
+
+# 행동 종류와 비율 (검색, +20, 건너뛰기, 중지)
+ACTIONS = ('search', 'mix', 'skip', 'stop')
+ACTION_WEIGHTS = (0.5, 0.15, 0.25, 0.1)
+
+LOOP_LAG_PROBE_INTERVAL = 0.05
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _rss_bytes() -> int:
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system
+
+
+class Session:
+    """서버 하나의 음성 세션 (서버, 플레이어, 요청 사용자)"""
+
+    def __init__(self, env: fakes.FakeEnvironment):
+        self.guild = env.create_guild()
+        self.player = env.get_player(self.guild)
+        self.member = fakes.FakeMember(self.guild.voice_channel)
+        self.requests = 0
+
+    async def search(self):
+        self.requests += 1
+        message = fakes.user_message(self.guild, f'load {self.guild.id} {self.requests}', self.member)
+        await self.player.handle_message(message)
+
+    async def press(self, action: str):
+        from ui.controls import MusicView
+
+        # 실제처럼 플레이어 메시지에 붙어 있는 View를 재사용 (쿨다운 상태 유지)
+        view = getattr(self.player.message, 'view', None) or MusicView(self.player)
+        button = {'mix': view.mix20_button, 'skip': view.skip_button, 'stop': view.stop_button}[action]
+        await button.callback(fakes.FakeInteraction(self.guild, self.member))
+
+    def is_playing(self) -> bool:
+        return bool(self.player.vc and self.player.vc.is_playing())
+
+
+class LoadSimulator:
+    def __init__(self, env: fakes.FakeEnvironment, frame_stats: fakes.FrameStats, rate: float, seed: int):
+        self.env = env
+        self.frame_stats = frame_stats
+        self.rate = rate
+        self.rng = random.Random(seed)
+        self.sessions: List[Session] = []
+        self._tasks = set()
+        self.action_counts = {action: 0 for action in ACTIONS}
+        self.action_errors = 0
+
+    async def grow(self, target: int, warm_up: float):
+        """target개 서버가 될 때까지 세션을 추가하고 첫 곡 재생 대기"""
+        new_sessions = [Session(self.env) for _ in range(target - len(self.sessions))]
+        self.sessions.extend(new_sessions)
+        for session in new_sessions:
+            self._spawn(session.search())
+            # 한꺼번에 몰리지 않도록 워밍업 시간의 절반에 걸쳐 분산
+            await asyncio.sleep(warm_up / 2 / max(1, len(new_sessions)))
+        await wait_for(lambda: all(s.is_playing() for s in new_sessions), timeout=warm_up / 2, interval=0.1)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.action_errors += 1
+
+    async def drive(self, seconds: float) -> int:
+        """전체 서버 기준 rate * 서버 수 (회/초) 로 무작위 행동 발생 (포아송 도착)"""
+        deadline = time.monotonic() + seconds
+        issued = 0
+        while True:
+            await asyncio.sleep(self.rng.expovariate(self.rate * len(self.sessions)))
+            if time.monotonic() >= deadline:
+                return issued
+
+            session = self.rng.choice(self.sessions)
+            action = self.rng.choices(ACTIONS, ACTION_WEIGHTS)[0]
+            # 재생 중이 아닌 서버에서는 버튼 대신 검색
+            if action != 'search' and not session.player.current:
+                action = 'search'
+
+            self.action_counts[action] += 1
+            issued += 1
+            self._spawn(session.search() if action == 'search' else session.press(action))
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*(self.env.cleanup_player(s.guild) for s in self.sessions), return_exceptions=True)
+
+
+async def _probe_loop_lag(samples: List[float], stop_event: asyncio.Event):
+    while not stop_event.is_set():
+        expected = time.perf_counter() + LOOP_LAG_PROBE_INTERVAL
+        await asyncio.sleep(LOOP_LAG_PROBE_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - expected))
+
+
+async def measure_step(simulator: LoadSimulator, seconds: float) -> Dict:
+    from music.ffmpeg_supervisor import supervisor
+
+    simulator.frame_stats.reset()
+    lag_samples: List[float] = []
+    stop_event = asyncio.Event()
+    probe = asyncio.create_task(_probe_loop_lag(lag_samples, stop_event))
+
+    errors_before = simulator.action_errors
+    cpu_before = _cpu_seconds()
+    started = time.perf_counter()
+
+    issued = await simulator.drive(seconds)
+    playing = sum(1 for s in simulator.sessions if s.is_playing())
+
+    elapsed = time.perf_counter() - started
+    cpu_percent = (_cpu_seconds() - cpu_before) / elapsed * 100 if elapsed else 0.0
+    stop_event.set()
+    await probe
+
+    return {
+        'guilds': len(simulator.sessions),
+        'playing': playing,
+        'actions': issued,
+        'actions_per_s': round(issued / elapsed, 2) if elapsed else 0.0,
+        'action_errors': simulator.action_errors - errors_before,
+        'loop_lag_ms': {
+            'p50': round(percentile(lag_samples, 50) * 1000, 2),
+            'p99': round(percentile(lag_samples, 99) * 1000, 2),
+            'max': round(max(lag_samples, default=0.0) * 1000, 2),
+        },
+        'frame_jitter_ms': simulator.frame_stats.summary(),
+        'cpu_percent': round(cpu_percent, 1),
+        'rss_mb': round(_rss_bytes() / 1024 / 1024, 1),
+        'threads': threading.active_count(),
+        'ffmpeg_waiting': supervisor.get_stats()['waiting'],
+    }
+
+
+def _within_budget(row: Dict, args) -> bool:
+    return (row['frame_jitter_ms']['p99_ms'] <= args.jitter_budget_ms and
+            row['loop_lag_ms']['p99'] <= args.lag_budget_ms and
+            row['action_errors'] == 0)
+
+
+async def run(args) -> Dict:
+    fakes.search_latency = Latency(args.search_latency)
+    fakes.FakeYoutubeDL.configure(
+        extract_latency=Latency(args.extract_latency),
+        mix_latency=Latency(args.mix_latency)
+    )
+    fakes.FakeAudioSource.track_seconds = args.track_seconds
+
+    frame_stats = fakes.FrameStats()
+    env = fakes.FakeEnvironment(
+        asyncio.get_running_loop(),
+        api_latency=Latency(args.api_latency),
+        connect_latency=Latency(args.connect_latency),
+        frame_stats=frame_stats
+    )
+
+    from music import extractor
+    from music.ffmpeg_supervisor import supervisor
+
+    # 가짜 소스는 자식 프로세스가 없으므로 기본적으로 슬롯 제한 없이 파이썬 쪽 한계만 측정
+    supervisor.max_processes = args.ffmpeg_slots or max(args.steps)
+    await extractor.wait_ready()
+
+    simulator = LoadSimulator(env, frame_stats, args.rate, args.seed)
+    steps = []
+    try:
+        for target in sorted(args.steps):
+            await simulator.grow(target, args.warm_up)
+            row = await measure_step(simulator, args.step_seconds)
+            row['within_budget'] = _within_budget(row, args)
+            steps.append(row)
+            _print_row(row)
+    finally:
+        await simulator.close()
+
+    capacity = 0
+    for row in steps:
+        if not row['within_budget']:
+            break
+        capacity = row['guilds']
+
+    return {
+        'suite': 'load',
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'settings': {
+            'steps': sorted(args.steps),
+            'step_seconds': args.step_seconds,
+            'warm_up': args.warm_up,
+            'rate_per_guild': args.rate,
+            'action_weights': dict(zip(ACTIONS, ACTION_WEIGHTS)),
+            'track_seconds': args.track_seconds,
+            'ffmpeg_slots': supervisor.max_processes,
+            'search_latency': args.search_latency,
+            'extract_latency': args.extract_latency,
+            'mix_latency': args.mix_latency,
+            'connect_latency': args.connect_latency,
+            'api_latency': args.api_latency,
+            'jitter_budget_ms': args.jitter_budget_ms,
+            'lag_budget_ms': args.lag_budget_ms,
+            'seed': args.seed,
+        },
+        'actions': simulator.action_counts,
+        'steps': steps,
+        'max_guilds_within_budget': capacity,
+    }
+
+
+def _print_row(row: Dict):
+    print(
+        f"{'✅' if row['within_budget'] else '❌'} 서버 {row['guilds']:5d} | 재생 {row['playing']:5d} | "
+        f"행동 {row['actions_per_s']:6.2f}/s | 루프 지연 p99 {row['loop_lag_ms']['p99']:7.1f}ms | "
+        f"프레임 p99 {row['frame_jitter_ms']['p99_ms']:6.1f}ms | CPU {row['cpu_percent']:5.1f}% | "
+        f"RSS {row['rss_mb']:7.1f}MB | 스레드 {row['threads']:5d}",
+        flush=True
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='다중 서버 부하 시뮬레이터 (가짜 Discord / yt-dlp)')
+    parser.add_argument('--output', default='load_sim_output.json', help='결과 JSON 경로 (- 이면 stdout)')
+    parser.add_argument('--steps', type=int, nargs='+', default=[25, 50, 100, 200, 400],
+                        help='단계별 동시 서버 수')
+    parser.add_argument('--step-seconds', type=float, default=30.0, help='단계별 측정 시간 (초)')
+    parser.add_argument('--warm-up', type=float, default=15.0, help='서버 추가 후 측정 전 대기 시간 (초)')
+    parser.add_argument('--rate', type=float, default=0.02, help='서버당 초당 행동 수')
+    parser.add_argument('--track-seconds', type=float, default=240.0, help='가짜 곡 길이 (초)')
+    parser.add_argument('--ffmpeg-slots', type=int, default=0, help='FFmpeg 동시 실행 제한 (0 = 최대 서버 수)')
+    parser.add_argument('--search-latency', type=float, default=0.15, help='검색 API 지연 (초)')
+    parser.add_argument('--extract-latency', type=float, default=0.4, help='yt-dlp 정보 추출 지연 (초)')
+    parser.add_argument('--mix-latency', type=float, default=1.5, help='믹스 목록 추출 지연 (초)')
+    parser.add_argument('--connect-latency', type=float, default=0.5, help='음성 연결 지연 (초)')
+    parser.add_argument('--api-latency', type=float, default=0.08, help='메시지 전송/편집 지연 (초)')
+    parser.add_argument('--jitter-budget-ms', type=float, default=20.0, help='허용 프레임 지연 p99 (ms)')
+    parser.add_argument('--lag-budget-ms', type=float, default=100.0, help='허용 이벤트 루프 지연 p99 (ms)')
+    parser.add_argument('--seed', type=int, default=1, help='난수 시드')
+    parser.add_argument('--verbose', action='store_true', help='봇 로그 출력')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.ERROR,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    random.seed(args.seed)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"📊 결과 저장: {args.output}")
+    print(f"📈 예산 내 최대 동시 서버 수: {report['max_guilds_within_budget']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
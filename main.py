@@ -1,25 +1,35 @@
 # main.py - 완전한 음악 봇 메인 파일
 
+import time
+_startup_started = time.perf_counter()
+
 import discord
+from discord import app_commands
 from discord.ext import commands
 import config
-from music.player import get_player, cleanup_player
+from music.player import get_player, cleanup_player, start_idle_sweeper, stop_idle_sweeper, INIT_CONCURRENCY
+from music.ffmpeg_supervisor import supervisor as ffmpeg_supervisor
+from music import extractor
+from music.circuit_breaker import circuit_breaker
+from music.history import play_history
+from music.search_index import search_index
 from ui.controls import MusicView
+from utils.guild_settings import guild_settings
+from utils.metrics import registry as metrics_registry, METRICS_PORT
+from utils.profiler import profiler, render_collapsed, render_summary
+from utils.logging_setup import setup_logging
+from utils.loop_watchdog import loop_watchdog
+from utils.rate_limiter import rate_limiter
 import logging
 import asyncio
+import datetime
+import io
 import os
 import signal
 import sys
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# 로깅 설정 (파일 쓰기/회전은 백그라운드 스레드에서 수행)
+setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +37,18 @@ logger = logging.getLogger(__name__)
 logging.getLogger('discord').setLevel(logging.WARNING)
 logging.getLogger('discord.http').setLevel(logging.WARNING)
 
+# 시작 단계별 소요 시간 (프로세스 시작 기준 누적 초)
+startup_phases = {}
+
+def mark_startup_phase(name):
+    """시작 단계 완료 시점 기록"""
+    if name in startup_phases:
+        return
+    startup_phases[name] = time.perf_counter() - _startup_started
+    logger.info("⏱️ 시작 단계 '%s': %.2f초", name, startup_phases[name])
+
+mark_startup_phase('imports')
+
 # 인텐트 설정
 intents = discord.Intents.default()
 intents.message_content = True
@@ -34,40 +56,77 @@ intents.voice_states = True
 intents.guilds = True
 
 class MusicBot(commands.Bot):
-    def __init__(self):
+    def __init__(self, **options):
         super().__init__(
             command_prefix='!',
             intents=intents,
             help_command=None,
-            case_insensitive=True
+            case_insensitive=True,
+            **options
         )
         self.startup_time = None
         self.ready_guilds = set()
+        # 샤딩 모드에서 워커 간 통계 공유 채널 (단일 프로세스에서는 None)
+        self.cluster = None
+        self.cluster_index = 0
     
     async def setup_hook(self):
         """봇 시작 시 초기 설정"""
         logger.info("🔧 봇 초기 설정 시작...")
+        mark_startup_phase('login')
+        
+        # 이벤트 루프를 막는 코드 감시
+        loop_watchdog.start()
+        
+        # 유휴 플레이어 휴면 (스레드 풀/태스크 해제)
+        start_idle_sweeper()
+        
+        # 재생 기록 로드 (이벤트 수신 전에 완료) 후 /play 자동완성 인덱스 구성
+        await play_history.load()
+        search_index.add_many(play_history.all_entries())
+        
+        # 슬래시 명령어 등록 (샤딩 모드에서는 첫 워커만)
+        if getattr(config, 'SYNC_APP_COMMANDS', True) and self.cluster_index == 0:
+            asyncio.create_task(self._sync_app_commands())
+        
+        # 로그인 후 yt-dlp import / 프로필 생성 / 쿠키 로드를 백그라운드에서 진행
+        extractor.start_warm_up(asyncio.get_running_loop())
+        
+        # 메트릭 엔드포인트 (샤딩 모드에서는 워커 번호만큼 포트 이동)
+        if METRICS_PORT:
+            await metrics_registry.start_server(port=METRICS_PORT + self.cluster_index)
         
         # 필요한 디렉토리 생성
         os.makedirs('logs', exist_ok=True)
         
+        if self.cluster:
+            self.cluster.start(self)
+        
         # 종료 시그널 핸들러 등록
         if os.name != 'nt':  # Windows가 아닌 경우
             signal.signal(signal.SIGTERM, self._signal_handler)
             signal.signal(signal.SIGINT, self._signal_handler)
     
+    async def _sync_app_commands(self):
+        try:
+            synced = await self.tree.sync()
+            logger.info("🔗 슬래시 명령어 %s개 동기화 완료", len(synced))
+        except Exception as e:
+            logger.error("❌ 슬래시 명령어 동기화 실패: %s", e)
+    
     def _signal_handler(self, signum, frame):
         """종료 시그널 처리"""
-        logger.info(f"📡 종료 시그널 수신: {signum}")
+        logger.info("📡 종료 시그널 수신: %s", signum)
         asyncio.create_task(self.close())
     
     async def on_ready(self):
-        """봇이 준비되었을 때"""
+        """봇이 준비되었을 때 (게이트웨이 재연결 시에도 호출됨)"""
         import datetime
-        self.startup_time = datetime.datetime.now()
+        if not self.startup_time:
+            self.startup_time = datetime.datetime.now()
         
-        logger.info(f'✅ 봇 로그인 완료: {self.user.name} (ID: {self.user.id})')
-        logger.info(f'🌐 연결된 서버 수: {len(self.guilds)}')
+        logger.info('✅ 봇 로그인 완료: %s (ID: %s)', self.user.name, self.user.id)
+        logger.info('🌐 연결된 서버 수: %s', len(self.guilds))
         
         # 봇 상태 설정
         await self.change_presence(
@@ -77,28 +136,48 @@ class MusicBot(commands.Bot):
             )
         )
         
-        # 기존 음악 채널이 설정된 서버들 초기화
-        initialized_count = 0
-        for guild in self.guilds:
-            if config.guild_settings.is_music_enabled(guild.id):
-                try:
-                    player = get_player(guild.id, self)
-                    success = await player.initialize()
-                    if success:
-                        initialized_count += 1
-                        self.ready_guilds.add(guild.id)
-                        logger.info(f"🎵 음악 플레이어 초기화 완료: {guild.name}")
-                    else:
-                        logger.warning(f"⚠️ 음악 플레이어 초기화 실패: {guild.name}")
-                except Exception as e:
-                    logger.error(f"❌ {guild.name} 초기화 오류: {e}")
+        # 기존 음악 채널이 설정된 서버들 초기화 (이미 준비된 서버는 건너뜀)
+        pending = [
+            guild for guild in self.guilds
+            if guild.id not in self.ready_guilds and guild_settings.is_music_enabled(guild.id)
+        ]
+        semaphore = asyncio.Semaphore(INIT_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._initialize_guild(guild, semaphore) for guild in pending),
+            return_exceptions=True
+        )
+        initialized_count = len([r for r in results if r is True])
         
-        logger.info(f'🎵 음악 기능 활성화된 서버: {initialized_count}/{len(self.guilds)}')
-        logger.info(f'🚀 봇 준비 완료! 업타임: {self.startup_time.strftime("%Y-%m-%d %H:%M:%S")}')
+        logger.info('🎵 음악 기능 활성화된 서버: %s/%s (이번에 %s/%s개 준비)',
+                    len(self.ready_guilds), len(self.guilds), initialized_count, len(pending))
+        mark_startup_phase('ready')
+        logger.info('🚀 봇 준비 완료! 업타임: %s', self.startup_time.strftime("%Y-%m-%d %H:%M:%S"))
+    
+    async def _initialize_guild(self, guild, semaphore):
+        """서버 하나 준비 (플레이어와 메시지 조회는 첫 활동 시로 미룸)"""
+        async with semaphore:
+            try:
+                from music.player import players
+                player = players.get(guild.id)
+                if player:
+                    success = await player.initialize()
+                else:
+                    success = self.get_channel(guild_settings.get_music_channel(guild.id)) is not None
+                
+                if success:
+                    self.ready_guilds.add(guild.id)
+                    logger.debug("🎵 음악 서버 준비 완료: %s", guild.name)
+                else:
+                    logger.warning("⚠️ 음악 채널을 찾을 수 없음: %s", guild.name)
+                return success
+                
+            except Exception as e:
+                logger.error("❌ %s 초기화 오류: %s", guild.name, e)
+                return False
     
     async def on_guild_join(self, guild):
         """새 서버 참가 시"""
-        logger.info(f"🆕 새 서버 참가: {guild.name} (ID: {guild.id}, 멤버: {guild.member_count})")
+        logger.info("🆕 새 서버 참가: %s (ID: %s, 멤버: %s)", guild.name, guild.id, guild.member_count)
         
         # 환영 메시지 전송 시도
         try:
@@ -123,20 +202,21 @@ class MusicBot(commands.Bot):
                 embed.set_footer(text="개발자: 당신의 이름 | 문의사항은 DM으로")
                 await channel.send(embed=embed)
         except Exception as e:
-            logger.error(f"❌ 환영 메시지 전송 실패 ({guild.name}): {e}")
+            logger.error("❌ 환영 메시지 전송 실패 (%s): %s", guild.name, e)
     
     async def on_guild_remove(self, guild):
         """서버 탈퇴 시"""
-        logger.info(f"👋 서버 탈퇴: {guild.name} (ID: {guild.id})")
+        logger.info("👋 서버 탈퇴: %s (ID: %s)", guild.name, guild.id)
         
         # 해당 서버의 플레이어와 설정 정리
         try:
             await cleanup_player(guild.id)
-            config.guild_settings.remove_guild(guild.id)
+            guild_settings.remove_guild(guild.id)
+            search_index.remove_guild(guild.id)
             if guild.id in self.ready_guilds:
                 self.ready_guilds.remove(guild.id)
         except Exception as e:
-            logger.error(f"❌ 서버 정리 오류 ({guild.name}): {e}")
+            logger.error("❌ 서버 정리 오류 (%s): %s", guild.name, e)
     
     async def on_message(self, message):
         """메시지 처리"""
@@ -147,16 +227,14 @@ class MusicBot(commands.Bot):
         # 기본 명령어 처리
         await self.process_commands(message)
         
-        # 음악 채널에서 메시지 처리
-        if (message.guild and 
-            config.guild_settings.is_music_enabled(message.guild.id) and
-            message.channel.id == config.guild_settings.get_music_channel(message.guild.id)):
+        # 음악 채널에서 메시지 처리 (채널 ID 역인덱스 단일 조회)
+        if message.guild and guild_settings.is_music_channel(message.channel.id):
             
             try:
                 player = get_player(message.guild.id, self)
                 await player.handle_message(message)
             except Exception as e:
-                logger.error(f"❌ 음악 메시지 처리 오류 ({message.guild.name}): {e}")
+                logger.error("❌ 음악 메시지 처리 오류 (%s): %s", message.guild.name, e)
     
     async def on_voice_state_update(self, member, before, after):
         """음성 채널 상태 변경 처리"""
@@ -166,16 +244,18 @@ class MusicBot(commands.Bot):
         # 봇이 혼자 남았을 때 자동 연결 해제
         if (before.channel and 
             self.user in before.channel.members and
-            config.guild_settings.is_music_enabled(member.guild.id)):
+            guild_settings.is_music_enabled(member.guild.id)):
             
             # 사람 멤버 수 확인 (봇 제외)
             human_members = [m for m in before.channel.members if not m.bot]
             
             if len(human_members) == 0:
                 try:
-                    player = get_player(member.guild.id, self)
-                    if player.vc and player.vc.channel == before.channel:
-                        logger.info(f"🔌 혼자 남아서 5초 후 연결 해제 예약: {member.guild.name}")
+                    # 휴면 중인 플레이어는 음성 연결이 없으므로 다시 만들지 않음
+                    from music.player import players
+                    player = players.get(member.guild.id)
+                    if player and player.vc and player.vc.channel == before.channel:
+                        logger.info("🔌 혼자 남아서 5초 후 연결 해제 예약: %s", member.guild.name)
                         
                         # 5초 후 다시 확인해서 연결 해제
                         await asyncio.sleep(5)
@@ -186,13 +266,13 @@ class MusicBot(commands.Bot):
                             
                             await player.vc.disconnect()
                             player.vc = None
-                            logger.info(f"🔌 음성 채널 연결 해제됨: {member.guild.name}")
+                            logger.info("🔌 음성 채널 연결 해제됨: %s", member.guild.name)
                             
                             # UI 업데이트
                             await player.update_ui()
                             
                 except Exception as e:
-                    logger.error(f"❌ 자동 연결 해제 오류 ({member.guild.name}): {e}")
+                    logger.error("❌ 자동 연결 해제 오류 (%s): %s", member.guild.name, e)
     
     async def on_command_error(self, ctx, error):
         """명령어 오류 처리"""
@@ -212,7 +292,7 @@ class MusicBot(commands.Bot):
             await ctx.send(f"❌ 명령어 쿨다운 중입니다. {error.retry_after:.1f}초 후에 다시 시도하세요.")
         
         else:
-            logger.error(f"❌ 명령어 오류 ({ctx.guild.name if ctx.guild else 'DM'}): {error}")
+            logger.error("❌ 명령어 오류 (%s): %s", ctx.guild.name if ctx.guild else 'DM', error)
             await ctx.send("❌ 명령어 처리 중 오류가 발생했습니다.")
     
     async def close(self):
@@ -220,6 +300,7 @@ class MusicBot(commands.Bot):
         logger.info("🔄 봇 종료 준비 중...")
         
         # 모든 플레이어 정리
+        stop_idle_sweeper()
         from music.player import players
         cleanup_tasks = []
         for guild_id in list(players.keys()):
@@ -227,12 +308,31 @@ class MusicBot(commands.Bot):
         
         if cleanup_tasks:
             await asyncio.gather(*cleanup_tasks, return_exceptions=True)
-            logger.info(f"🧹 {len(cleanup_tasks)}개 플레이어 정리 완료")
+            logger.info("🧹 %s개 플레이어 정리 완료", len(cleanup_tasks))
+        
+        # 남은 FFmpeg 프로세스 정리
+        ffmpeg_supervisor.shutdown()
+        extractor.scheduler.shutdown()
+        
+        if self.cluster:
+            self.cluster.stop()
+        
+        # 대기 중인 설정 변경 / 재생 기록 저장
+        guild_settings.flush()
+        play_history.flush()
+        
+        await metrics_registry.stop_server()
+        loop_watchdog.stop()
         
         await super().close()
         logger.info("👋 봇 종료 완료")
 
 
+class ShardedMusicBot(MusicBot, commands.AutoShardedBot):
+    """샤딩 모드 워커용 봇 (프로세스당 일부 샤드만 담당)"""
+    pass
+
+
 # ========== 명령어 정의 ==========
 
 @commands.has_permissions(administrator=True)
@@ -275,7 +375,7 @@ async def setup_music_channel(ctx, channel: discord.TextChannel = None):
             await ctx.send("⚠️ 음성 채널에 연결하고 말하기 권한이 필요합니다.")
         
         # 기존 설정이 있는지 확인
-        existing_channel_id = config.guild_settings.get_music_channel(ctx.guild.id)
+        existing_channel_id = guild_settings.get_music_channel(ctx.guild.id)
         if existing_channel_id:
             existing_channel = ctx.guild.get_channel(existing_channel_id)
             if existing_channel:
@@ -304,7 +404,7 @@ async def setup_music_channel(ctx, channel: discord.TextChannel = None):
                         pass
         
         # 설정 저장
-        config.guild_settings.set_music_channel(ctx.guild.id, channel.id)
+        guild_settings.set_music_channel(ctx.guild.id, channel.id)
         
         # 기존 플레이어 정리
         await cleanup_player(ctx.guild.id)
@@ -330,7 +430,8 @@ async def setup_music_channel(ctx, channel: discord.TextChannel = None):
         player = get_player(ctx.guild.id, ctx.bot)
         message = await channel.send(embed=embed, view=MusicView(player))
         
-        config.guild_settings.set_music_message(ctx.guild.id, message.id)
+        guild_settings.set_music_message(ctx.guild.id, message.id)
+        player.message = message
         
         # 성공 메시지
         success_embed = discord.Embed(
@@ -352,11 +453,12 @@ async def setup_music_channel(ctx, channel: discord.TextChannel = None):
         
         # 플레이어 초기화
         await player.initialize()
+        ctx.bot.ready_guilds.add(ctx.guild.id)
         
-        logger.info(f"✅ 음악 채널 설정 완료: {ctx.guild.name} -> #{channel.name}")
+        logger.info("✅ 음악 채널 설정 완료: %s -> #%s", ctx.guild.name, channel.name)
         
     except Exception as e:
-        logger.error(f"❌ 음악 채널 설정 오류 ({ctx.guild.name}): {e}")
+        logger.error("❌ 음악 채널 설정 오류 (%s): %s", ctx.guild.name, e)
         await ctx.send(f"❌ 음악 채널 설정 중 오류가 발생했습니다.\n```{str(e)[:100]}```")
 
 @commands.has_permissions(administrator=True)
@@ -369,7 +471,7 @@ async def remove_music_channel(ctx):
     사용법: !music_remove
     """
     try:
-        if not config.guild_settings.is_music_enabled(ctx.guild.id):
+        if not guild_settings.is_music_enabled(ctx.guild.id):
             await ctx.send("❌ 이 서버에는 음악 채널이 설정되어 있지 않습니다.")
             return
         
@@ -397,7 +499,8 @@ async def remove_music_channel(ctx):
                 return
             
             # 설정 제거
-            config.guild_settings.remove_guild(ctx.guild.id)
+            guild_settings.remove_guild(ctx.guild.id)
+            ctx.bot.ready_guilds.discard(ctx.guild.id)
             
             # 플레이어 정리
             await cleanup_player(ctx.guild.id)
@@ -409,7 +512,7 @@ async def remove_music_channel(ctx):
             )
             await ctx.send(embed=success_embed)
             
-            logger.info(f"🗑️ 음악 채널 설정 제거 완료: {ctx.guild.name}")
+            logger.info("🗑️ 음악 채널 설정 제거 완료: %s", ctx.guild.name)
             
         except asyncio.TimeoutError:
             await ctx.send("⏰ 시간 초과로 제거가 취소되었습니다.")
@@ -420,7 +523,7 @@ async def remove_music_channel(ctx):
                 pass
         
     except Exception as e:
-        logger.error(f"❌ 음악 채널 제거 오류 ({ctx.guild.name}): {e}")
+        logger.error("❌ 음악 채널 제거 오류 (%s): %s", ctx.guild.name, e)
         await ctx.send("❌ 음악 채널 제거 중 오류가 발생했습니다.")
 
 @commands.command(name='music_info', aliases=['info', '정보'])
@@ -437,20 +540,33 @@ async def music_info(ctx):
             color=0x1DB954
         )
         
-        # 기본 정보
+        # 기본 정보 (샤딩 모드에서는 전체 워커 합계)
+        guild_count = len(ctx.bot.guilds)
+        music_guild_count = len([g for g in ctx.bot.guilds if guild_settings.is_music_enabled(g.id)])
+        cluster_info = ""
+        if ctx.bot.cluster:
+            totals = await ctx.bot.cluster.totals()
+            guild_count = totals['guilds']
+            music_guild_count = totals['music_guilds']
+            cluster_info = (
+                f"**워커:** {totals['workers']}개 (현재 #{ctx.bot.cluster_index})\n"
+                f"**재생 중 서버:** {totals['playing']}\n"
+            )
+        
         embed.add_field(
             name="📊 기본 정보",
             value=(
-                f"**서버 수:** {len(ctx.bot.guilds)}\n"
-                f"**음악 활성 서버:** {len([g for g in ctx.bot.guilds if config.guild_settings.is_music_enabled(g.id)])}\n"
+                f"**서버 수:** {guild_count}\n"
+                f"**음악 활성 서버:** {music_guild_count}\n"
+                f"{cluster_info}"
                 f"**업타임:** {ctx.bot.startup_time.strftime('%Y-%m-%d %H:%M:%S') if ctx.bot.startup_time else '알 수 없음'}"
             ),
             inline=True
         )
         
         # 현재 서버 정보
-        is_enabled = config.guild_settings.is_music_enabled(ctx.guild.id)
-        music_channel_id = config.guild_settings.get_music_channel(ctx.guild.id)
+        is_enabled = guild_settings.is_music_enabled(ctx.guild.id)
+        music_channel_id = guild_settings.get_music_channel(ctx.guild.id)
         music_channel = ctx.guild.get_channel(music_channel_id) if music_channel_id else None
         
         server_status = "✅ 활성화됨" if is_enabled else "❌ 비활성화됨"
@@ -465,6 +581,37 @@ async def music_info(ctx):
             inline=True
         )
         
+        # FFmpeg 리소스 정보
+        ffmpeg_stats = ffmpeg_supervisor.get_stats()
+        embed.add_field(
+            name="🎛️ FFmpeg",
+            value=(
+                f"**실행 중:** {ffmpeg_stats['running']}/{ffmpeg_stats['max_processes']} "
+                f"(대기 {ffmpeg_stats['waiting']})\n"
+                f"**CPU:** {ffmpeg_stats['cpu_percent']:.1f}%\n"
+                f"**메모리:** {ffmpeg_stats['rss_bytes'] / 1024 / 1024:.1f} MB\n"
+                f"**정지 재시작:** {ffmpeg_stats['total_stalls']}회 / "
+                f"**고아 정리:** {ffmpeg_stats['total_orphans_killed']}회"
+            ),
+            inline=True
+        )
+        
+        # YouTube 차단 감지 상태
+        circuit = circuit_breaker.stats()
+        circuit_status = {
+            'closed': "✅ 정상",
+            'half_open': "🟡 회복 확인 중",
+            'open': f"🔴 차단 감지 ({circuit['retry_after']:.0f}초 후 재시도)",
+        }[circuit['state']]
+        embed.add_field(
+            name="🔌 YouTube",
+            value=(
+                f"**상태:** {circuit_status}\n"
+                f"**최근 실패:** {circuit['failures']}/{circuit['calls']}회"
+            ),
+            inline=True
+        )
+        
         # 명령어 정보
         embed.add_field(
             name="🎯 관리자 명령어",
@@ -502,7 +649,7 @@ async def music_info(ctx):
         await ctx.send(embed=embed)
         
     except Exception as e:
-        logger.error(f"❌ 정보 명령어 오류 ({ctx.guild.name}): {e}")
+        logger.error("❌ 정보 명령어 오류 (%s): %s", ctx.guild.name, e)
         await ctx.send("❌ 정보를 가져오는 중 오류가 발생했습니다.")
 
 @commands.is_owner()
@@ -516,14 +663,144 @@ async def reload_bot(ctx):
             await cleanup_player(guild_id)
         
         await ctx.send("🔄 모듈 리로드 완료")
-        logger.info(f"🔄 봇 리로드: {ctx.author}")
+        logger.info("🔄 봇 리로드: %s", ctx.author)
         
     except Exception as e:
         await ctx.send(f"❌ 리로드 실패: {e}")
-        logger.error(f"❌ 리로드 오류: {e}")
+        logger.error("❌ 리로드 오류: %s", e)
+
+@commands.is_owner()
+@commands.command(name='profile', hidden=True)
+async def profile_bot(ctx, seconds: int = 10):
+    """샘플링 프로파일링 (봇 소유자만)
+    
+    사용법: !profile [초]
+    """
+    seconds = max(1, min(seconds, 120))
+    if profiler.running:
+        await ctx.send("⚠️ 이미 프로파일링이 실행 중입니다.")
+        return
+    
+    try:
+        await ctx.send(f"🔬 {seconds}초 동안 프로파일링을 시작합니다...")
+        logger.info("🔬 프로파일링 시작: %s (%s초)", ctx.author, seconds)
+        
+        result = await profiler.profile(seconds)
+        summary = render_summary(result)
+        
+        timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        files = [
+            discord.File(io.BytesIO(render_collapsed(result)), filename=f"profile-{timestamp}.collapsed.txt"),
+            discord.File(io.BytesIO(summary.encode('utf-8')), filename=f"profile-{timestamp}.summary.txt")
+        ]
+        await ctx.send(f"```{summary[:1900]}```", files=files)
+        
+    except Exception as e:
+        await ctx.send(f"❌ 프로파일링 실패: {e}")
+        logger.error("❌ 프로파일링 오류: %s", e)
+
+@commands.is_owner()
+@commands.command(name='loopstats', hidden=True)
+async def loop_stats(ctx, action: str = None):
+    """이벤트 루프를 막은 호출 위치 요약 (봇 소유자만)
+    
+    사용법: !loopstats [reset]
+    """
+    try:
+        if action == 'reset':
+            loop_watchdog.reset()
+            await ctx.send("🐢 이벤트 루프 감시 기록을 초기화했습니다.")
+            return
+        
+        summary = loop_watchdog.render_summary()
+        stacks = loop_watchdog.render_stacks()
+        files = []
+        if stacks:
+            timestamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+            files.append(discord.File(io.BytesIO(stacks.encode('utf-8')), filename=f"loop-blocks-{timestamp}.txt"))
+        await ctx.send(f"```{summary[:1900]}```", files=files)
+        
+    except Exception as e:
+        await ctx.send(f"❌ 루프 감시 조회 실패: {e}")
+        logger.error("❌ 루프 감시 조회 오류: %s", e)
+
+# ========== 슬래시 명령어 ==========
+
+# 자동완성에서 고른 값 접두사 (직접 입력한 검색어와 구분)
+PLAY_CHOICE_PREFIX = 'yt:'
+
+@app_commands.command(name='play', description='노래를 재생합니다 (자주 듣는 곡은 자동완성에서 바로 선택)')
+@app_commands.describe(query='노래 제목 또는 YouTube 링크')
+@app_commands.guild_only()
+async def play_command(interaction: discord.Interaction, query: str):
+    """자동완성에서 고른 곡은 검색 없이 비디오 ID로 바로 추가"""
+    try:
+        if not guild_settings.is_music_enabled(interaction.guild_id):
+            await interaction.response.send_message(
+                "❌ 음악 채널이 설정되지 않았습니다. 관리자가 `!music_setup`을 먼저 실행해주세요.", ephemeral=True
+            )
+            return
+        
+        if not interaction.user.voice or not interaction.user.voice.channel:
+            await interaction.response.send_message("❌ 음성 채널에 먼저 참여해주세요.", ephemeral=True)
+            return
+        
+        decision = rate_limiter.check('message', interaction.user.id, interaction.guild_id)
+        if not decision:
+            await interaction.response.send_message(
+                f"⏳ 요청이 너무 많습니다. {max(1, round(decision.retry_after))}초 후에 다시 시도해주세요.", ephemeral=True
+            )
+            return
+        
+        player = get_player(interaction.guild_id, interaction.client)
+        
+        if query.startswith(PLAY_CHOICE_PREFIX):
+            video_id = query[len(PLAY_CHOICE_PREFIX):]
+            indexed = search_index.get(interaction.guild_id, video_id)
+            if indexed:
+                await interaction.response.send_message(f"🎵 '{indexed.title[:50]}'을(를) 대기열에 추가합니다.", ephemeral=True)
+                asyncio.create_task(player.enqueue_known_track(indexed.to_info(), interaction.user))
+                return
+            # 자동완성 후 인덱스에서 밀려난 곡은 링크로 검색
+            query = f"https://www.youtube.com/watch?v={video_id}"
+        
+        await interaction.response.send_message(f"🔍 '{query[:50]}' 검색 중...", ephemeral=True)
+        await player.submit_query(query, interaction.user)
+        
+    except Exception as e:
+        logger.error("❌ /play 오류: %s", e)
+        if not interaction.response.is_done():
+            await interaction.response.send_message("❌ 오류가 발생했습니다.", ephemeral=True)
+
+@play_command.autocomplete('query')
+async def play_autocomplete(interaction: discord.Interaction, current: str):
+    """이 서버의 로컬 인덱스만 조회 (API 호출 없음, 3초 제한 안에 응답)"""
+    choices = []
+    if interaction.guild_id is None:
+        return choices
+    for track in search_index.search(interaction.guild_id, current):
+        duration = track.duration
+        name = f"{track.title} - {track.uploader} ({duration//60}:{duration%60:02d})"
+        choices.append(app_commands.Choice(name=name[:100], value=f"{PLAY_CHOICE_PREFIX}{track.video_id}"))
+    return choices
 
 # ========== 봇 실행 ==========
 
+def create_bot(bot_class=None, **options):
+    """봇 인스턴스 생성 및 명령어 등록"""
+    bot = (bot_class or MusicBot)(**options)
+    
+    # 명령어 추가
+    bot.add_command(setup_music_channel)
+    bot.add_command(remove_music_channel)
+    bot.add_command(music_info)
+    bot.add_command(reload_bot)
+    bot.add_command(profile_bot)
+    bot.add_command(loop_stats)
+    bot.tree.add_command(play_command)
+    
+    return bot
+
 def run_bot():
     """봇 실행 함수"""
     
@@ -536,23 +813,26 @@ def run_bot():
         logger.error("❌ config.py에서 YOUTUBE_API_KEY를 설정해주세요!")
         return False
     
-    # 쿠키 파일 확인
-    if not os.path.exists(config.COOKIES_FILE):
-        logger.warning(f"⚠️ 쿠키 파일을 찾을 수 없습니다: {config.COOKIES_FILE}")
+    # 쿠키 파일 확인 (COOKIES_FILES로 여러 개 지정 가능)
+    cookie_files = getattr(config, 'COOKIES_FILES', None) or [config.COOKIES_FILE]
+    missing = [path for path in cookie_files if not os.path.exists(path)]
+    for path in missing:
+        logger.warning("⚠️ 쿠키 파일을 찾을 수 없습니다: %s", path)
+    if missing:
         logger.warning("YouTube 접근에 제한이 있을 수 있습니다.")
     
-    # 봇 인스턴스 생성
-    bot = MusicBot()
+    # 샤딩 모드: 워커 프로세스 여러 개로 분산 실행
+    shard_processes = getattr(config, 'SHARD_PROCESSES', 1)
+    if shard_processes == 'auto' or int(shard_processes) > 1:
+        from sharding import run_cluster
+        return run_cluster(shard_processes, getattr(config, 'SHARD_COUNT', None))
     
-    # 명령어 추가
-    bot.add_command(setup_music_channel)
-    bot.add_command(remove_music_channel)
-    bot.add_command(music_info)
-    bot.add_command(reload_bot)
+    # 봇 인스턴스 생성
+    bot = create_bot()
     
     try:
         logger.info("🚀 음악 봇 시작 중...")
-        bot.run(config.BOT_TOKEN)
+        bot.run(config.BOT_TOKEN, log_handler=None)  # discord 로그도 큐 핸들러로만 기록
         
     except discord.LoginFailure:
         logger.error("❌ 봇 토큰이 잘못되었습니다! config.py를 확인해주세요.")
@@ -563,7 +843,7 @@ def run_bot():
         return False
         
     except Exception as e:
-        logger.error(f"❌ 봇 실행 오류: {e}")
+        logger.error("❌ 봇 실행 오류: %s", e)
         return False
     
     finally:
@@ -579,5 +859,5 @@ if __name__ == "__main__":
         logger.info("⌨️ 사용자에 의해 중단됨")
         sys.exit(0)
     except Exception as e:
-        logger.error(f"❌ 예상치 못한 오류: {e}")
+        logger.error("❌ 예상치 못한 오류: %s", e)
         sys.exit(1)
\ No newline at end of file
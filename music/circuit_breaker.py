@@ -0,0 +1,224 @@
+# music/circuit_breaker.py - 봇 전체 공용 YouTube 차단 감지 (오류 분류 + 닫힘/열림/반열림 + 지터 지수 백오프)
+
+import config
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# 실패율 계산 구간 (초) / 열림 판단에 필요한 최소 시도 수 / 열림 실패율
+CIRCUIT_WINDOW = getattr(config, 'CIRCUIT_WINDOW', 60.0)
+CIRCUIT_MIN_CALLS = getattr(config, 'CIRCUIT_MIN_CALLS', 10)
+CIRCUIT_FAILURE_RATE = getattr(config, 'CIRCUIT_FAILURE_RATE', 0.5)
+# 열림 유지 시간 = 기본값 × 2^(연속 열림 횟수 - 1), 최대값 이하, 지터로 50~100%
+CIRCUIT_BACKOFF_BASE = getattr(config, 'CIRCUIT_BACKOFF_BASE', 30.0)
+CIRCUIT_BACKOFF_MAX = getattr(config, 'CIRCUIT_BACKOFF_MAX', 900.0)
+# 반열림 상태에서 동시에 허용할 백그라운드 시험 수 / 닫힘으로 돌아가는 데 필요한 연속 성공 수
+CIRCUIT_HALF_OPEN_PROBES = getattr(config, 'CIRCUIT_HALF_OPEN_PROBES', 1)
+CIRCUIT_HALF_OPEN_SUCCESSES = getattr(config, 'CIRCUIT_HALF_OPEN_SUCCESSES', 3)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# 오류 종류: throttle(429, 봇 확인), network(시간 초과, 연결 끊김, 5xx) → 실패
+#           unavailable(비공개, 삭제, 지역 제한 등 곡 자체 문제) → YouTube는 응답했으므로 실패 아님
+_THROTTLE_PATTERN = re.compile(
+    r"HTTP Error 429|Too Many Requests|rate.?limit|confirm you.re not a bot|Sign in to confirm|"
+    r"unusual traffic|captcha|HTTP Error 403",
+    re.IGNORECASE)
+_UNAVAILABLE_PATTERN = re.compile(
+    r"Video unavailable|Private video|has been removed|copyright|not available in your country|"
+    r"age.?restrict|members.?only|Premieres in|live event will begin|Incomplete YouTube ID|"
+    r"Unsupported URL|HTTP Error 404",
+    re.IGNORECASE)
+_NETWORK_PATTERN = re.compile(
+    r"timed? ?out|Connection (reset|refused|aborted)|Remote end closed|Temporary failure in name resolution|"
+    r"Name or service not known|EOF occurred|HTTP Error 5\d\d|IncompleteRead",
+    re.IGNORECASE)
+
+CIRCUIT_STATE = metrics.registry.gauge(
+    'musicbot_extract_circuit_state', 'YouTube circuit breaker state (0 closed, 1 half-open, 2 open)')
+CIRCUIT_OUTCOMES = metrics.registry.counter(
+    'musicbot_extract_outcomes_total', 'Extraction attempts by error class', ('kind',))
+CIRCUIT_REJECTED = metrics.registry.counter(
+    'musicbot_extract_rejected_total', 'Background extractions rejected while the circuit is open')
+CIRCUIT_TRIPS = metrics.registry.counter(
+    'musicbot_extract_circuit_trips_total', 'Times the circuit breaker opened')
+
+
+class CircuitOpen(Exception):
+    """차단 감지 중이라 백그라운드 추출을 시작하지 않음"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"YouTube circuit open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def classify(error=None, message: Optional[str] = None) -> str:
+    """추출 결과 분류: ok / throttle / network / unavailable / error
+
+    error는 발생한 예외, message는 yt-dlp가 ignoreerrors로 삼킨 마지막 오류 메시지입니다.
+    """
+    if error is None and not message:
+        return 'ok'
+    if isinstance(error, TimeoutError):
+        return 'network'
+
+    text = ' '.join(part for part in (message, str(error) if error is not None else None) if part)
+    if _THROTTLE_PATTERN.search(text):
+        return 'throttle'
+    if _UNAVAILABLE_PATTERN.search(text):
+        return 'unavailable'
+    if _NETWORK_PATTERN.search(text) or isinstance(error, (ConnectionError, OSError)):
+        return 'network'
+    return 'error'
+
+
+def is_failure(kind: str) -> bool:
+    return kind in ('throttle', 'network')
+
+
+class CircuitBreaker:
+    """모든 서버의 추출 결과를 모아 YouTube 차단을 감지
+
+    닫힘: 모두 허용. 최근 CIRCUIT_WINDOW초 실패율이 기준을 넘으면 열림.
+    열림: 사용자가 요청한 재생만 허용하고 백그라운드 작업(믹스 채우기, 미리 추출, 라디오)은
+          거절. 열림 시간은 연속으로 열릴 때마다 두 배 (지터 포함).
+    반열림: 열림 시간이 지나면 백그라운드 시험을 제한된 수만 허용. 연속 성공하면 닫힘,
+          실패하면 더 긴 백오프로 다시 열림.
+    """
+
+    def __init__(self, window: float = CIRCUIT_WINDOW, min_calls: int = CIRCUIT_MIN_CALLS,
+                 failure_rate: float = CIRCUIT_FAILURE_RATE, backoff_base: float = CIRCUIT_BACKOFF_BASE,
+                 backoff_max: float = CIRCUIT_BACKOFF_MAX, half_open_probes: int = CIRCUIT_HALF_OPEN_PROBES,
+                 half_open_successes: int = CIRCUIT_HALF_OPEN_SUCCESSES):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.half_open_probes = half_open_probes
+        self.half_open_successes = half_open_successes
+        self._state = CLOSED
+        self._results = deque()
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probes = 0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    @property
+    def closed(self) -> bool:
+        return self.state == CLOSED
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now >= self._open_until:
+            self._state = HALF_OPEN
+            self._probes = self._successes = 0
+            logger.info("🔌 추출 차단 감지 반열림: 시험 추출 시작")
+        return self._state
+
+    # ---------- 허용 ----------
+
+    def admit(self, background: bool) -> bool:
+        """추출 시작 전 호출 - 거절이면 CircuitOpen, 반열림 시험으로 허용되면 True
+
+        True를 받은 호출자는 끝난 뒤 release()를 호출해야 합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if not background or state == CLOSED:
+                return False
+            if state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return True
+            retry_after = max(0.0, self._open_until - now)
+
+        CIRCUIT_REJECTED.inc()
+        raise CircuitOpen(retry_after)
+
+    def release(self):
+        with self._lock:
+            self._probes = max(0, self._probes - 1)
+
+    # ---------- 결과 기록 ----------
+
+    def record(self, kind: str):
+        """추출 시도 하나의 결과 (작업 스레드에서 호출)"""
+        CIRCUIT_OUTCOMES.inc(kind=kind)
+        failed = is_failure(kind)
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                if failed:
+                    self._trip(now, kind)
+                else:
+                    self._successes += 1
+                    if self._successes >= self.half_open_successes:
+                        self._close()
+                return
+            if state == OPEN:
+                return
+
+            self._results.append((now, failed))
+            self._failures += failed
+            self._expire(now)
+            calls = len(self._results)
+            if calls >= self.min_calls and self._failures / calls >= self.failure_rate:
+                self._trip(now, kind)
+
+    def _expire(self, now: float):
+        results = self._results
+        while results and now - results[0][0] > self.window:
+            _, failed = results.popleft()
+            self._failures -= failed
+
+    def _trip(self, now: float, kind: str):
+        self._trips += 1
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (self._trips - 1))
+        backoff *= random.uniform(0.5, 1.0)
+        self._state = OPEN
+        self._open_until = now + backoff
+        self._results.clear()
+        self._failures = 0
+        CIRCUIT_TRIPS.inc()
+        logger.warning("🔌 YouTube 차단 감지 (%s): %.0f초 동안 백그라운드 추출 중지 (%s회째)",
+                       kind, backoff, self._trips)
+
+    def _close(self):
+        self._state = CLOSED
+        self._trips = 0
+        self._results.clear()
+        self._failures = 0
+        logger.info("🔌 추출 차단 감지 해제: 백그라운드 추출 재개")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                'state': state,
+                'trips': self._trips,
+                'retry_after': max(0.0, self._open_until - now) if state == OPEN else 0.0,
+                'calls': len(self._results),
+                'failures': self._failures,
+            }
+
+
+circuit_breaker = CircuitBreaker()
+
+CIRCUIT_STATE.set_function(lambda: {(): _STATE_VALUES[circuit_breaker.state]})
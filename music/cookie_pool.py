@@ -0,0 +1,205 @@
+# music/cookie_pool.py - 여러 YouTube 쿠키 신원에 추출 분산 (신원별 차단 상태 + 파일 변경 시 자동 재로드)
+
+import config
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from utils import metrics
+from utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# 쿠키 파일 목록 (없으면 COOKIES_FILE 하나)
+COOKIES_FILES = list(getattr(config, 'COOKIES_FILES', None) or [getattr(config, 'COOKIES_FILE', 'cookies.txt')])
+# 신원별 추출 속도 제한 (버스트 수, 1회 충전 시간(초)) - None이면 제한 없음
+COOKIE_IDENTITY_RATE = getattr(config, 'COOKIE_IDENTITY_RATE', None)
+# 차단된 신원 휴식 시간 = 기본값 × 2^(연속 차단 횟수 - 1), 최대값 이하, 지터로 50~100%
+COOKIE_THROTTLE_BACKOFF = getattr(config, 'COOKIE_THROTTLE_BACKOFF', 60.0)
+COOKIE_THROTTLE_BACKOFF_MAX = getattr(config, 'COOKIE_THROTTLE_BACKOFF_MAX', 1800.0)
+# 쿠키 파일 변경 확인 간격 (초)
+COOKIE_RELOAD_INTERVAL = getattr(config, 'COOKIE_RELOAD_INTERVAL', 10.0)
+
+COOKIE_EXTRACTIONS = metrics.registry.counter(
+    'musicbot_cookie_extractions_total', 'Extraction attempts by cookie identity', ('identity', 'kind'))
+COOKIE_RELOADS = metrics.registry.counter(
+    'musicbot_cookie_reloads_total', 'Cookie files reloaded after changing on disk', ('identity',))
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class CookieIdentity:
+    """쿠키 파일 하나 = YouTube 신원 하나
+
+    version은 파일이 바뀔 때마다 증가하며, 이전 version으로 만든 YoutubeDL 인스턴스는 버려집니다.
+    """
+
+    __slots__ = ('name', 'path', 'version', 'mtime', 'rate', 'bucket', 'in_flight', 'last_used',
+                 'last_throttled', 'strikes', 'resting_until')
+
+    def __init__(self, name: str, path: str, now: float, rate=COOKIE_IDENTITY_RATE):
+        self.name = name
+        self.path = path
+        self.version = 0
+        self.mtime = _mtime(path)
+        self.rate = rate
+        self.bucket = TokenBucket(rate[0], now) if rate else None
+        self.in_flight = 0
+        self.last_used = 0.0
+        self.last_throttled = 0.0
+        self.strikes = 0
+        self.resting_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        """토큰이 생길 때까지 남은 시간 (제한 없으면 0)"""
+        if self.bucket is None:
+            return 0.0
+        burst, refill_seconds = self.rate
+        self.bucket.refill(now, burst, refill_seconds)
+        return self.bucket.retry_after(1.0, refill_seconds)
+
+
+class CookiePool:
+    """추출마다 신원 하나를 빌려줌
+
+    쉬는 중이 아닌 신원 중 가장 오래전에 차단된 (또는 차단된 적 없는) 신원 → 진행 중 추출이
+    적은 신원 → 가장 오래전에 쓴 신원 순으로 고릅니다. 모두 쉬는 중이면 휴식이 가장 먼저
+    끝나는 신원을 씁니다 (사용자 요청은 막지 않음, 백그라운드 작업은 circuit_breaker가 거절).
+    """
+
+    def __init__(self, paths: List[str] = COOKIES_FILES, reload_interval: float = COOKIE_RELOAD_INTERVAL,
+                 rate=COOKIE_IDENTITY_RATE):
+        now = time.monotonic()
+        self.reload_interval = reload_interval
+        self._identities: List[CookieIdentity] = []
+        names = set()
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0] or 'cookies'
+            while name in names:
+                name += "'"
+            names.add(name)
+            self._identities.append(CookieIdentity(name, path, now, rate))
+        self._checked_at = now
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._identities)
+
+    @property
+    def identities(self) -> List[CookieIdentity]:
+        return list(self._identities)
+
+    def set_rate(self, rate):
+        """신원별 속도 제한 변경 (샤딩 워커가 호스트 전체 제한을 나눠 가질 때)"""
+        now = time.monotonic()
+        with self._lock:
+            for identity in self._identities:
+                identity.rate = rate
+                identity.bucket = TokenBucket(rate[0], now) if rate else None
+
+    # ---------- 빌리기 / 반납 ----------
+
+    def acquire(self, deadline: Optional[float] = None) -> Optional[CookieIdentity]:
+        """작업 스레드에서 호출 - 속도 제한이 있으면 토큰이 생길 때까지 (deadline까지만) 대기
+
+        deadline이 지나도록 토큰이 없으면 None을 반환합니다.
+        """
+        while True:
+            now = time.monotonic()
+            self._check_files(now)
+            with self._lock:
+                identity, wait = self._choose(now)
+                if wait <= 0:
+                    if identity.bucket is not None:
+                        identity.bucket.tokens -= 1.0
+                    identity.in_flight += 1
+                    identity.last_used = now
+                    return identity
+
+            if deadline is not None:
+                wait = min(wait, deadline - now)
+                if wait <= 0:
+                    return None
+            time.sleep(wait)
+
+    def _choose(self, now: float):
+        candidates = [identity for identity in self._identities if identity.resting_until <= now]
+        if not candidates:
+            # 모두 쉬는 중이어도 속도 제한은 지킴
+            identity = min(self._identities, key=lambda identity: identity.resting_until)
+            return identity, identity.wait_time(now)
+
+        ranked = sorted(candidates, key=lambda identity: (
+            identity.last_throttled, identity.in_flight, identity.last_used))
+        waits = [(identity.wait_time(now), identity) for identity in ranked]
+        for wait, identity in waits:
+            if wait <= 0:
+                return identity, 0.0
+        wait, identity = min(waits, key=lambda item: item[0])
+        return identity, wait
+
+    def release(self, identity: CookieIdentity, kind: str):
+        """추출 결과 기록 (kind는 circuit_breaker.classify 결과)"""
+        COOKIE_EXTRACTIONS.inc(identity=identity.name, kind=kind)
+        now = time.monotonic()
+        with self._lock:
+            identity.in_flight = max(0, identity.in_flight - 1)
+            if kind == 'throttle':
+                identity.strikes += 1
+                identity.last_throttled = now
+                rest = min(COOKIE_THROTTLE_BACKOFF_MAX, COOKIE_THROTTLE_BACKOFF * 2 ** (identity.strikes - 1))
+                rest *= random.uniform(0.5, 1.0)
+                identity.resting_until = now + rest
+            elif kind == 'ok':
+                identity.strikes = 0
+            else:
+                return
+
+        if kind == 'throttle' and len(self._identities) > 1:
+            logger.warning("🍪 쿠키 신원 %s 차단됨: %.0f초 휴식 (%s회 연속)", identity.name, rest, identity.strikes)
+
+    # ---------- 파일 변경 감지 ----------
+
+    def _check_files(self, now: float):
+        if now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            if now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            identities = list(self._identities)
+
+        for identity in identities:
+            mtime = _mtime(identity.path)
+            if mtime != identity.mtime:
+                # 새 쿠키면 이전 차단 기록도 의미 없음
+                with self._lock:
+                    identity.mtime = mtime
+                    identity.version += 1
+                    identity.strikes = 0
+                    identity.resting_until = 0.0
+                COOKIE_RELOADS.inc(identity=identity.name)
+                logger.info("🍪 쿠키 파일 변경 감지, 다시 읽음: %s", identity.path)
+
+    def stats(self) -> List[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    'name': identity.name,
+                    'in_flight': identity.in_flight,
+                    'strikes': identity.strikes,
+                    'resting': max(0.0, identity.resting_until - now),
+                }
+                for identity in self._identities
+            ]
+
+
+cookie_pool = CookiePool()
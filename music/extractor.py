@@ -0,0 +1,695 @@
+# music/extractor.py - yt-dlp 추출 계층 (지연 import + 백그라운드 워밍업 + 인스턴스 재사용)
+
+import config
+import asyncio
+import functools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from music.circuit_breaker import circuit_breaker, classify
+from music.cookie_pool import CookieIdentity, cookie_pool
+from utils import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+COOKIES_FILE = getattr(config, 'COOKIES_FILE', 'cookies.txt')
+# 모든 서버가 함께 쓰는 동시 추출 작업 수 (여러 줄 요청 등 일괄 처리용)
+EXTRACT_CONCURRENCY = getattr(config, 'EXTRACT_CONCURRENCY', 8)
+
+# 빠른 정보 추출용 설정
+FAST_YDL_OPTIONS = {
+    'format': 'bestaudio/best',
+    'quiet': True,
+    'no_warnings': True,
+    'extractaudio': True,
+    'noplaylist': True,
+    'nocheckcertificate': True,
+    'ignoreerrors': False,
+    'extract_flat': False,
+    'skip_download': True,
+    'cookiefile': COOKIES_FILE,
+    'socket_timeout': 20,
+    'retries': 2,
+    'geo_bypass': True,
+    'age_limit': None,
+    'http_headers': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    },
+    'extractor_args': {
+        'youtube': {
+            'player_client': ['web'],
+        }
+    }
+}
+
+# 믹스 플레이리스트 빠른 목록 추출용 설정
+MIX_FLAT_YDL_OPTIONS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': True,  # 빠른 추출
+    'playlistend': 25,  # 25곡
+    'ignoreerrors': True,
+    'socket_timeout': 8,
+    'retries': 1,
+    'geo_bypass': True,
+    'cookiefile': COOKIES_FILE
+}
+
+# 믹스 개별 곡 스트림 추출용 설정 (썸네일 제거)
+SINGLE_STREAM_YDL_OPTIONS = {
+    'format': 'bestaudio/best',
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'socket_timeout': 5,
+    'retries': 0,
+    'cookiefile': COOKIES_FILE,
+    'ignoreerrors': True,
+    'geo_bypass': True,
+    'extractor_args': {
+        'youtube': {
+            'player_client': ['web', 'android'],
+        }
+    }
+}
+
+# 재생목록 페이지 단위 평면 추출용 설정 (playliststart/playlistend는 호출마다 지정)
+PLAYLIST_FLAT_YDL_OPTIONS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': 'in_playlist',
+    'noplaylist': False,
+    'ignoreerrors': True,
+    'socket_timeout': 10,
+    'retries': 1,
+    'geo_bypass': True,
+    'cookiefile': COOKIES_FILE
+}
+
+# player_client 후보 - 프로필 설정에 player_client가 있는 프로필(fast, single_stream)만 전환하며
+# 프로필의 원래 값이 항상 첫 후보
+EXTRACT_CLIENT_CANDIDATES = getattr(config, 'EXTRACT_CLIENT_CANDIDATES', (
+    ('web',), ('web', 'android'), ('android',), ('ios',), ('mweb',)
+))
+# 클라이언트별로 기억할 최근 결과 수 / 이보다 오래된 결과는 무시 (초)
+EXTRACT_HEALTH_WINDOW = getattr(config, 'EXTRACT_HEALTH_WINDOW', 50)
+EXTRACT_HEALTH_TTL = getattr(config, 'EXTRACT_HEALTH_TTL', 600.0)
+# 최근 결과 가중치가 절반이 되는 시도 횟수
+EXTRACT_HEALTH_HALF_LIFE = getattr(config, 'EXTRACT_HEALTH_HALF_LIFE', 10)
+_HEALTH_DECAY = 0.5 ** (1.0 / EXTRACT_HEALTH_HALF_LIFE)
+# 현재 최선이 아닌 후보를 다시 시험해 보는 간격 (초)
+EXTRACT_PROBE_INTERVAL = getattr(config, 'EXTRACT_PROBE_INTERVAL', 60.0)
+# 기록이 없는 클라이언트의 예상 소요 시간 (초)
+EXTRACT_PRIOR_LATENCY = getattr(config, 'EXTRACT_PRIOR_LATENCY', 2.0)
+
+# 표본이 부족할 때 쓰는 프로필별 기본 마감 시간 (초)
+EXTRACT_DEFAULT_TIMEOUTS = getattr(config, 'EXTRACT_DEFAULT_TIMEOUTS', {
+    'fast': 10.0, 'mix_flat': 10.0, 'single_stream': 5.0, 'playlist_flat': 20.0
+})
+# 마감 시간 = p99 × 배수 (최소/최대 범위 안에서), 헤지는 p90 시점에 시작
+EXTRACT_TIMEOUT_FACTOR = getattr(config, 'EXTRACT_TIMEOUT_FACTOR', 1.5)
+EXTRACT_TIMEOUT_MIN = getattr(config, 'EXTRACT_TIMEOUT_MIN', 2.0)
+EXTRACT_TIMEOUT_MAX = getattr(config, 'EXTRACT_TIMEOUT_MAX', 30.0)
+EXTRACT_HEDGE_MIN_DELAY = getattr(config, 'EXTRACT_HEDGE_MIN_DELAY', 0.25)
+# 프로필별로 기억할 최근 성공 소요 시간 수 / 백분위 계산에 필요한 최소 표본 수
+EXTRACT_LATENCY_WINDOW = getattr(config, 'EXTRACT_LATENCY_WINDOW', 200)
+EXTRACT_MIN_SAMPLES = getattr(config, 'EXTRACT_MIN_SAMPLES', 20)
+# 동시에 진행할 수 있는 헤지 요청 수 (장애 중 부하가 두 배로 늘지 않도록)
+EXTRACT_MAX_HEDGES = getattr(config, 'EXTRACT_MAX_HEDGES', max(1, EXTRACT_CONCURRENCY // 2))
+
+EXTRACT_HEDGES = metrics.registry.counter(
+    'musicbot_extract_hedges_total', 'Hedged extraction attempts', ('profile', 'outcome'))
+EXTRACT_EXPIRED = metrics.registry.counter(
+    'musicbot_extract_expired_total', 'Extractions skipped because their deadline passed while queued', ('profile',))
+EXTRACT_ATTEMPTS = metrics.registry.counter(
+    'musicbot_extract_attempts_total', 'Extraction attempts by player client', ('profile', 'client', 'outcome'))
+
+YDL_PROFILES = {
+    'fast': FAST_YDL_OPTIONS,
+    'mix_flat': MIX_FLAT_YDL_OPTIONS,
+    'single_stream': SINGLE_STREAM_YDL_OPTIONS,
+    'playlist_flat': PLAYLIST_FLAT_YDL_OPTIONS,
+}
+
+_youtube_dl_class = None
+_import_lock = threading.Lock()
+
+# (프로필, player_client, 쿠키 신원)별 YoutubeDL 인스턴스 풀 (스레드 간 동시 사용 방지를 위해 빌려 쓰고 반납)
+# 항목은 (쿠키 버전, 인스턴스) - 쿠키 파일이 바뀌면 이전 버전 인스턴스는 버려짐
+_pools: Dict[Tuple[str, Tuple[str, ...], Optional[str]], queue.SimpleQueue] = {}
+
+_ready: Future = Future()
+_warm_up_started = False
+_warm_up_lock = threading.Lock()
+
+
+def get_youtube_dl_class():
+    """yt_dlp.YoutubeDL 지연 import (최초 1회만 비용 발생)"""
+    global _youtube_dl_class
+    if _youtube_dl_class is None:
+        with _import_lock:
+            if _youtube_dl_class is None:
+                from yt_dlp import YoutubeDL
+                _youtube_dl_class = YoutubeDL
+    return _youtube_dl_class
+
+
+def profile_clients(profile: str) -> List[Tuple[str, ...]]:
+    """프로필에서 쓸 수 있는 player_client 조합 (player_client가 없는 프로필은 빈 튜플 하나)"""
+    default = YDL_PROFILES[profile].get('extractor_args', {}).get('youtube', {}).get('player_client')
+    if not default:
+        return [()]
+    default = tuple(default)
+    return [default] + [tuple(client) for client in EXTRACT_CLIENT_CANDIDATES if tuple(client) != default]
+
+
+def _profile_options(profile: str, client: Tuple[str, ...], identity: Optional[CookieIdentity] = None) -> Dict:
+    options = dict(YDL_PROFILES[profile], logger=_ydl_log)
+    if identity is not None:
+        options['cookiefile'] = identity.path
+    if not client:
+        return options
+    extractor_args = dict(options['extractor_args'])
+    extractor_args['youtube'] = dict(extractor_args['youtube'], player_client=list(client))
+    options['extractor_args'] = extractor_args
+    return options
+
+
+class _YdlLog:
+    """yt-dlp logger - ignoreerrors로 삼켜진 오류도 차단 감지에 쓰도록 스레드별 마지막 오류 보관"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def debug(self, message):
+        pass
+
+    def info(self, message):
+        pass
+
+    def warning(self, message):
+        logger.debug("yt-dlp: %s", message)
+
+    def error(self, message):
+        self._local.last_error = message
+        logger.debug("yt-dlp: %s", message)
+
+    def take_error(self) -> Optional[str]:
+        message = getattr(self._local, 'last_error', None)
+        self._local.last_error = None
+        return message
+
+
+_ydl_log = _YdlLog()
+
+
+def _client_label(client: Tuple[str, ...]) -> str:
+    return '+'.join(client) or 'default'
+
+
+def _build_instance(profile: str, client: Tuple[str, ...] = (), identity: Optional[CookieIdentity] = None):
+    return get_youtube_dl_class()(_profile_options(profile, client, identity))
+
+
+def _pool(profile: str, client: Tuple[str, ...], identity: Optional[CookieIdentity]) -> queue.SimpleQueue:
+    key = (profile, client, identity.name if identity else None)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools.setdefault(key, queue.SimpleQueue())
+    return pool
+
+
+def _borrow(profile: str, client: Tuple[str, ...] = (), identity: Optional[CookieIdentity] = None):
+    version = identity.version if identity else 0
+    pool = _pool(profile, client, identity)
+    while True:
+        try:
+            ydl_version, ydl = pool.get_nowait()
+        except queue.Empty:
+            return _build_instance(profile, client, identity)
+        if ydl_version == version:
+            return ydl
+        _close_instance(ydl)
+
+
+def _give_back(profile: str, ydl, client: Tuple[str, ...] = (), identity: Optional[CookieIdentity] = None,
+               version: Optional[int] = None):
+    current = identity.version if identity else 0
+    if version is None:
+        version = current
+    if version == current:
+        _pool(profile, client, identity).put((version, ydl))
+    else:
+        _close_instance(ydl)
+
+
+def _close_instance(ydl):
+    """이전 쿠키 버전 인스턴스 정리 (HTTP 세션, 쿠키 jar)"""
+    try:
+        ydl.close()
+    except Exception as e:
+        logger.debug("⚠️ 이전 쿠키 인스턴스 정리 실패: %s", e)
+
+
+class ClientHealth:
+    """(프로필, player_client) 하나의 최근 성공 여부/소요 시간"""
+
+    __slots__ = ('results', 'last_attempt', 'probing')
+
+    def __init__(self, now: float):
+        self.results = deque(maxlen=EXTRACT_HEALTH_WINDOW)
+        # 시작 직후에는 시험하지 않도록 생성 시각부터 간격 계산
+        self.last_attempt = now
+        self.probing = False
+
+    def record(self, ok: bool, latency: float, now: float):
+        self.results.append((now, ok, latency))
+
+    def sampled(self, now: float) -> bool:
+        """EXTRACT_HEALTH_TTL 안의 결과가 있는지"""
+        return bool(self.results) and now - self.results[-1][0] <= EXTRACT_HEALTH_TTL
+
+    def score(self, now: float) -> float:
+        """성공 1회당 예상 소요 시간 (작을수록 좋음)
+
+        최근 결과일수록 가중치가 크고 (EXTRACT_HEALTH_HALF_LIFE회마다 절반), 표본이 적으면
+        사전값 쪽으로 보정되므로 장애가 시작되면 몇 번의 실패만으로 점수가 나빠집니다.
+        """
+        weight = 1.0
+        attempts = successes = 0.0
+        total = EXTRACT_PRIOR_LATENCY
+        for at, ok, latency in reversed(self.results):
+            if now - at > EXTRACT_HEALTH_TTL:
+                break
+            attempts += weight
+            successes += weight * ok
+            total += weight * latency
+            weight *= _HEALTH_DECAY
+        mean_latency = total / (attempts + 1)
+        success_rate = (successes + 1) / (attempts + 2)
+        return mean_latency / success_rate
+
+
+class ClientSelector:
+    """프로필별로 가장 건강한 player_client를 고르고, 다른 후보는 가끔 하나씩 시험"""
+
+    def __init__(self, probe_interval: float = EXTRACT_PROBE_INTERVAL):
+        self.probe_interval = probe_interval
+        self._health: Dict[Tuple[str, Tuple[str, ...]], ClientHealth] = {}
+        self._best: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, profile: str, client: Tuple[str, ...], now: float) -> ClientHealth:
+        health = self._health.get((profile, client))
+        if health is None:
+            health = self._health[(profile, client)] = ClientHealth(now)
+        return health
+
+    def choose(self, profile: str, allow_probe: bool = True) -> Tuple[Tuple[str, ...], bool]:
+        """(player_client, 시험 여부)"""
+        clients = profile_clients(profile)
+        if len(clients) == 1:
+            return clients[0], False
+
+        now = time.monotonic()
+        with self._lock:
+            # 점수가 같으면 프로필 기본값이 먼저 (정렬 안정성)
+            ranked = sorted(clients, key=lambda client: self._get(profile, client, now).score(now))
+            # 결과가 없는 후보는 사전값 점수뿐이므로 시험으로만 사용하고, 기본값보다 나은 것이
+            # 확인된 후보로만 전환
+            best = next(
+                client for client in ranked
+                if client == clients[0] or self._get(profile, client, now).sampled(now)
+            )
+            if self._best.get(profile, clients[0]) != best:
+                logger.warning(
+                    "🔀 추출 클라이언트 전환 (%s): %s → %s",
+                    profile, _client_label(self._best.get(profile, clients[0])), _client_label(best)
+                )
+            self._best[profile] = best
+
+            if allow_probe:
+                for client in ranked:
+                    if client == best:
+                        continue
+                    health = self._get(profile, client, now)
+                    if not health.probing and now - health.last_attempt >= self.probe_interval:
+                        health.probing = True
+                        health.last_attempt = now
+                        return client, True
+
+            self._get(profile, best, now).last_attempt = now
+            return best, False
+
+    def record(self, profile: str, client: Tuple[str, ...], ok: bool, latency: float, probe: bool = False):
+        now = time.monotonic()
+        with self._lock:
+            health = self._get(profile, client, now)
+            health.record(ok, latency, now)
+            if probe:
+                health.probing = False
+        EXTRACT_ATTEMPTS.inc(profile=profile, client=_client_label(client), outcome='ok' if ok else 'error')
+
+    def cancel_probe(self, profile: str, client: Tuple[str, ...]):
+        """시작하지 못한 시험 (마감 시간 초과 등)"""
+        with self._lock:
+            self._get(profile, client, time.monotonic()).probing = False
+
+
+client_selector = ClientSelector()
+
+
+class DeadlineExceeded(Exception):
+    """대기열에서 기다리는 동안 마감 시간이 지나 시작하지 않은 추출"""
+
+
+class LatencyStats:
+    """프로필 하나의 최근 성공 소요 시간 - 마감 시간과 헤지 시점 계산용"""
+
+    def __init__(self, default_timeout: float):
+        self.default_timeout = default_timeout
+        self._samples = deque(maxlen=EXTRACT_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < EXTRACT_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(percent / 100 * len(ordered)))]
+
+    def timeout(self) -> float:
+        p99 = self.percentile(99)
+        if p99 is None:
+            return self.default_timeout
+        return min(EXTRACT_TIMEOUT_MAX, max(EXTRACT_TIMEOUT_MIN, p99 * EXTRACT_TIMEOUT_FACTOR))
+
+    def hedge_delay(self) -> Optional[float]:
+        p90 = self.percentile(90)
+        if p90 is None:
+            return None
+        return max(EXTRACT_HEDGE_MIN_DELAY, p90)
+
+
+latency_stats: Dict[str, LatencyStats] = {
+    profile: LatencyStats(EXTRACT_DEFAULT_TIMEOUTS.get(profile, 10.0)) for profile in YDL_PROFILES
+}
+
+
+def _warm_up():
+    """yt-dlp import → 프로필 인스턴스 생성 → 쿠키 로드 (단계별 시간 기록)"""
+    phases = {}
+    try:
+        started = time.perf_counter()
+        get_youtube_dl_class()
+        phases['import'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        instances = {
+            (profile, profile_clients(profile)[0], identity):
+                _build_instance(profile, profile_clients(profile)[0], identity)
+            for profile in YDL_PROFILES
+            for identity in cookie_pool.identities
+        }
+        phases['profiles'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for ydl in instances.values():
+            ydl.cookiejar  # 쿠키 파일 파싱은 첫 접근 시 수행됨
+        phases['cookies'] = time.perf_counter() - started
+
+        for (profile, client, identity), ydl in instances.items():
+            _give_back(profile, ydl, client, identity)
+
+        logger.info(
+            "🔥 추출기 워밍업 완료: import %.2f초, 프로필 %.2f초, 쿠키 %.2f초",
+            phases['import'], phases['profiles'], phases['cookies']
+        )
+        _ready.set_result(phases)
+
+    except Exception as e:
+        logger.error("❌ 추출기 워밍업 실패: %s", e)
+        _ready.set_exception(e)
+
+
+def start_warm_up(loop: Optional[asyncio.AbstractEventLoop] = None):
+    """백그라운드 스레드에서 워밍업 시작 (중복 호출 무시)"""
+    global _warm_up_started
+    with _warm_up_lock:
+        if _warm_up_started:
+            return
+        _warm_up_started = True
+
+    if loop is None:
+        threading.Thread(target=_warm_up, name="extractor-warm-up", daemon=True).start()
+    else:
+        loop.run_in_executor(None, _warm_up)
+
+
+def is_ready() -> bool:
+    return _ready.done() and _ready.exception() is None
+
+
+async def wait_ready(timeout: float = 30.0) -> bool:
+    """이벤트 루프를 막지 않고 워밍업 완료 대기"""
+    if _ready.done():
+        return _ready.exception() is None
+
+    start_warm_up(asyncio.get_running_loop())
+    try:
+        await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(_ready)), timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+def ensure_ready():
+    """작업 스레드에서 워밍업 완료 대기 (시작 전이면 직접 수행)"""
+    global _warm_up_started
+    with _warm_up_lock:
+        run_inline = not _warm_up_started
+        _warm_up_started = True
+
+    if run_inline:
+        _warm_up()
+    try:
+        _ready.result()
+    except Exception:
+        # 워밍업이 실패해도 추출 시 인스턴스를 직접 생성해서 진행
+        pass
+
+
+def extract_info(profile: str, url: str, deadline: Optional[float] = None, **overrides):
+    """프로필 설정으로 정보 추출 (스레드에서 실행)
+
+    player_client는 최근 성공률/소요 시간 기준으로 고르고, 시험 중인 클라이언트가
+    실패하면 현재 최선의 클라이언트로 한 번 더 시도합니다.
+    deadline(time.monotonic 기준)이 지났으면 시작하지 않습니다.
+    overrides는 빌린 인스턴스의 params에 이번 호출 동안만 적용됩니다 (예: playliststart).
+    """
+    ensure_ready()
+    if deadline is not None and time.monotonic() >= deadline:
+        EXTRACT_EXPIRED.inc(profile=profile)
+        raise DeadlineExceeded(profile)
+
+    client, probe = client_selector.choose(profile)
+    try:
+        info = _extract_with(profile, client, url, overrides, probe, deadline)
+    except Exception:
+        if not probe:
+            raise
+        info = None
+
+    if probe and not _usable(info):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExceeded(profile)
+        client, _ = client_selector.choose(profile, allow_probe=False)
+        info = _extract_with(profile, client, url, overrides, deadline=deadline)
+    return info
+
+
+def _usable(info) -> bool:
+    return bool(info) and (bool(info.get('url')) or 'entries' in info)
+
+
+def _extract_with(profile: str, client: Tuple[str, ...], url: str, overrides: Dict, probe: bool = False,
+                  deadline: Optional[float] = None):
+    # 쿠키 신원별 속도 제한이 있으면 여기서 (마감 시간까지만) 대기
+    identity = cookie_pool.acquire(deadline)
+    if identity is None:
+        # 시도하지 않았으므로 결과는 남기지 않고 시험 표시만 해제 (다음 간격에 다시 시험)
+        if probe:
+            client_selector.cancel_probe(profile, client)
+        EXTRACT_EXPIRED.inc(profile=profile)
+        raise DeadlineExceeded(profile)
+    version = identity.version
+
+    started = time.perf_counter()
+    ydl = info = error = None
+    previous = {}
+    _ydl_log.take_error()
+    try:
+        ydl = _borrow(profile, client, identity)
+        previous = {key: ydl.params.get(key) for key in overrides}
+        ydl.params.update(overrides)
+        with tracing.span('extract_info', profile=profile, client=_client_label(client)):
+            info = ydl.extract_info(url, download=False)
+        return info
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        latency = time.perf_counter() - started
+        metrics.EXTRACT_LATENCY.observe(latency, profile=profile)
+        ok = _usable(info)
+        client_selector.record(profile, client, ok, latency, probe)
+        kind = classify(error, _ydl_log.take_error())
+        circuit_breaker.record(kind)
+        cookie_pool.release(identity, kind)
+        if ok:
+            latency_stats[profile].record(latency)
+        if ydl is not None:
+            for key, value in previous.items():
+                if value is None:
+                    ydl.params.pop(key, None)
+                else:
+                    ydl.params[key] = value
+            _give_back(profile, ydl, client, identity, version)
+
+
+class ExtractionScheduler:
+    """공용 추출 스레드 풀 - 요청/서버 수와 관계없이 동시 실행 수를 제한"""
+
+    def __init__(self, max_workers: int = EXTRACT_CONCURRENCY, max_hedges: int = EXTRACT_MAX_HEDGES):
+        self.max_workers = max_workers
+        self.max_hedges = max_hedges
+        self._hedges = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="extract")
+        return self._executor
+
+    async def run(self, func, *args, **kwargs):
+        """작업 스레드에서 func 실행 (추적 정보 전달)"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(tracing.bind(func), *args, **kwargs)
+        return await loop.run_in_executor(self._get_executor(), call)
+
+    async def extract(self, profile: str, url: str, executor=None, timeout: Optional[float] = None,
+                      hedge: bool = True, background: bool = False, **overrides):
+        """마감 시간이 있는 추출
+
+        마감 시간은 최근 소요 시간 p99 기준이고, p90 시점까지 끝나지 않으면 공용 풀에서
+        한 번 더 시도해 먼저 끝난 쓸 수 있는 결과를 사용합니다. 마감이 지나면 아직 시작하지
+        않은 시도는 취소되고, 작업 스레드도 마감이 지난 시도는 시작하지 않습니다.
+        executor가 None이면 기본 스레드 풀에서 첫 시도를 실행합니다.
+
+        background=True(믹스 채우기, 미리 추출, 라디오)는 YouTube 차단이 감지된 동안
+        CircuitOpen으로 거절되고, 차단 감지 중에는 헤지도 하지 않습니다.
+        """
+        probe = circuit_breaker.admit(background)
+        try:
+            return await self._extract(profile, url, executor, timeout, hedge and circuit_breaker.closed,
+                                       overrides)
+        finally:
+            if probe:
+                circuit_breaker.release()
+
+    async def _extract(self, profile: str, url: str, executor, timeout: Optional[float], hedge: bool,
+                       overrides: Dict):
+        stats = latency_stats[profile]
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        deadline = started + (timeout or stats.timeout())
+        call = functools.partial(tracing.bind(extract_info), profile, url, deadline, **overrides)
+
+        primary = asyncio.ensure_future(loop.run_in_executor(executor, call))
+        pending = {primary}
+        hedged = None
+        hedge_delay = stats.hedge_delay() if hedge else None
+        hedge_at = started + hedge_delay if hedge_delay is not None else None
+        fallback = error = None
+
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                wait = deadline - now
+                if hedged is None and hedge_at is not None:
+                    wait = max(0.0, min(wait, hedge_at - now))
+
+                done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        info = future.result()
+                    except Exception as e:
+                        error = e
+                        continue
+                    if _usable(info):
+                        if hedged is not None:
+                            EXTRACT_HEDGES.inc(profile=profile, outcome='won' if future is hedged else 'lost')
+                        return info
+                    fallback = info
+
+                if not done and hedged is None and hedge_at is not None and time.monotonic() >= hedge_at:
+                    if not self._acquire_hedge():
+                        # 헤지 한도 초과 - 이번 호출은 헤지 없이 마감 시간까지 대기
+                        hedge_at = None
+                        continue
+                    # 컨텍스트 하나는 두 스레드에서 동시에 들어갈 수 없으므로 헤지용으로 새로 복사
+                    hedge_call = functools.partial(tracing.bind(extract_info), profile, url, deadline, **overrides)
+                    hedged = asyncio.ensure_future(loop.run_in_executor(self._get_executor(), hedge_call))
+                    hedged.add_done_callback(lambda _: self._release_hedge())
+                    pending.add(hedged)
+                    logger.debug("🪁 추출 헤지 시작 (%s, %.2f초 경과)", profile, time.monotonic() - started)
+
+            if pending:
+                raise asyncio.TimeoutError(f"{profile} extraction exceeded {deadline - started:.1f}s")
+            if fallback is None and error is not None:
+                raise error
+            return fallback
+        finally:
+            # 아직 시작하지 않은 시도는 취소 (실행 중인 스레드는 결과만 버려짐)
+            for future in pending:
+                future.cancel()
+
+    def _acquire_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges >= self.max_hedges:
+                return False
+            self._hedges += 1
+            return True
+
+    def _release_hedge(self):
+        with self._lock:
+            self._hedges -= 1
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+scheduler = ExtractionScheduler()
@@ -0,0 +1,293 @@
+# music/ffmpeg_supervisor.py - FFmpeg 자식 프로세스 관리 (동시 실행 제한 + 리소스 측정)
+
+import discord
+import config
+import asyncio
+import logging
+import os
+import shutil
+import time
+from typing import Callable, Dict, Optional
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# 호스트 전체 동시 실행 FFmpeg 프로세스 수
+FFMPEG_MAX_PROCESSES = getattr(config, 'FFMPEG_MAX_PROCESSES', 16)
+# 슬롯 대기 최대 시간 (초)
+FFMPEG_SLOT_TIMEOUT = getattr(config, 'FFMPEG_SLOT_TIMEOUT', 30.0)
+# 프로세스 우선순위 (nice: 0~19, ionice: class 2 best-effort, level 0~7)
+FFMPEG_NICE_LEVEL = getattr(config, 'FFMPEG_NICE_LEVEL', 5)
+FFMPEG_IONICE_CLASS = getattr(config, 'FFMPEG_IONICE_CLASS', 2)
+FFMPEG_IONICE_LEVEL = getattr(config, 'FFMPEG_IONICE_LEVEL', 4)
+# 샘플링 주기 및 정지 판정 시간 (초)
+FFMPEG_SAMPLE_INTERVAL = getattr(config, 'FFMPEG_SAMPLE_INTERVAL', 5.0)
+FFMPEG_STALL_TIMEOUT = getattr(config, 'FFMPEG_STALL_TIMEOUT', 20.0)
+
+_CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+class FFmpegProcess:
+    """감시 중인 FFmpeg 프로세스 한 개의 상태"""
+
+    __slots__ = (
+        'guild_id', 'source', 'pid', 'started_at', 'cpu_percent', 'rss_bytes',
+        '_last_cpu_ticks', '_last_sample_at', '_last_progress_at', 'on_stall', 'stalled'
+    )
+
+    def __init__(self, guild_id: int, source: discord.AudioSource, pid: int,
+                 on_stall: Optional[Callable[[], None]] = None):
+        now = time.monotonic()
+        self.guild_id = guild_id
+        self.source = source
+        self.pid = pid
+        self.started_at = now
+        self.cpu_percent = 0.0
+        self.rss_bytes = 0
+        self._last_cpu_ticks = None
+        self._last_sample_at = now
+        self._last_progress_at = now
+        self.on_stall = on_stall
+        self.stalled = False
+
+
+class FFmpegSupervisor:
+    """모든 FFmpeg 자식 프로세스를 서버별로 추적하고 자원 사용량을 샘플링"""
+
+    def __init__(self, max_processes: int = FFMPEG_MAX_PROCESSES):
+        self.max_processes = max_processes
+        self._processes: Dict[int, FFmpegProcess] = {}
+        self._slots = None
+        self._waiting = 0
+        self._monitor_task = None
+        self._loop = None
+        self._ionice_path = shutil.which('ionice')
+        # 벤치마크 등에서 교체 가능한 오디오 소스 생성자
+        self.source_factory = discord.FFmpegPCMAudio
+
+        self.total_spawned = 0
+        self.total_stalls = 0
+        self.total_orphans_killed = 0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_processes)
+            self._loop = asyncio.get_running_loop()
+        return self._slots
+
+    async def spawn(self, guild_id: int, stream_url: str, *,
+                    on_stall: Optional[Callable[[], None]] = None, **ffmpeg_options) -> discord.AudioSource:
+        """슬롯을 확보한 뒤 FFmpeg 오디오 소스 생성 (슬롯이 없으면 대기열에서 대기)"""
+        slots = self._get_slots()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=FFMPEG_SLOT_TIMEOUT)
+        finally:
+            self._waiting -= 1
+
+        try:
+            source = self.source_factory(stream_url, **ffmpeg_options)
+        except Exception:
+            slots.release()
+            raise
+
+        process = getattr(source, '_process', None)
+        pid = getattr(process, 'pid', None) or -id(source)
+        entry = FFmpegProcess(guild_id, source, pid, on_stall)
+        self._processes[pid] = entry
+        self.total_spawned += 1
+
+        if pid > 0:
+            await self._apply_priority(pid)
+        self._ensure_monitor()
+
+        logger.debug("🎛️ FFmpeg 시작: 서버 %s pid=%s (실행 %d/%d)",
+                     guild_id, pid, len(self._processes), self.max_processes)
+        return source
+
+    def release(self, source: discord.AudioSource):
+        """프로세스 종료 후 슬롯 반환 (음성 스레드에서도 호출 가능)"""
+        if self._loop and not self._loop.is_closed():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not self._loop:
+                self._loop.call_soon_threadsafe(self._release, source)
+                return
+        self._release(source)
+
+    def _release(self, source: discord.AudioSource):
+        for pid, entry in list(self._processes.items()):
+            if entry.source is source:
+                del self._processes[pid]
+                if self._slots:
+                    self._slots.release()
+                logger.debug("🎛️ FFmpeg 종료: 서버 %s pid=%s", entry.guild_id, pid)
+                return
+
+    async def _apply_priority(self, pid: int):
+        """nice / ionice 우선순위 적용"""
+        try:
+            if FFMPEG_NICE_LEVEL and hasattr(os, 'setpriority'):
+                os.setpriority(os.PRIO_PROCESS, pid, FFMPEG_NICE_LEVEL)
+        except OSError as e:
+            logger.debug("⚠️ nice 적용 실패 pid=%s: %s", pid, e)
+
+        if not self._ionice_path or FFMPEG_IONICE_CLASS is None:
+            return
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                self._ionice_path, '-c', str(FFMPEG_IONICE_CLASS), '-n', str(FFMPEG_IONICE_LEVEL),
+                '-p', str(pid),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            await proc.wait()
+        except Exception as e:
+            logger.debug("⚠️ ionice 적용 실패 pid=%s: %s", pid, e)
+
+    def _ensure_monitor(self):
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._monitor_loop())
+
+    async def _monitor_loop(self):
+        """주기적으로 /proc에서 CPU/RSS를 샘플링하고 정지·고아 프로세스 정리"""
+        try:
+            while self._processes:
+                await asyncio.sleep(FFMPEG_SAMPLE_INTERVAL)
+                for entry in list(self._processes.values()):
+                    self._sample(entry)
+                    self._check_entry(entry)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error("❌ FFmpeg 감시 루프 오류: %s", e)
+        finally:
+            self._monitor_task = None
+
+    def _sample(self, entry: FFmpegProcess):
+        if entry.pid <= 0:
+            return
+        try:
+            with open(f'/proc/{entry.pid}/stat', 'rb') as f:
+                fields = f.read().rsplit(b')', 1)[1].split()
+            with open(f'/proc/{entry.pid}/statm', 'rb') as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            return
+
+        now = time.monotonic()
+        # utime, stime (stat의 14, 15번째 필드; ')' 이후 기준 11, 12번째)
+        cpu_ticks = int(fields[11]) + int(fields[12])
+        if entry._last_cpu_ticks is not None:
+            elapsed = max(now - entry._last_sample_at, 1e-6)
+            delta = cpu_ticks - entry._last_cpu_ticks
+            entry.cpu_percent = delta / _CLK_TCK / elapsed * 100
+            if delta > 0:
+                entry._last_progress_at = now
+        entry._last_cpu_ticks = cpu_ticks
+        entry._last_sample_at = now
+        entry.rss_bytes = rss_pages * _PAGE_SIZE
+
+    def _check_entry(self, entry: FFmpegProcess):
+        process = getattr(entry.source, '_process', None)
+
+        # 이미 종료된 프로세스 (after 콜백이 유실된 경우)
+        if process is not None and process.poll() is not None:
+            self._release(entry.source)
+            return
+
+        # 고아 프로세스: 소유 플레이어가 더 이상 이 소스를 재생하지 않음
+        if not self._is_owned(entry):
+            logger.warning("🧟 고아 FFmpeg 정리: 서버 %s pid=%s", entry.guild_id, entry.pid)
+            self.total_orphans_killed += 1
+            self._kill(entry)
+            return
+
+        # 실제 프로세스가 없는 소스(벤치마크용 가짜 소스 등)는 CPU 기반 정지 판정 불가
+        if entry.pid <= 0:
+            return
+
+        # 일시정지 중에는 파이프가 차서 FFmpeg가 멈추는 것이 정상
+        if self._is_paused(entry):
+            entry._last_progress_at = time.monotonic()
+            return
+
+        # 정지 감지: CPU 시간이 일정 시간 이상 증가하지 않음
+        if not entry.stalled and time.monotonic() - entry._last_progress_at > FFMPEG_STALL_TIMEOUT:
+            entry.stalled = True
+            self.total_stalls += 1
+            logger.warning("🧊 FFmpeg 정지 감지: 서버 %s pid=%s, 재시작", entry.guild_id, entry.pid)
+            if entry.on_stall:
+                try:
+                    entry.on_stall()
+                except Exception as e:
+                    logger.error("❌ 정지 콜백 오류: %s", e)
+            self._kill(entry)
+
+    def _is_owned(self, entry: FFmpegProcess) -> bool:
+        from music.player import players
+        player = players.get(entry.guild_id)
+        if not player or not player.vc or not player.vc.is_connected():
+            return False
+        current_source = getattr(player.vc, 'source', None)
+        if current_source is None:
+            # 재생 시작 직전일 수 있으므로 유예
+            return time.monotonic() - entry.started_at < FFMPEG_STALL_TIMEOUT
+        return current_source is entry.source or getattr(current_source, 'original', None) is entry.source
+
+    def _is_paused(self, entry: FFmpegProcess) -> bool:
+        from music.player import players
+        player = players.get(entry.guild_id)
+        return bool(player and player.vc and player.vc.is_paused())
+
+    def _kill(self, entry: FFmpegProcess):
+        """프로세스 종료 (음성 플레이어는 EOF를 받고 after 콜백 실행)"""
+        process = getattr(entry.source, '_process', None)
+        try:
+            if process is not None and process.poll() is None:
+                process.kill()
+        except Exception as e:
+            logger.debug("⚠️ FFmpeg 종료 실패 pid=%s: %s", entry.pid, e)
+
+    def kill_guild(self, guild_id: int):
+        """서버의 모든 FFmpeg 프로세스 종료"""
+        for entry in list(self._processes.values()):
+            if entry.guild_id == guild_id:
+                self._kill(entry)
+                self._release(entry.source)
+
+    def shutdown(self):
+        """봇 종료 시 모든 프로세스 정리"""
+        for entry in list(self._processes.values()):
+            self._kill(entry)
+            self._release(entry.source)
+        if self._monitor_task and not self._monitor_task.done():
+            self._monitor_task.cancel()
+
+    def get_stats(self) -> Dict:
+        """용량 계획용 통계"""
+        guilds = {}
+        for entry in self._processes.values():
+            guild = guilds.setdefault(entry.guild_id, {'processes': 0, 'cpu_percent': 0.0, 'rss_bytes': 0})
+            guild['processes'] += 1
+            guild['cpu_percent'] += entry.cpu_percent
+            guild['rss_bytes'] += entry.rss_bytes
+
+        return {
+            'running': len(self._processes),
+            'waiting': self._waiting,
+            'max_processes': self.max_processes,
+            'cpu_percent': sum(e.cpu_percent for e in self._processes.values()),
+            'rss_bytes': sum(e.rss_bytes for e in self._processes.values()),
+            'total_spawned': self.total_spawned,
+            'total_stalls': self.total_stalls,
+            'total_orphans_killed': self.total_orphans_killed,
+            'guilds': guilds
+        }
+
+
+supervisor = FFmpegSupervisor()
+metrics.FFMPEG_PROCESSES.set_function(lambda: {(): len(supervisor._processes)})
@@ -0,0 +1,255 @@
+# music/history.py - 서버별 재생 기록 (링 버퍼 + 해시 인덱스, SQLite 저장은 이벤트 루프 밖에서)
+
+import config
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+HISTORY_FILE = getattr(config, 'HISTORY_FILE', 'play_history.db')
+# 서버별로 기억할 최근 재생 수
+HISTORY_SIZE = getattr(config, 'HISTORY_SIZE', 200)
+# 마지막 기록 후 파일에 쓰기까지 대기 시간 (초)
+HISTORY_SAVE_DELAY = getattr(config, 'HISTORY_SAVE_DELAY', 5.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS play_history (
+    guild_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    video_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    uploader TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    PRIMARY KEY (guild_id, seq)
+)
+"""
+
+
+class HistoryEntry:
+    __slots__ = ('seq', 'video_id', 'title', 'duration', 'uploader', 'played_at')
+
+    def __init__(self, seq: int, video_id: str, title: str, duration: int, uploader: str, played_at: float):
+        self.seq = seq
+        self.video_id = video_id
+        self.title = title
+        self.duration = duration
+        self.uploader = uploader
+        self.played_at = played_at
+
+    @property
+    def video_url(self) -> str:
+        return f"https://www.youtube.com/watch?v={self.video_id}"
+
+    def to_row(self, guild_id: int):
+        return (guild_id, self.seq, self.video_id, self.title, self.duration, self.uploader, self.played_at)
+
+
+class GuildHistory:
+    """고정 크기 링 버퍼 + 비디오 ID → (버퍼 안 등장 횟수, 최신 항목) 인덱스"""
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self.size = size
+        self.next_seq = 1
+        self._ring: deque = deque()
+        self._counts: Dict[str, int] = {}
+        self._latest: Dict[str, HistoryEntry] = {}
+
+    def __len__(self):
+        return len(self._ring)
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self._counts
+
+    def get(self, video_id: str) -> Optional[HistoryEntry]:
+        return self._latest.get(video_id)
+
+    def add(self, entry: HistoryEntry):
+        if len(self._ring) >= self.size:
+            self._evict()
+        self._ring.append(entry)
+        self._counts[entry.video_id] = self._counts.get(entry.video_id, 0) + 1
+        self._latest[entry.video_id] = entry
+        self.next_seq = max(self.next_seq, entry.seq + 1)
+
+    def _evict(self):
+        old = self._ring.popleft()
+        count = self._counts[old.video_id] - 1
+        if count:
+            self._counts[old.video_id] = count
+        else:
+            del self._counts[old.video_id]
+            del self._latest[old.video_id]
+
+    def recent(self, limit: int = 25) -> List[HistoryEntry]:
+        """최근 재생 순 (같은 곡은 한 번만)"""
+        entries = []
+        seen = set()
+        for entry in reversed(self._ring):
+            if entry.video_id in seen:
+                continue
+            seen.add(entry.video_id)
+            entries.append(entry)
+            if len(entries) >= limit:
+                break
+        return entries
+
+    def entries(self) -> List[HistoryEntry]:
+        return list(self._ring)
+
+
+class PlayHistory:
+    """서버별 재생 기록 저장소 - 조회/기록은 메모리에서, 새 기록은 모아서 스레드에서 SQLite에 저장"""
+
+    def __init__(self, path: str = HISTORY_FILE, size: int = HISTORY_SIZE, save_delay: float = HISTORY_SAVE_DELAY):
+        self.path = path
+        self.size = size
+        self.save_delay = save_delay
+        self._guilds: Dict[int, GuildHistory] = {}
+        self._pending: List[tuple] = []
+        self._save_handle = None
+        self._write_lock = threading.Lock()
+        self.loaded = False
+
+    # ---------- 조회 ----------
+
+    def guild(self, guild_id: int) -> GuildHistory:
+        history = self._guilds.get(guild_id)
+        if history is None:
+            history = self._guilds[guild_id] = GuildHistory(self.size)
+        return history
+
+    def contains(self, guild_id: int, video_id: str) -> bool:
+        """최근 재생 여부 (O(1))"""
+        history = self._guilds.get(guild_id)
+        return history is not None and video_id in history
+
+    def get(self, guild_id: int, video_id: str) -> Optional[HistoryEntry]:
+        history = self._guilds.get(guild_id)
+        return history.get(video_id) if history else None
+
+    def recent(self, guild_id: int, limit: int = 25) -> List[HistoryEntry]:
+        history = self._guilds.get(guild_id)
+        return history.recent(limit) if history else []
+
+    def all_entries(self):
+        """(서버 ID, 항목) 전체 - 검색 인덱스 구성용"""
+        for guild_id, history in self._guilds.items():
+            for entry in history.entries():
+                yield guild_id, entry
+
+    # ---------- 기록 ----------
+
+    def record(self, guild_id: int, track: Dict) -> Optional[HistoryEntry]:
+        """재생 시작된 트랙 기록"""
+        video_id = track.get('id')
+        if not video_id:
+            return None
+
+        history = self.guild(guild_id)
+        entry = HistoryEntry(
+            history.next_seq,
+            video_id,
+            track.get('title', 'Unknown'),
+            int(track.get('duration') or 0),
+            track.get('uploader') or 'Unknown',
+            time.time()
+        )
+        history.add(entry)
+        self._pending.append(entry.to_row(guild_id))
+        self._schedule_save()
+        return entry
+
+    # ---------- 저장 ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10.0)
+        conn.execute(_SCHEMA)
+        return conn
+
+    def _load_rows(self):
+        with self._write_lock:
+            conn = self._connect()
+            try:
+                return conn.execute(
+                    "SELECT guild_id, seq, video_id, title, duration, uploader, played_at "
+                    "FROM play_history ORDER BY guild_id, seq"
+                ).fetchall()
+            finally:
+                conn.close()
+
+    async def load(self):
+        """저장된 기록을 스레드에서 읽어 메모리 인덱스 구성 (봇 시작 시 1회)"""
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            loop = asyncio.get_running_loop()
+            rows = await loop.run_in_executor(None, self._load_rows)
+        except Exception as e:
+            logger.error("❌ 재생 기록 로드 실패: %s", e)
+            return
+
+        # setup_hook에서 이벤트 수신 전에 호출되므로 메모리 기록은 비어 있음
+        for guild_id, seq, video_id, title, duration, uploader, played_at in rows:
+            self.guild(guild_id).add(HistoryEntry(seq, video_id, title, duration, uploader, played_at))
+
+        logger.info("📜 재생 기록 로드: %s개 서버, %s곡", len(self._guilds), len(rows))
+
+    def _schedule_save(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.save_delay, self._start_save, loop)
+
+    def _start_save(self, loop):
+        self._save_handle = None
+        rows, self._pending = self._pending, []
+        if rows:
+            loop.run_in_executor(None, self._write_rows, rows)
+
+    def flush(self):
+        """대기 중인 기록을 즉시 저장 (봇 종료 시)"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        rows, self._pending = self._pending, []
+        if rows:
+            self._write_rows(rows)
+
+    def _write_rows(self, rows: List[tuple]):
+        """새 기록 추가 후 서버별로 링 버퍼 크기를 넘는 오래된 행 삭제"""
+        with self._write_lock:
+            try:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO play_history "
+                            "(guild_id, seq, video_id, title, duration, uploader, played_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            rows
+                        )
+                        latest = {}
+                        for row in rows:
+                            latest[row[0]] = max(latest.get(row[0], 0), row[1])
+                        conn.executemany(
+                            "DELETE FROM play_history WHERE guild_id = ? AND seq <= ?",
+                            [(guild_id, seq - self.size) for guild_id, seq in latest.items()]
+                        )
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.error("❌ 재생 기록 저장 실패: %s", e)
+
+
+play_history = PlayHistory()
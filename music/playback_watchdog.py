@@ -0,0 +1,147 @@
+# music/playback_watchdog.py - 재생 감시 (프레임 전송량 vs 실제 시간)
+
+import discord
+import config
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# discord.py는 20ms 단위 PCM 프레임을 전송
+FRAME_SECONDS = 0.02
+
+# 감시 주기 / 프레임 미전송 시 정지 판정 시간 (초)
+WATCHDOG_INTERVAL = getattr(config, 'WATCHDOG_INTERVAL', 1.0)
+WATCHDOG_STALL_SECONDS = getattr(config, 'WATCHDOG_STALL_SECONDS', 8.0)
+# 측정 구간 동안 기대 프레임 대비 이 비율 미만이면 언더런으로 판정
+WATCHDOG_UNDERRUN_RATIO = getattr(config, 'WATCHDOG_UNDERRUN_RATIO', 0.9)
+WATCHDOG_WINDOW_SECONDS = getattr(config, 'WATCHDOG_WINDOW_SECONDS', 5.0)
+# 곡 끝에서 이 시간 이내에 끊기면 정상 종료로 간주 (초)
+RESUME_TAIL_SECONDS = getattr(config, 'RESUME_TAIL_SECONDS', 5.0)
+# 곡당 최대 이어듣기 복구 시도 횟수
+MAX_RESUME_ATTEMPTS = getattr(config, 'MAX_RESUME_ATTEMPTS', 3)
+
+
+class TrackedAudioSource(discord.AudioSource):
+    """전송된 프레임 수와 EOF 여부를 기록하는 오디오 소스 래퍼"""
+
+    def __init__(self, original: discord.AudioSource, start_offset: float = 0.0):
+        self.original = original
+        self.start_offset = start_offset
+        self.frames = 0
+        self.eof = False
+        self.stalled = False
+        self.last_frame_at = time.monotonic()
+
+    def read(self) -> bytes:
+        data = self.original.read()
+        if data:
+            self.frames += 1
+            self.last_frame_at = time.monotonic()
+        else:
+            self.eof = True
+        return data
+
+    def is_opus(self) -> bool:
+        return self.original.is_opus()
+
+    def cleanup(self):
+        self.original.cleanup()
+
+    @property
+    def position(self) -> float:
+        """곡 기준 현재 재생 위치 (초)"""
+        return self.start_offset + self.frames * FRAME_SECONDS
+
+    def kill(self):
+        """FFmpeg 프로세스를 종료해서 음성 스레드의 read()를 풀어줌"""
+        process = getattr(self.original, '_process', None)
+        try:
+            if process is not None and process.poll() is None:
+                process.kill()
+        except Exception as e:
+            logger.debug("⚠️ FFmpeg 종료 실패: %s", e)
+
+
+def needs_resume(source: TrackedAudioSource, track: dict, error) -> bool:
+    """재생 종료가 비정상(오류/정지/조기 EOF)이라 이어듣기가 필요한지 판단"""
+    if track.get('_resume_attempts', 0) >= MAX_RESUME_ATTEMPTS:
+        return False
+    if not track.get('video_url'):
+        return False
+
+    duration = track.get('duration', 0) or 0
+    remaining = duration - source.position if duration else None
+
+    if error or source.stalled:
+        return remaining is None or remaining > RESUME_TAIL_SECONDS
+
+    # 사용자 건너뛰기(stop)는 EOF 없이 종료됨
+    if source.eof and remaining is not None and remaining > RESUME_TAIL_SECONDS:
+        return True
+
+    return False
+
+
+class PlaybackWatchdog:
+    """재생 중 프레임 전송량을 실제 시간과 비교해 언더런과 정지를 감지"""
+
+    def __init__(self, guild_id: int, vc, source: TrackedAudioSource, title: str = ''):
+        self.guild_id = guild_id
+        self.vc = vc
+        self.source = source
+        self.title = title
+        self.underruns = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    async def _run(self):
+        try:
+            window_start = time.monotonic()
+            window_frames = self.source.frames
+
+            while not self.source.eof and self.vc and self.vc.is_connected():
+                await asyncio.sleep(WATCHDOG_INTERVAL)
+                now = time.monotonic()
+
+                # 다른 곡으로 넘어갔으면 감시 종료
+                if self.vc.source is not None and self.vc.source is not self.source:
+                    return
+
+                if self.vc.is_paused() or not self.vc.is_playing():
+                    window_start = now
+                    window_frames = self.source.frames
+                    self.source.last_frame_at = now
+                    continue
+
+                # 정지: 일정 시간 동안 프레임이 한 개도 전송되지 않음
+                if now - self.source.last_frame_at > WATCHDOG_STALL_SECONDS:
+                    logger.warning("🧊 재생 정지 감지: 서버 %s, %.1f초 지점 (%s)",
+                                   self.guild_id, self.source.position, self.title[:30])
+                    self.source.stalled = True
+                    self.source.kill()
+                    return
+
+                # 언더런: 측정 구간의 전송 프레임이 실제 시간보다 부족
+                elapsed = now - window_start
+                if elapsed >= WATCHDOG_WINDOW_SECONDS:
+                    expected = elapsed / FRAME_SECONDS
+                    sent = self.source.frames - window_frames
+                    if sent < expected * WATCHDOG_UNDERRUN_RATIO:
+                        self.underruns += 1
+                        logger.debug("📉 언더런: 서버 %s, %d/%d 프레임", self.guild_id, sent, int(expected))
+                    window_start = now
+                    window_frames = self.source.frames
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error("❌ 재생 감시 오류: %s", e)
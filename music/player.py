@@ -10,8 +10,17 @@ import re
 import time
 from datetime import timedelta, datetime
 from discord.ext import tasks
-from yt_dlp import YoutubeDL
 from ui.controls import MusicView
+from utils.guild_settings import guild_settings
+from utils.rate_limiter import rate_limiter
+from utils import metrics, tracing
+from music import extractor
+from music.circuit_breaker import CircuitOpen
+from music.history import play_history
+from music.search_index import search_index
+from music.ffmpeg_supervisor import supervisor
+from music.playback_watchdog import TrackedAudioSource, PlaybackWatchdog, needs_resume
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 
@@ -25,37 +34,33 @@ FFMPEG_OPTIONS = {
     "options": "-vn -bufsize 512k"
 }
 
-# 빠른 정보 추출용 설정
-FAST_YDL_OPTIONS = {
-    'format': 'bestaudio/best',
-    'quiet': True,
-    'no_warnings': True,
-    'extractaudio': True,
-    'noplaylist': True,
-    'nocheckcertificate': True,
-    'ignoreerrors': False,
-    'extract_flat': False,
-    'skip_download': True,
-    'cookiefile': 'cookies.txt',
-    'socket_timeout': 20,
-    'retries': 2,
-    'geo_bypass': True,
-    'age_limit': None,
-    'http_headers': {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:120.0) Gecko/20100101 Firefox/120.0',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    },
-    'extractor_args': {
-        'youtube': {
-            'player_client': ['web'],
-        }
-    }
-}
+# 재생목록 가져오기: 페이지 크기 / 최대 곡 수 / 미리 스트림을 받아 둘 다음 곡 수
+PLAYLIST_PAGE_SIZE = getattr(config, 'PLAYLIST_PAGE_SIZE', 50)
+PLAYLIST_MAX_TRACKS = getattr(config, 'PLAYLIST_MAX_TRACKS', 200)
+PLAYLIST_PREFETCH = getattr(config, 'PLAYLIST_PREFETCH', 2)
+
+# 믹스(RD...)는 YouTubeMixQueue가 처리하므로 일반 재생목록만
+_PLAYLIST_PATTERN = re.compile(r'^https?://(?:www\.|m\.|music\.)?youtube\.com/\S*[?&]list=(?!RD)([0-9A-Za-z_-]+)')
+
+# 여러 줄 메시지(셋리스트)는 줄마다 개별 요청으로 처리 - 한 메시지당 최대 줄 수
+BATCH_MAX_QUERIES = getattr(config, 'BATCH_MAX_QUERIES', 20)
+# "1. ", "2) ", "- " 같은 목록 기호
+_LIST_MARKER_PATTERN = re.compile(r'^(?:\d+\s*[.)]|[-*•])\s+')
+
+
+def _split_queries(content):
+    """메시지를 줄 단위 검색어로 분리 (빈 줄, 목록 기호 제거) - (검색어, 최대 줄 수 초과로 버린 줄 수)"""
+    queries = []
+    for line in content.splitlines():
+        line = _LIST_MARKER_PATTERN.sub('', line.strip()).strip()
+        if line:
+            queries.append(line)
+    return queries[:BATCH_MAX_QUERIES], max(0, len(queries) - BATCH_MAX_QUERIES)
+
+# 라디오 모드: 대기열이 이 곡 수 아래로 내려가면 믹스에서 부족한 만큼만 채움
+RADIO_LOW_WATERMARK = getattr(config, 'RADIO_LOW_WATERMARK', 2)
+# 라디오가 다시 고르지 않도록 기억할 최근 재생 곡 수
+RADIO_HISTORY_SIZE = getattr(config, 'RADIO_HISTORY_SIZE', 100)
 
 class YouTubeMixQueue:
     """YouTube 믹스 큐 매니저 - 별도 스레드 사용"""
@@ -66,6 +71,10 @@ class YouTubeMixQueue:
         self._processing_tasks = {}
         # 믹스 추출 전용 스레드 풀 (플레이어로부터 받음)
         self.mix_executor = mix_extraction_executor
+        # 라디오 모드 상태 (믹스 기준 곡 / 최근 재생 곡 / 채우기 태스크)
+        self.radio_seed = None
+        self._radio_played = deque(maxlen=RADIO_HISTORY_SIZE)
+        self._radio_task = None
         
     def extract_video_id(self, url: str) -> Optional[str]:
         """YouTube URL에서 비디오 ID 추출"""
@@ -83,33 +92,35 @@ class YouTubeMixQueue:
             return None
             
         except Exception as e:
-            logger.error(f"❌ 비디오 ID 추출 실패: {e}")
+            logger.error("❌ 비디오 ID 추출 실패: %s", e)
             return None
     
     def create_mix_url(self, video_id: str) -> str:
         """비디오 ID를 이용해 믹스 플레이리스트 URL 생성"""
         return f"https://www.youtube.com/watch?v={video_id}&list=RD{video_id}"
     
-    async def get_mix_list_fast(self, video_id: str) -> List[Dict]:
-        """1단계: 빠른 믹스 목록 추출 (별도 스레드)"""
+    async def get_mix_list_fast(self, video_id: str, background: bool = False) -> List[Dict]:
+        """1단계: 빠른 믹스 목록 추출 (별도 스레드)
+        
+        background=True(라디오)는 YouTube 차단 감지 중이면 CircuitOpen을 그대로 전달합니다.
+        """
         try:
             # 캐시 확인
             if video_id in self.mix_cache:
-                logger.info(f"📋 캐시에서 믹스 목록 사용: {video_id}")
+                logger.info("📋 캐시에서 믹스 목록 사용: %s", video_id)
                 return self.mix_cache[video_id]
             
             mix_url = self.create_mix_url(video_id)
-            logger.info(f"🚀 빠른 믹스 목록 추출 (별도 스레드): {mix_url}")
+            logger.info("🚀 빠른 믹스 목록 추출 (별도 스레드): %s", mix_url)
+            await extractor.wait_ready()
             
-            # 별도 스레드에서 실행
-            loop = asyncio.get_event_loop()
-            playlist_info = await asyncio.wait_for(
-                loop.run_in_executor(self.mix_executor, self._extract_mix_flat, mix_url),
-                timeout=10.0
+            # 별도 스레드에서 실행 (마감 시간은 최근 소요 시간 기준)
+            playlist_info = await extractor.scheduler.extract(
+                'mix_flat', mix_url, executor=self.mix_executor, background=background
             )
             
             if not playlist_info or 'entries' not in playlist_info:
-                logger.warning(f"⚠️ 믹스 목록 추출 실패: {video_id}")
+                logger.warning("⚠️ 믹스 목록 추출 실패: %s", video_id)
                 return []
             
             # 기본 정보만 포함된 목록 생성
@@ -132,43 +143,33 @@ class YouTubeMixQueue:
             
             self.mix_cache[video_id] = songs
             
-            logger.info(f"✅ 믹스 목록 {len(songs)}곡 추출 완료 (빠른 모드)")
+            logger.info("✅ 믹스 목록 %s곡 추출 완료 (빠른 모드)", len(songs))
             return songs
             
-        except asyncio.TimeoutError:
-            logger.error(f"⏰ 믹스 목록 추출 타임아웃: {video_id}")
+        except CircuitOpen:
+            metrics.record_failure('mix_list', kind='circuit_open')
+            raise
+        except asyncio.TimeoutError as e:
+            metrics.record_failure('mix_list', e)
+            logger.error("⏰ 믹스 목록 추출 타임아웃: %s", video_id)
             return []
         except Exception as e:
-            logger.error(f"❌ 믹스 목록 추출 실패: {e}")
+            metrics.record_failure('mix_list', e)
+            logger.error("❌ 믹스 목록 추출 실패: %s", e)
             return []
     
-    def _extract_mix_flat(self, mix_url: str):
-        """믹스 플레이리스트 추출 (스레드에서 실행)"""
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,  # 빠른 추출
-            'playlistend': 25,  # 25곡
-            'ignoreerrors': True,
-            'socket_timeout': 8,
-            'retries': 1,
-            'geo_bypass': True,
-            'cookiefile': 'cookies.txt'
-        }
-        
-        with YoutubeDL(ydl_opts) as ydl:
-            return ydl.extract_info(mix_url, download=False)
-    
     async def extract_single_stream(self, song_info: Dict) -> Optional[Dict]:
-        """2단계: 개별 곡의 스트림 URL 추출 (별도 스레드)"""
+        """2단계: 개별 곡의 스트림 URL 추출 (별도 스레드)
+        
+        믹스 채우기/라디오용 백그라운드 작업이라 YouTube 차단 감지 중이면 CircuitOpen이 발생합니다.
+        """
         try:
             video_url = song_info['url']
+            await extractor.wait_ready()
             
-            # 별도 스레드에서 실행
-            loop = asyncio.get_event_loop()
-            info = await asyncio.wait_for(
-                loop.run_in_executor(self.mix_executor, self._extract_single_stream_sync, video_url),
-                timeout=5.0
+            # 별도 스레드에서 실행 (느린 곡은 p90 시점에 공용 풀에서 한 번 더 시도)
+            info = await extractor.scheduler.extract(
+                'single_stream', video_url, executor=self.mix_executor, background=True
             )
             
             if info and info.get('url'):
@@ -178,43 +179,29 @@ class YouTubeMixQueue:
                 complete_song['duration'] = info.get('duration', song_info['duration'])
                 complete_song['title'] = info.get('title', song_info['title'])
                 
-                logger.debug(f"✅ 스트림 추출 완료: {complete_song['title'][:30]}")
+                logger.debug("✅ 스트림 추출 완료: %s", complete_song['title'][:30])
                 return complete_song
             else:
-                logger.debug(f"⚠️ 스트림 URL 없음: {song_info['title'][:30]}")
+                logger.debug("⚠️ 스트림 URL 없음: %s", song_info['title'][:30])
                 return None
                 
-        except asyncio.TimeoutError:
-            logger.debug(f"⏰ 스트림 추출 타임아웃: {song_info['title'][:30]}")
+        except CircuitOpen:
+            metrics.record_failure('mix_stream', kind='circuit_open')
+            raise
+        except asyncio.TimeoutError as e:
+            metrics.record_failure('mix_stream', e)
+            logger.debug("⏰ 스트림 추출 타임아웃: %s", song_info['title'][:30])
             return None
         except Exception as e:
-            logger.debug(f"❌ 스트림 추출 오류: {song_info['title'][:30]} - {e}")
+            metrics.record_failure('mix_stream', e)
+            logger.debug("❌ 스트림 추출 오류: %s - %s", song_info['title'][:30], e)
             return None
     
-    def _extract_single_stream_sync(self, video_url: str):
-        """개별 스트림 추출 (스레드에서 실행, 썸네일 제거)"""
-        ydl_opts = {
-            'format': 'bestaudio/best',
-            'quiet': True,
-            'no_warnings': True,
-            'skip_download': True,
-            'socket_timeout': 5,
-            'retries': 0,
-            'cookiefile': 'cookies.txt',
-            'ignoreerrors': True,
-            'geo_bypass': True,
-            'extractor_args': {
-                'youtube': {
-                    'player_client': ['web', 'android'],
-                }
-            }
-        }
+    def filter_songs(self, mix_songs: List[Dict], target_count: int, exclude=(), shuffle: bool = True) -> List[Dict]:
+        """곡 필터링 (중복 제거, 길이 체크 등)
         
-        with YoutubeDL(ydl_opts) as ydl:
-            return ydl.extract_info(video_url, download=False)
-    
-    def filter_songs(self, mix_songs: List[Dict], target_count: int) -> List[Dict]:
-        """곡 필터링 (중복 제거, 길이 체크 등)"""
+        shuffle=False면 믹스 순서대로 앞에서부터 선택합니다 (라디오 모드).
+        """
         try:
             current_id = ""
             if self.guild_player.current:
@@ -237,6 +224,8 @@ class YouTubeMixQueue:
                 if (song_id and 
                     song_id != current_id and 
                     song_id not in queue_ids and
+                    song_id not in exclude and
+                    not play_history.contains(self.guild_player.guild_id, song_id) and
                     duration > 30 and
                     duration < 1200):
                     
@@ -244,15 +233,18 @@ class YouTubeMixQueue:
             
             # 랜덤하게 선택
             if len(filtered_songs) > target_count:
-                selected = random.sample(filtered_songs, target_count)
+                if shuffle:
+                    selected = random.sample(filtered_songs, target_count)
+                else:
+                    selected = filtered_songs[:target_count]
             else:
                 selected = filtered_songs
             
-            logger.info(f"🎯 필터링 완료: {len(selected)}곡 선택됨 (요청: {target_count}곡)")
+            logger.info("🎯 필터링 완료: %s곡 선택됨 (요청: %s곡)", len(selected), target_count)
             return selected
             
         except Exception as e:
-            logger.error(f"❌ 곡 필터링 실패: {e}")
+            logger.error("❌ 곡 필터링 실패: %s", e)
             return []
     
     async def add_mix_songs_by_command(self, video_id: str, count: int = 10) -> Dict:
@@ -263,7 +255,7 @@ class YouTubeMixQueue:
             elif count < 1:
                 count = 1
             
-            logger.info(f"🎵 스트리밍 믹스 시작: {video_id}, {count}곡")
+            logger.info("🎵 스트리밍 믹스 시작: %s, %s곡", video_id, count)
             
             # 이미 처리 중인지 확인
             if video_id in self._processing_tasks:
@@ -306,7 +298,7 @@ class YouTubeMixQueue:
             }
             
         except Exception as e:
-            logger.error(f"❌ 스트리밍 믹스 시작 실패: {e}")
+            logger.error("❌ 스트리밍 믹스 시작 실패: %s", e)
             return {
                 'success': False,
                 'message': "믹스 처리 중 오류가 발생했습니다.",
@@ -319,7 +311,7 @@ class YouTubeMixQueue:
             added_count = 0
             total_count = len(selected_songs)
             
-            logger.info(f"🎯 스트리밍 처리 시작: {total_count}곡")
+            logger.info("🎯 스트리밍 처리 시작: %s곡", total_count)
             
             for i, song_info in enumerate(selected_songs):
                 try:
@@ -331,40 +323,115 @@ class YouTubeMixQueue:
                         await self._add_single_track(complete_song)
                         added_count += 1
                         
-                        logger.info(f"⚡ 즉시 추가 ({added_count}/{total_count}): {complete_song['title'][:40]}")
+                        logger.info("⚡ 즉시 추가 (%s/%s): %s", added_count, total_count, complete_song['title'][:40])
                         
                         # UI 업데이트 (2곡마다 또는 완료시)
                         if added_count % 2 == 0 or added_count == total_count:
                             asyncio.create_task(self.guild_player._delayed_ui_update_safe(1.0))
                     else:
-                        logger.debug(f"⚠️ 스트림 추출 실패, 건너뛰기: {song_info['title'][:30]}")
+                        logger.debug("⚠️ 스트림 추출 실패, 건너뛰기: %s", song_info['title'][:30])
                     
                     # 다음 곡 처리 전 짧은 지연 (과부하 방지)
                     await asyncio.sleep(0.5)
                     
+                except CircuitOpen as e:
+                    logger.info("🔌 YouTube 차단 감지로 믹스 채우기 중단: %s", e)
+                    break
                 except Exception as e:
-                    logger.debug(f"❌ 개별 곡 처리 오류: {song_info['title'][:30]} - {e}")
+                    logger.debug("❌ 개별 곡 처리 오류: %s - %s", song_info['title'][:30], e)
                     continue
             
-            logger.info(f"✅ 스트리밍 처리 완료: {added_count}/{total_count}곡 추가됨")
+            logger.info("✅ 스트리밍 처리 완료: %s/%s곡 추가됨", added_count, total_count)
             
             # 처리 완료 후 재생 시작 시도
             await self.guild_player._try_start_playback()
             
         except Exception as e:
-            logger.error(f"❌ 스트리밍 처리 오류: {e}")
+            logger.error("❌ 스트리밍 처리 오류: %s", e)
         finally:
             # 처리 완료, 태스크 제거
             if video_id in self._processing_tasks:
                 del self._processing_tasks[video_id]
     
-    async def _add_single_track(self, song_info: Dict):
+    def track_video_id(self, track: Dict) -> Optional[str]:
+        return track.get('id') or self.extract_video_id(track.get('video_url', ''))
+
+    def note_played(self, track: Dict):
+        """재생 시작된 곡 기록 - 사용자가 직접 고른 곡이 라디오 믹스 기준이 됨"""
+        video_id = self.track_video_id(track)
+        if not video_id:
+            return
+        self._radio_played.append(video_id)
+        if not track.get('from_mix'):
+            self.radio_seed = video_id
+
+    def radio_deficit(self) -> int:
+        """라디오 하한선까지 부족한 곡 수 (검색 중인 곡 제외)"""
+        ready = sum(1 for track in self.guild_player.queue if not track.get('loading'))
+        return max(0, RADIO_LOW_WATERMARK - ready)
+
+    def schedule_radio_refill(self):
+        """라디오 모드이고 대기열이 하한선 아래면 백그라운드 채우기 시작 (이미 진행 중이면 무시)"""
+        if not self.guild_player.radio_enabled:
+            return
+        if self._radio_task and not self._radio_task.done():
+            return
+        if not self.radio_seed or self.radio_deficit() == 0:
+            return
+        self._radio_task = asyncio.create_task(self._refill_radio())
+
+    async def _refill_radio(self):
+        """캐시된 믹스에서 부족한 곡 수만큼만 스트림을 추출해 추가"""
+        try:
+            seed = self.radio_seed
+            mix_songs = await self.get_mix_list_fast(seed, background=True)
+            
+            while self.guild_player.radio_enabled:
+                vc = self.guild_player.vc
+                if not vc or not vc.is_connected():
+                    return
+                
+                deficit = self.radio_deficit()
+                if deficit == 0:
+                    return
+                
+                candidates = self.filter_songs(mix_songs, deficit, exclude=self._radio_played, shuffle=False)
+                if not candidates:
+                    # 믹스를 다 들었으면 마지막으로 재생한 곡의 믹스로 이어감
+                    next_seed = self._radio_played[-1] if self._radio_played else None
+                    if not next_seed or next_seed == seed:
+                        logger.info("📻 서버 %s 라디오: 더 추가할 곡 없음", self.guild_player.guild_id)
+                        return
+                    seed = self.radio_seed = next_seed
+                    mix_songs = await self.get_mix_list_fast(seed, background=True)
+                    continue
+                
+                for song_info in candidates:
+                    complete_song = await self.extract_single_stream(song_info)
+                    if complete_song and complete_song.get('stream_url'):
+                        await self._add_single_track(complete_song, radio=True)
+                        logger.info("📻 라디오 추가: %s", complete_song['title'][:40])
+                    else:
+                        # 추출할 수 없는 곡은 다시 고르지 않음
+                        self._radio_played.append(song_info['id'])
+                
+                asyncio.create_task(self.guild_player._delayed_ui_update_safe(1.0))
+            
+        except asyncio.CancelledError:
+            raise
+        except CircuitOpen as e:
+            # 다음 곡이 끝날 때 다시 시도
+            logger.info("🔌 서버 %s 라디오 채우기 보류: %s", self.guild_player.guild_id, e)
+        except Exception as e:
+            logger.error("❌ 라디오 채우기 오류: %s", e)
+
+    async def _add_single_track(self, song_info: Dict, radio: bool = False):
         """단일 트랙을 대기열에 즉시 추가"""
         try:
             ready_track = {
                 "title": song_info['title'][:85],
                 "duration": int(song_info.get("duration", 0)),
-                "user": "YouTube 알고리즘",
+                "user": "📻 라디오" if radio else "YouTube 알고리즘",
                 "id": song_info.get('id', ''),
                 "video_url": song_info['url'],
                 "stream_url": song_info['stream_url'],
@@ -380,7 +447,7 @@ class YouTubeMixQueue:
             await self.guild_player._try_start_playback()
             
         except Exception as e:
-            logger.error(f"❌ 단일 트랙 추가 오류: {e}")
+            logger.error("❌ 단일 트랙 추가 오류: %s", e)
     
     async def cleanup(self):
         """리소스 정리"""
@@ -389,12 +456,14 @@ class YouTubeMixQueue:
             for task in self._processing_tasks.values():
                 task.cancel()
             self._processing_tasks.clear()
+            if self._radio_task and not self._radio_task.done():
+                self._radio_task.cancel()
             
             # 스레드 풀은 플레이어에서 관리하므로 여기서는 종료하지 않음
-            logger.info(f"🧹 믹스 큐 리소스 정리 완료")
+            logger.info("🧹 믹스 큐 리소스 정리 완료")
             
         except Exception as e:
-            logger.error(f"❌ 믹스 큐 리소스 정리 오류: {e}")
+            logger.error("❌ 믹스 큐 리소스 정리 오류: %s", e)
 
 class GuildPlayer:
     def __init__(self, guild_id, bot):
@@ -411,6 +480,15 @@ class GuildPlayer:
         # 믹스 추출 전용 스레드 풀 (검색과 완전 분리)
         self.mix_extraction_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"mix-extract-{guild_id}")
         self._processing_lock = asyncio.Lock()
+        self._voice_connect_lock = asyncio.Lock()
+        self._message_lock = asyncio.Lock()
+        self._message_resolved = False
+        # 맨 앞 미해결 트랙 추출 중 (중복 재생 시작 방지)
+        self._resolving_head = False
+        # 진행 중인 재생목록 가져오기 (중지 시 취소)
+        self._import_tasks = set()
+        # 스트림 재추출 후 이어서 재생할 트랙 (재추출 중에는 vc가 재생 중이 아님)
+        self._resuming_track = None
         
         # 믹스 큐 (별도 스레드 풀 사용)
         self.youtube_mix_queue = YouTubeMixQueue(self, self.mix_extraction_executor)
@@ -420,38 +498,131 @@ class GuildPlayer:
         self._ui_update_cooldown = 3.0
         self._ui_update_task = None
         self._ui_update_blocked = False
+        
+        # 마지막으로 사용 중이었던 시각 (휴면 판정용)
+        self._last_activity = time.monotonic()
 
     async def initialize(self):
-        """플레이어 초기화"""
+        """플레이어 초기화 (멱등, 네트워크 호출 없음 - 메시지 조회는 첫 사용 시)"""
         try:
-            self.channel = self.bot.get_channel(config.guild_settings.get_music_channel(self.guild_id))
+            if self.channel:
+                return True
+            
+            self.channel = self.bot.get_channel(guild_settings.get_music_channel(self.guild_id))
             if not self.channel:
-                logger.warning(f"❌ 서버 {self.guild_id} 음악 채널을 찾을 수 없음")
+                logger.warning("❌ 서버 %s 음악 채널을 찾을 수 없음", self.guild_id)
                 return False
             
-            message_id = config.guild_settings.get_music_message(self.guild_id)
-            if message_id:
-                try:
-                    self.message = await self.channel.fetch_message(message_id)
-                except discord.NotFound:
-                    embed = discord.Embed(
-                        title="🎵 음악 플레이어",
-                        description="제목을 입력하여 음악을 재생하세요",
-                        color=0x00ff00
-                    )
-                    self.message = await self.channel.send(embed=embed, view=MusicView(self))
-                    config.guild_settings.set_music_message(self.guild_id, self.message.id)
-            
-            logger.info(f"✅ 서버 {self.guild_id} 플레이어 초기화 완료")
+            logger.info("✅ 서버 %s 플레이어 초기화 완료", self.guild_id)
             return True
             
         except Exception as e:
-            logger.error(f"❌ 서버 {self.guild_id} 플레이어 초기화 실패: {e}")
+            logger.error("❌ 서버 %s 플레이어 초기화 실패: %s", self.guild_id, e)
             return False
 
+    def restore(self, record: 'HibernatedPlayer'):
+        """휴면 기록에서 채널/메시지 복원 (네트워크 호출 없음)"""
+        self.channel = self.bot.get_channel(record.channel_id) if record.channel_id else None
+        if self.channel and record.message_id:
+            # 편집만 하면 되므로 조회 없이 부분 메시지 사용
+            self.message = self.channel.get_partial_message(record.message_id)
+            self._message_resolved = True
+
+    def touch(self):
+        self._last_activity = time.monotonic()
+
+    def is_busy(self) -> bool:
+        """음성 연결, 재생/대기 곡, 진행 중인 검색·믹스 작업이 있는지"""
+        return bool(
+            (self.vc and self.vc.is_connected()) or
+            self.current or
+            self.queue or
+            self.youtube_mix_queue._processing_tasks or
+            self._processing_lock.locked() or
+            self._message_lock.locked()
+        )
+
+    @property
+    def radio_enabled(self) -> bool:
+        return guild_settings.is_radio_enabled(self.guild_id)
+
+    def set_radio(self, enabled: bool):
+        """라디오 모드 켜기/끄기 (서버 설정에 저장)"""
+        guild_settings.set_radio_enabled(self.guild_id, enabled)
+        mix_queue = self.youtube_mix_queue
+        if enabled:
+            # 믹스로 추가된 곡을 듣는 중에 켜도 지금 곡 기준으로 시작
+            video_id = mix_queue.track_video_id(self.current[0]) if self.current else None
+            if video_id:
+                mix_queue.radio_seed = video_id
+            mix_queue.schedule_radio_refill()
+        elif mix_queue._radio_task and not mix_queue._radio_task.done():
+            mix_queue._radio_task.cancel()
+        logger.info("📻 서버 %s 라디오 모드 %s", self.guild_id, "켜짐" if enabled else "꺼짐")
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self._last_activity
+
+    async def hibernate(self) -> 'HibernatedPlayer':
+        """스레드 풀과 태스크를 정리하고 채널/메시지 ID만 남김 (메시지는 그대로 둠)"""
+        message_id = self.message.id if self.message else guild_settings.get_music_message(self.guild_id)
+        record = HibernatedPlayer(
+            self.channel.id if self.channel else guild_settings.get_music_channel(self.guild_id),
+            message_id
+        )
+        
+        if self._ui_update_task and not self._ui_update_task.done():
+            self._ui_update_task.cancel()
+        await self.youtube_mix_queue.cleanup()
+        self.search_executor.shutdown(wait=False)
+        self.mix_extraction_executor.shutdown(wait=False)
+        self.youtube_mix_queue.mix_cache.clear()
+        self.channel = None
+        self.message = None
+        return record
+
+    async def _ensure_message(self):
+        """플레이어 메시지 지연 조회 (없으면 새로 생성)"""
+        if self.message or self._message_resolved:
+            return self.message
+        
+        async with self._message_lock:
+            if self.message or self._message_resolved:
+                return self.message
+            
+            try:
+                if not await self.initialize():
+                    return None
+                
+                # 재연결 직후 여러 서버가 동시에 활동해도 조회 수를 제한
+                async with _get_init_semaphore():
+                    message_id = guild_settings.get_music_message(self.guild_id)
+                    if message_id:
+                        try:
+                            self.message = await self.channel.fetch_message(message_id)
+                        except discord.NotFound:
+                            message_id = None
+                    
+                    if not message_id:
+                        embed = discord.Embed(
+                            title="🎵 음악 플레이어",
+                            description="제목을 입력하여 음악을 재생하세요",
+                            color=0x00ff00
+                        )
+                        self.message = await self.channel.send(embed=embed, view=MusicView(self))
+                        guild_settings.set_music_message(self.guild_id, self.message.id)
+                
+                self._message_resolved = True
+                
+            except Exception as e:
+                # 일시적 오류/채널 미캐시는 다음 활동 때 다시 시도
+                logger.error("❌ 서버 %s 플레이어 메시지 조회 실패: %s", self.guild_id, e)
+            
+            return self.message
+
     async def handle_message(self, message):
         """메시지 처리"""
-        if (message.channel.id != config.guild_settings.get_music_channel(self.guild_id) or 
+        if (guild_settings.guild_for_channel(message.channel.id) != self.guild_id or 
             message.author.bot):
             return
         
@@ -467,11 +638,51 @@ class GuildPlayer:
             await message.delete()
             return
         
+        # 한 사용자/서버가 추출기를 독점하지 않도록 제한 (연속 거절은 알림 하나로 합침)
+        decision = rate_limiter.check('message', message.author.id, self.guild_id)
+        if not decision:
+            await message.delete()
+            if decision.notify:
+                asyncio.create_task(self._send_error_message(
+                    f"⏳ <@{message.author.id}> 요청이 너무 많습니다. {max(1, round(decision.retry_after))}초 후에 다시 시도해주세요."
+                ))
+            return
+        
+        received_at = time.monotonic()
+        trace = tracing.start_trace('play_request', guild_id=self.guild_id)
         await message.delete()
-        asyncio.create_task(self._fully_async_search_and_add(query, message.author))
+        await self.submit_query(query, message.author, received_at, trace)
+
+    async def submit_query(self, query, author, received_at=None, trace=None) -> bool:
+        """검색어/링크 요청을 백그라운드 처리로 넘김 (음악 채널 메시지, /play 공용)"""
+        received_at = received_at or time.monotonic()
+        self._last_activity = received_at
+        if trace is None:
+            trace = tracing.start_trace('play_request', guild_id=self.guild_id)
+        if not await self.initialize():
+            return False
+        asyncio.create_task(self._ensure_message())
+        queries, dropped = _split_queries(query)
+        if len(queries) > 1:
+            asyncio.create_task(self._batch_search_and_add(queries, author, received_at, trace, dropped))
+        elif _PLAYLIST_PATTERN.match(query):
+            task = asyncio.create_task(self._import_playlist(query, author, received_at, trace))
+            self._import_tasks.add(task)
+            task.add_done_callback(self._import_tasks.discard)
+        else:
+            asyncio.create_task(self._fully_async_search_and_add(query, author, received_at, trace))
+        return True
 
-    async def _fully_async_search_and_add(self, query, author):
-        """완전 비동기 검색 및 큐 추가"""
+    async def _fully_async_search_and_add(self, query, author, received_at=None, trace=None):
+        """완전 비동기 검색 및 큐 추가 (음성 연결은 검색과 병렬로 진행)"""
+        # 이후 생성되는 태스크와 스레드로 추적 정보가 전달됨
+        tracing.attach(trace)
+        voice_channel = author.voice.channel if author.voice else None
+        was_connected = bool(self.vc and self.vc.is_connected())
+        connect_task = None
+        if voice_channel:
+            connect_task = asyncio.create_task(self._ensure_voice_connection(voice_channel))
+        
         try:
             async with self._processing_lock:
                 temp_track = {
@@ -486,35 +697,38 @@ class GuildPlayer:
                 self.queue.append(temp_track)
                 asyncio.create_task(self._delayed_ui_update_safe(2.0))
             
-            await asyncio.sleep(0.5)
+            # 시작 직후 요청은 추출기 워밍업 완료를 이벤트 루프 밖에서 대기
+            with tracing.span('wait_ready'):
+                await extractor.wait_ready()
             
             loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                self.search_executor,
-                self._isolated_search_process,
-                query
-            )
+            with tracing.span('search'):
+                result = await loop.run_in_executor(
+                    self.search_executor,
+                    tracing.bind(self._isolated_search_process),
+                    query
+                )
             
             video_url, track_info = result if result else (None, None)
             
-            async with self._processing_lock:
-                if not video_url or not track_info:
+            if not video_url or not track_info:
+                metrics.record_failure('search', kind='not_found')
+                async with self._processing_lock:
                     if temp_track in self.queue:
                         self.queue.remove(temp_track)
                     
                     asyncio.create_task(self._send_error_message(f"❌ '{query}' 를 찾을 수 없습니다."))
                     asyncio.create_task(self._delayed_ui_update_safe(1.0))
-                    return
                 
-                real_track = {
-                    "title": track_info["title"][:95],
-                    "duration": int(track_info.get("duration", 0)),
-                    "user": f"<@{author.id}>",
-                    "id": track_info.get("id", ""),
-                    "video_url": video_url,
-                    "stream_url": track_info.get("url"),
-                    "uploader": track_info.get("uploader", "Unknown")
-                }
+                await self._rollback_voice_connection(connect_task, was_connected)
+                if trace:
+                    trace.finish('not_found')
+                return
+            
+            async with self._processing_lock:
+                real_track = self._search_result_track(video_url, track_info, author)
+                real_track["requested_at"] = received_at
+                real_track["trace"] = trace
                 
                 if temp_track in self.queue:
                     idx = self.queue.index(temp_track)
@@ -523,10 +737,12 @@ class GuildPlayer:
                     self.queue.append(real_track)
                 
                 asyncio.create_task(self._delayed_ui_update_safe(1.0))
-                logger.info(f"⚡ 새로운 트랙 추가: {real_track['title'][:30]}")
+                logger.info("⚡ 새로운 트랙 추가: %s", real_track['title'][:30])
             
-            # 음성 연결 및 재생 시작 시도
-            await self._delayed_voice_connection(author.voice.channel)
+            # 검색과 병렬로 시작한 음성 연결을 재생 직전에만 대기
+            if connect_task:
+                with tracing.span('voice_connect_wait'):
+                    await connect_task
             await self._try_start_playback()
             
         except Exception as e:
@@ -535,76 +751,468 @@ class GuildPlayer:
                     self.queue.remove(temp_track)
                 asyncio.create_task(self._delayed_ui_update_safe(1.0))
             
-            logger.error(f"❌ 백그라운드 처리 오류: {e}")
+            await self._rollback_voice_connection(connect_task, was_connected)
+            if trace:
+                trace.finish('error', error=type(e).__name__)
+            logger.error("❌ 백그라운드 처리 오류: %s", e)
             asyncio.create_task(self._send_error_message("❌ 검색 오류가 발생했습니다"))
 
-    async def _try_start_playback(self):
-        """재생 시작 시도"""
+    def _search_result_track(self, video_url, track_info, author):
+        track = {
+            "title": track_info["title"][:95],
+            "duration": int(track_info.get("duration", 0)),
+            "user": f"<@{author.id}>",
+            "id": track_info.get("id", ""),
+            "video_url": video_url,
+            "stream_url": track_info.get("url"),
+            "uploader": track_info.get("uploader", "Unknown")
+        }
+        # 검색으로 찾은 곡은 다음부터 /play 자동완성으로 바로 선택 가능
+        search_index.add_track(self.guild_id, track, plays=0)
+        return track
+
+    async def _batch_search_and_add(self, queries, author, received_at=None, trace=None, dropped=0):
+        """여러 줄 요청을 공용 추출 풀에서 병렬로 검색하고 원래 순서대로 대기열에 추가
+        
+        줄마다 자리표시 트랙을 먼저 넣고 결과가 오는 대로 제자리에서 교체합니다.
+        앞 줄 검색이 끝나기 전에는 뒤 줄 곡이 먼저 재생되지 않습니다.
+        dropped는 최대 줄 수(BATCH_MAX_QUERIES)를 넘어 처리하지 않은 줄 수입니다.
+        """
+        tracing.attach(trace)
+        voice_channel = author.voice.channel if author.voice else None
+        was_connected = bool(self.vc and self.vc.is_connected())
+        connect_task = None
+        if voice_channel:
+            connect_task = asyncio.create_task(self._ensure_voice_connection(voice_channel))
+        
+        placeholders = [
+            {
+                "title": f"🔍 {query[:30]}... 검색 중",
+                "duration": 0,
+                "user": f"<@{author.id}>",
+                "id": "",
+                "video_url": "",
+                "stream_url": None,
+                "loading": True,
+                "batch": True
+            }
+            for query in queries
+        ]
+        
+        def position_of(track):
+            # 같은 검색어가 여러 줄이면 자리표시 내용이 같으므로 동일 객체로 찾음
+            return next((i for i, t in enumerate(self.queue) if t is track), None)
+        
+        async def search(index, query):
+            try:
+                result = await extractor.scheduler.run(self._isolated_search_process, query)
+            except Exception as e:
+                logger.error("❌ 일괄 검색 오류 (%s): %s", query[:30], e)
+                result = None
+            return index, result
+        
         try:
-            if self.vc and self.vc.is_playing():
-                return
+            async with self._processing_lock:
+                self.queue.extend(placeholders)
+            asyncio.create_task(self._delayed_ui_update_safe(2.0))
+            
+            with tracing.span('wait_ready'):
+                await extractor.wait_ready()
+            
+            tracks = [None] * len(queries)
+            done = [False] * len(queries)
+            head = 0
+            stamped = False
+            missing = []
+            
+            with tracing.span('batch_search', size=len(queries)):
+                for next_result in asyncio.as_completed([search(i, q) for i, q in enumerate(queries)]):
+                    index, result = await next_result
+                    video_url, track_info = result if result else (None, None)
+                    done[index] = True
+                    
+                    async with self._processing_lock:
+                        position = position_of(placeholders[index])
+                        if position is None:
+                            # 대기 중 사용자가 대기열을 비움
+                            continue
+                        if video_url and track_info:
+                            tracks[index] = self._search_result_track(video_url, track_info, author)
+                            self.queue[position] = tracks[index]
+                        else:
+                            del self.queue[position]
+                            missing.append(queries[index])
+                    
+                    # 순서상 맨 앞 곡이 확정되면 재생 시작 (첫 재생 시간은 그 곡에 기록)
+                    while head < len(queries) and done[head]:
+                        if tracks[head] and not stamped:
+                            tracks[head]["requested_at"] = received_at
+                            tracks[head]["trace"] = trace
+                            stamped = True
+                        head += 1
+                    
+                    if tracks[index]:
+                        if connect_task:
+                            await connect_task
+                        await self._try_start_playback()
+            
+            added = sum(1 for track in tracks if track)
+            logger.info("⚡ 여러 줄 요청 %s/%s곡 추가", added, len(queries))
+            asyncio.create_task(self._delayed_ui_update_safe(1.0))
+            
+            notices = []
+            if missing:
+                metrics.record_failure('search', kind='not_found')
+                names = ", ".join(f"'{query[:20]}'" for query in missing[:5])
+                more = f" 외 {len(missing) - 5}곡" if len(missing) > 5 else ""
+                notices.append(f"❌ 찾을 수 없는 곡: {names}{more}")
+            if dropped:
+                notices.append(f"⚠️ 한 번에 {BATCH_MAX_QUERIES}줄까지만 처리합니다. {dropped}줄 초과분은 무시됨")
+            if notices:
+                asyncio.create_task(self._send_error_message("\n".join(notices)))
+            
+            if not added:
+                await self._rollback_voice_connection(connect_task, was_connected)
+                if trace:
+                    trace.finish('not_found')
             
-            if self.current:
-                return
+        except Exception as e:
+            async with self._processing_lock:
+                self.queue[:] = [t for t in self.queue if not any(t is p for p in placeholders)]
+            asyncio.create_task(self._delayed_ui_update_safe(1.0))
             
-            ready_tracks = [t for t in self.queue if not t.get("loading") and t.get("stream_url")]
-            if not ready_tracks:
-                logger.debug(f"🔍 서버 {self.guild_id}: 재생 가능한 곡 없음")
-                return
+            await self._rollback_voice_connection(connect_task, was_connected)
+            if trace:
+                trace.finish('error', error=type(e).__name__)
+            logger.error("❌ 여러 줄 요청 처리 오류: %s", e)
+            asyncio.create_task(self._send_error_message("❌ 검색 오류가 발생했습니다"))
+
+    async def _import_playlist(self, playlist_url, author, received_at=None, trace=None):
+        """재생목록을 페이지 단위로 평면 추출해서 미해결 트랙으로 대기열에 추가
+        
+        스트림 URL은 재생 직전에만 추출하므로 첫 페이지가 도착하면 바로 재생을 시작합니다.
+        """
+        tracing.attach(trace)
+        voice_channel = author.voice.channel if author.voice else None
+        was_connected = bool(self.vc and self.vc.is_connected())
+        connect_task = None
+        if voice_channel:
+            connect_task = asyncio.create_task(self._ensure_voice_connection(voice_channel))
+        
+        added = 0
+        try:
+            await extractor.wait_ready()
+            start = 1
+            
+            while start <= PLAYLIST_MAX_TRACKS:
+                end = min(start + PLAYLIST_PAGE_SIZE - 1, PLAYLIST_MAX_TRACKS)
+                with tracing.span('playlist_page', start=start):
+                    info = await extractor.scheduler.extract(
+                        'playlist_flat', playlist_url, executor=self.mix_extraction_executor,
+                        playliststart=start, playlistend=end
+                    )
+                
+                entries = list((info or {}).get('entries') or [])
+                tracks = [
+                    self._unresolved_track(entry, author) for entry in entries
+                    if entry and entry.get('id') and entry.get('title') not in ('[Private video]', '[Deleted video]')
+                ]
+                
+                if tracks:
+                    if added == 0:
+                        tracks[0]['requested_at'] = received_at
+                        tracks[0]['trace'] = trace
+                    async with self._processing_lock:
+                        self.queue.extend(tracks)
+                    added += len(tracks)
+                    logger.info("📜 재생목록 %s곡 추가 (누적 %s곡)", len(tracks), added)
+                    
+                    if added == len(tracks):
+                        # 첫 페이지: 음성 연결만 기다렸다가 바로 재생
+                        if connect_task:
+                            await connect_task
+                        await self._try_start_playback()
+                    asyncio.create_task(self._delayed_ui_update_safe(1.0))
+                
+                if len(entries) < end - start + 1:
+                    break
+                start = end + 1
             
-            if not self.vc or not self.vc.is_connected():
-                logger.debug(f"🔍 서버 {self.guild_id}: 음성 연결 없음")
-                return
+            if not added:
+                metrics.record_failure('playlist', kind='not_found')
+                asyncio.create_task(self._send_error_message("❌ 재생목록을 불러올 수 없습니다."))
+                await self._rollback_voice_connection(connect_task, was_connected)
+                if trace:
+                    trace.finish('not_found')
             
-            track = ready_tracks[0]
-            self.queue.remove(track)
+        except Exception as e:
+            metrics.record_failure('playlist', e)
+            logger.error("❌ 재생목록 가져오기 오류: %s", e)
+            if not added:
+                await self._rollback_voice_connection(connect_task, was_connected)
+                if trace:
+                    trace.finish('error', error=type(e).__name__)
+                asyncio.create_task(self._send_error_message("❌ 재생목록을 불러올 수 없습니다."))
+
+    def _unresolved_track(self, entry, author):
+        """스트림 URL 없이 목록 정보만 가진 트랙 (재생 직전에 해결)"""
+        return {
+            "title": (entry.get('title') or 'Unknown')[:95],
+            "duration": int(entry.get('duration') or 0),
+            "user": f"<@{author.id}>",
+            "id": entry['id'],
+            "video_url": f"https://www.youtube.com/watch?v={entry['id']}",
+            "stream_url": None,
+            "uploader": entry.get('uploader') or entry.get('channel') or 'Unknown',
+            "unresolved": True
+        }
+
+    async def enqueue_known_track(self, info: Dict, author):
+        """정보를 이미 알고 있는 곡을 검색 없이 추가 (재생 기록 등, 스트림 URL은 재생 직전에 추출)"""
+        try:
+            if not await self.initialize():
+                return None
+            asyncio.create_task(self._ensure_message())
             
-            await self._play_track(track)
+            track = self._unresolved_track(info, author)
+            async with self._processing_lock:
+                self.queue.append(track)
+            self._last_activity = time.monotonic()
             
+            if author.voice and author.voice.channel:
+                await self._ensure_voice_connection(author.voice.channel)
+            asyncio.create_task(self._delayed_ui_update_safe(1.0))
+            await self._try_start_playback()
+            return track
         except Exception as e:
-            logger.error(f"❌ 재생 시작 시도 오류: {e}")
+            logger.error("❌ 곡 다시 추가 오류: %s", e)
+            return None
+
+    async def _resolve_track(self, track, background: bool = False) -> bool:
+        """미해결 트랙의 스트림 URL 추출 (같은 트랙에 대한 동시 요청은 한 번만 추출)
+        
+        background=True(미리 추출)가 YouTube 차단 감지로 거절되면 트랙은 그대로 두고 False를 반환합니다.
+        """
+        if not track.get('unresolved'):
+            return bool(track.get('stream_url'))
+        
+        task = track.get('_resolve_task')
+        if task is None:
+            task = track['_resolve_task'] = asyncio.create_task(self._resolve_track_once(track, background))
+        return await asyncio.shield(task)
+
+    async def _resolve_track_once(self, track, background: bool = False) -> bool:
+        try:
+            try:
+                info = await self._extract_track_info(track['video_url'], background=background)
+            except CircuitOpen:
+                return False
+            if info and info.get('url'):
+                track['stream_url'] = info['url']
+                track['title'] = info['title'][:95]
+                track['duration'] = int(info.get('duration') or track['duration'])
+                track.pop('unresolved', None)
+                return True
+            
+            # 재생할 수 없는 곡은 대기열에서 제거
+            logger.warning("⚠️ 재생목록 곡 스트림 추출 실패, 건너뛰기: %s", track['title'][:30])
+            async with self._processing_lock:
+                if track in self.queue:
+                    self.queue.remove(track)
+            return False
+        finally:
+            track.pop('_resolve_task', None)
 
-    async def _play_track(self, track):
-        """트랙 재생"""
+    async def _prefetch_upcoming(self):
+        """곧 재생될 미해결 트랙들의 스트림 URL을 미리 추출"""
+        try:
+            upcoming = [t for t in self.queue if not t.get("loading")][:PLAYLIST_PREFETCH]
+            for track in upcoming:
+                if track.get('unresolved'):
+                    if not await self._resolve_track(track, background=True) and track in self.queue:
+                        # YouTube 차단 감지 중 - 나머지는 재생 직전에 추출
+                        return
+        except Exception as e:
+            logger.debug("⚠️ 다음 곡 미리 추출 오류: %s", e)
+
+    async def _try_start_playback(self):
+        """재생 시작 시도 (맨 앞 곡이 미해결이면 먼저 스트림 URL 추출)"""
+        try:
+            while True:
+                if self.vc and self.vc.is_playing():
+                    return
+                
+                if self.current:
+                    return
+                
+                ready_tracks = []
+                for t in self.queue:
+                    if t.get("loading"):
+                        if t.get("batch"):
+                            # 여러 줄 요청은 앞 줄 검색이 끝날 때까지 순서 유지
+                            break
+                        continue
+                    if t.get("stream_url") or t.get("unresolved"):
+                        ready_tracks.append(t)
+                        break
+                if not ready_tracks:
+                    logger.debug("🔍 서버 %s: 재생 가능한 곡 없음", self.guild_id)
+                    return
+                
+                if not self.vc or not self.vc.is_connected():
+                    logger.debug("🔍 서버 %s: 음성 연결 없음", self.guild_id)
+                    return
+                
+                track = ready_tracks[0]
+                if track.get("unresolved"):
+                    if self._resolving_head:
+                        return
+                    self._resolving_head = True
+                    try:
+                        await self._resolve_track(track)
+                    finally:
+                        self._resolving_head = False
+                    # 추출 중 다른 곡이 시작되었거나 사용자가 삭제했을 수 있으므로 다시 확인
+                    continue
+                
+                self.queue.remove(track)
+                await self._play_track(track)
+                
+                if PLAYLIST_PREFETCH and any(t.get("unresolved") for t in self.queue):
+                    asyncio.create_task(self._prefetch_upcoming())
+                return
+            
+        except Exception as e:
+            logger.error("❌ 재생 시작 시도 오류: %s", e)
+
+    async def _play_track(self, track, start_at: float = 0.0) -> bool:
+        """트랙 재생 (start_at 초 지점부터 이어서 재생 가능) - 재생이 시작되었는지 반환"""
+        ffmpeg_source = None
+        started = False
         try:
             stream_url = track.get('stream_url')
             if not stream_url:
-                logger.warning(f"⚠️ 스트림 URL 없음: {track['title']}")
-                return
+                logger.warning("⚠️ 스트림 URL 없음: %s", track['title'])
+                return False
             
-            audio_source = discord.FFmpegPCMAudio(stream_url, **FFMPEG_OPTIONS)
+            ffmpeg_options = dict(FFMPEG_OPTIONS)
+            if start_at > 0:
+                ffmpeg_options['before_options'] = f"-ss {start_at:.2f} {FFMPEG_OPTIONS['before_options']}"
+            
+            ffmpeg_source = await supervisor.spawn(
+                self.guild_id,
+                stream_url,
+                on_stall=lambda: setattr(audio_source, 'stalled', True),
+                **ffmpeg_options
+            )
+            audio_source = TrackedAudioSource(ffmpeg_source, start_offset=start_at)
+            watchdog = PlaybackWatchdog(self.guild_id, self.vc, audio_source, track['title'])
             
             def after_track(error):
-                if error:
-                    logger.error(f"❌ 재생 오류: {error}")
+                supervisor.release(ffmpeg_source)
+                self.bot.loop.call_soon_threadsafe(watchdog.stop)
+                
+                resume_at = None
+                if needs_resume(audio_source, track, error):
+                    metrics.record_failure('playback', kind='stall' if audio_source.stalled else 'interrupted')
+                    resume_at = audio_source.position
+                    logger.warning("🩹 재생 중단 감지, %.1f초부터 복구 시도: %s (%s)", resume_at, track['title'][:30], error)
+                elif error:
+                    metrics.record_failure('playback', error)
+                    logger.error("❌ 재생 오류: %s", error)
                 else:
-                    logger.info(f"✅ 재생 완료: {track['title'][:30]}")
+                    logger.info("✅ 재생 완료: %s", track['title'][:30])
                 
                 asyncio.run_coroutine_threadsafe(
-                    self._handle_track_end(),
+                    self._handle_track_end(track, resume_at),
                     self.bot.loop
                 )
             
             self.vc.play(audio_source, after=after_track)
             self.current = [track]
+            started = True
+            watchdog.start()
+            if not start_at:
+                play_history.record(self.guild_id, track)
+                search_index.add_track(self.guild_id, track)
+                self.youtube_mix_queue.note_played(track)
+                self.youtube_mix_queue.schedule_radio_refill()
+            
+            requested_at = track.pop('requested_at', None)
+            if requested_at:
+                metrics.TIME_TO_FIRST_AUDIO.observe(time.monotonic() - requested_at)
+            
+            trace = track.pop('trace', None)
+            if trace:
+                trace.emit('play_start', 0.0, start_at=start_at)
+                trace.finish()
             
             await self.update_ui()
-            logger.info(f"🎵 재생 시작: {track['title'][:50]}")
+            if start_at:
+                logger.info("🎵 재생 시작: %s (%.1f초부터)", track['title'][:50], start_at)
+            else:
+                logger.info("🎵 재생 시작: %s", track['title'][:50])
+            return True
             
         except Exception as e:
-            logger.error(f"❌ 트랙 재생 실패: {track['title'][:30]} - {e}")
+            if ffmpeg_source is not None and not (self.vc and self.vc.source):
+                ffmpeg_source.cleanup()
+                supervisor.release(ffmpeg_source)
+            metrics.record_failure('play_start', e)
+            logger.error("❌ 트랙 재생 실패: %s - %s", track['title'][:30], e)
             await self._try_start_playback()
+            return started
 
-    async def _handle_track_end(self):
-        """트랙 종료 처리"""
+    async def _handle_track_end(self, finished_track=None, resume_at=None):
+        """트랙 종료 처리 (비정상 종료는 대기열을 건드리지 않고 이어서 재생)"""
         try:
+            if (resume_at is not None and self.current and self.current[0] is finished_track and
+                    self.vc and self.vc.is_connected()):
+                if await self._resume_track(finished_track, resume_at):
+                    return
+            
             self.current = []
             await asyncio.sleep(0.5)
             await self._try_start_playback()
+            self.youtube_mix_queue.schedule_radio_refill()
             await self.update_ui()
             
         except Exception as e:
-            logger.error(f"❌ 트랙 종료 처리 오류: {e}")
+            logger.error("❌ 트랙 종료 처리 오류: %s", e)
+
+    async def _resume_track(self, track, position: float) -> bool:
+        """새 스트림 URL을 받아 마지막 위치부터 다시 재생"""
+        try:
+            track['_resume_attempts'] = track.get('_resume_attempts', 0) + 1
+            
+            # googlevideo URL은 만료/차단될 수 있으므로 매번 새로 추출
+            self._resuming_track = track
+            try:
+                info = await self._extract_track_info(track['video_url'])
+            finally:
+                if self._resuming_track is track:
+                    self._resuming_track = None
+            
+            # 재추출 중 건너뛰기 → False로 다음 곡 진행
+            if track.get('_skipped'):
+                logger.info("⏭️ 이어듣기 중 건너뛰기: %s", track['title'][:30])
+                return False
+            
+            if not info or not info.get('url'):
+                logger.warning("⚠️ 이어듣기용 스트림 재추출 실패: %s", track['title'][:30])
+                return False
+            
+            # 재추출 중 사용자가 중지한 경우
+            if not self.current or self.current[0] is not track:
+                return True
+            
+            track['stream_url'] = info['url']
+            # 실패하면 False를 돌려 _handle_track_end가 current를 비우고 다음 곡으로 넘어가게 함
+            return await self._play_track(track, start_at=position)
+            
+        except Exception as e:
+            logger.error("❌ 이어듣기 복구 오류: %s", e)
+            return False
 
     def _isolated_search_process(self, query):
         """격리된 검색 프로세스"""
@@ -622,7 +1230,7 @@ class GuildPlayer:
                 loop.close()
                 
         except Exception as e:
-            logger.error(f"❌ 격리된 검색 오류: {e}")
+            logger.error("❌ 격리된 검색 오류: %s", e)
             return None, None
 
     async def _sync_search_and_extract(self, query):
@@ -640,21 +1248,28 @@ class GuildPlayer:
                     "order": "relevance"
                 }
                 
-                async with session.get(
-                    "https://www.googleapis.com/youtube/v3/search", 
-                    params=params
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        items = data.get("items", [])
+                search_started = time.perf_counter()
+                with tracing.span('search_api'):
+                    async with session.get(
+                        "https://www.googleapis.com/youtube/v3/search", 
+                        params=params
+                    ) as response:
+                        status = response.status
+                        data = await response.json() if status == 200 else None
+                
+                if status == 200:
+                    items = data.get("items", [])
+                    metrics.SEARCH_API_LATENCY.observe(time.perf_counter() - search_started)
+                    
+                    for item in items:
+                        video_id = item['id']['videoId']
+                        video_url = f"https://www.youtube.com/watch?v={video_id}"
                         
-                        for item in items:
-                            video_id = item['id']['videoId']
-                            video_url = f"https://www.youtube.com/watch?v={video_id}"
-                            
-                            track_info = await self._extract_track_info(video_url)
-                            if track_info:
-                                return video_url, track_info
+                        track_info = await self._extract_track_info(video_url)
+                        if track_info:
+                            return video_url, track_info
+                else:
+                    metrics.record_failure('search_api', kind=f"http_{status}")
                         
             finally:
                 await session.close()
@@ -662,22 +1277,14 @@ class GuildPlayer:
             return None, None
             
         except Exception as e:
-            logger.error(f"❌ 동기화된 검색 오류: {e}")
+            logger.error("❌ 동기화된 검색 오류: %s", e)
             return None, None
 
-    async def _extract_track_info(self, url):
-        """트랙 정보 추출 (썸네일 제거)"""
+    async def _extract_track_info(self, url, background: bool = False):
+        """트랙 정보 추출 (썸네일 제거, background=True가 거절되면 CircuitOpen 발생)"""
         try:
-            loop = asyncio.get_event_loop()
-            
-            def extract_info():
-                with YoutubeDL(FAST_YDL_OPTIONS) as ydl:
-                    return ydl.extract_info(url, download=False)
-            
-            info = await asyncio.wait_for(
-                loop.run_in_executor(None, extract_info),
-                timeout=10.0
-            )
+            with tracing.span('extract', url=url):
+                info = await extractor.scheduler.extract('fast', url, background=background)
             
             if info:
                 return {
@@ -690,22 +1297,49 @@ class GuildPlayer:
             
             return None
             
+        except CircuitOpen:
+            metrics.record_failure('extract', kind='circuit_open')
+            raise
         except Exception as e:
-            logger.error(f"❌ 트랙 정보 추출 오류: {e}")
+            metrics.record_failure('extract', e)
+            logger.error("❌ 트랙 정보 추출 오류: %s", e)
             return None
 
     async def _ensure_voice_connection(self, voice_channel):
-        """음성 채널 연결 확인"""
+        """음성 채널 연결 확인 (동시 요청 시 연결/이동은 한 번만 수행)"""
         try:
-            if not self.vc or not self.vc.is_connected():
-                self.vc = await voice_channel.connect()
-                logger.info(f"🔊 서버 {self.guild_id} 음성 채널 연결: {voice_channel.name}")
-            elif self.vc.channel != voice_channel:
-                await self.vc.move_to(voice_channel)
-                logger.info(f"🔄 서버 {self.guild_id} 음성 채널 이동: {voice_channel.name}")
+            async with self._voice_connect_lock:
+                with tracing.span('voice_connect'):
+                    connect_started = time.perf_counter()
+                    if not self.vc or not self.vc.is_connected():
+                        self.vc = await voice_channel.connect()
+                        metrics.VOICE_CONNECT_LATENCY.observe(time.perf_counter() - connect_started)
+                        logger.info("🔊 서버 %s 음성 채널 연결: %s", self.guild_id, voice_channel.name)
+                    elif self.vc.channel != voice_channel:
+                        await self.vc.move_to(voice_channel)
+                        metrics.VOICE_CONNECT_LATENCY.observe(time.perf_counter() - connect_started)
+                        logger.info("🔄 서버 %s 음성 채널 이동: %s", self.guild_id, voice_channel.name)
                 
         except Exception as e:
-            logger.error(f"❌ 서버 {self.guild_id} 음성 연결 오류: {e}")
+            metrics.record_failure('voice_connect', e)
+            logger.error("❌ 서버 %s 음성 연결 오류: %s", self.guild_id, e)
+
+    async def _rollback_voice_connection(self, connect_task, was_connected):
+        """검색 실패 시 이 요청으로 새로 연결된 음성 채널 정리"""
+        try:
+            if not connect_task:
+                return
+            await connect_task
+            
+            if was_connected or self.current or self.queue:
+                return
+            
+            if self.vc and self.vc.is_connected():
+                await self.vc.disconnect()
+                self.vc = None
+                logger.info("🔌 서버 %s 검색 실패로 음성 연결 해제", self.guild_id)
+        except Exception as e:
+            logger.error("❌ 서버 %s 음성 연결 롤백 오류: %s", self.guild_id, e)
 
     async def _delayed_ui_update_safe(self, delay: float):
         """안전한 지연 UI 업데이트"""
@@ -716,15 +1350,7 @@ class GuildPlayer:
             await asyncio.sleep(delay)
             await self.update_ui()
         except Exception as e:
-            logger.error(f"❌ 지연 UI 업데이트 오류: {e}")
-
-    async def _delayed_voice_connection(self, voice_channel):
-        """지연된 음성 채널 연결"""
-        try:
-            await asyncio.sleep(1.0)
-            await self._ensure_voice_connection(voice_channel)
-        except Exception as e:
-            logger.error(f"❌ 지연된 음성 연결 오류: {e}")
+            logger.error("❌ 지연 UI 업데이트 오류: %s", e)
 
     async def _send_error_message(self, error_text):
         """오류 메시지 전송"""
@@ -734,7 +1360,7 @@ class GuildPlayer:
                 await asyncio.sleep(5)
                 await temp_msg.delete()
         except Exception as e:
-            logger.error(f"❌ 오류 메시지 전송 실패: {e}")
+            logger.error("❌ 오류 메시지 전송 실패: %s", e)
 
     async def _delayed_ui_update(self, delay):
         """지연된 UI 업데이트"""
@@ -742,7 +1368,7 @@ class GuildPlayer:
             await asyncio.sleep(delay)
             await self._perform_ui_update()
         except Exception as e:
-            logger.error(f"❌ 지연된 UI 업데이트 오류: {e}")
+            logger.error("❌ 지연된 UI 업데이트 오류: %s", e)
 
     def get_queue_info(self):
         """대기열 정보 반환"""
@@ -756,7 +1382,7 @@ class GuildPlayer:
                 'is_playing': self.vc and self.vc.is_playing() if self.vc else False
             }
         except Exception as e:
-            logger.error(f"❌ 대기열 정보 조회 오류: {e}")
+            logger.error("❌ 대기열 정보 조회 오류: %s", e)
             return {
                 'current': None,
                 'queue_length': 0,
@@ -764,9 +1390,29 @@ class GuildPlayer:
                 'is_playing': False
             }
 
+    def skip_current(self) -> Optional[Dict]:
+        """현재 곡 건너뛰기 - 건너뛴 트랙 반환 (재생 중이 아니면 None)
+
+        끊김 복구로 스트림을 재추출하는 중에는 vc가 재생 중이 아니므로 트랙에 표시만 하고,
+        재추출이 끝나면 이어서 재생하지 않고 다음 곡으로 넘어갑니다.
+        """
+        track = self.current[0] if self.current else None
+        if self.vc and self.vc.is_playing():
+            self.vc.stop()
+            return track or {}
+        if track is not None and self._resuming_track is track:
+            track['_skipped'] = True
+            return track
+        return None
+
     async def stop(self):
         """플레이어 중지"""
         try:
+            # 남은 재생목록 페이지가 비운 대기열에 다시 들어오지 않도록 가져오기 취소
+            for task in list(self._import_tasks):
+                task.cancel()
+            self._import_tasks.clear()
+            
             self.queue.clear()
             self.current = []
             
@@ -777,10 +1423,10 @@ class GuildPlayer:
                 self.vc = None
             
             await self.update_ui()
-            logger.info(f"🛑 서버 {self.guild_id} 플레이어 중지")
+            logger.info("🛑 서버 %s 플레이어 중지", self.guild_id)
             
         except Exception as e:
-            logger.error(f"❌ 서버 {self.guild_id} 플레이어 중지 오류: {e}")
+            logger.error("❌ 서버 %s 플레이어 중지 오류: %s", self.guild_id, e)
 
     async def cleanup(self):
         """리소스 정리"""
@@ -797,10 +1443,13 @@ class GuildPlayer:
                 self.mix_extraction_executor.shutdown(wait=False)
             
             await self.stop()
-            logger.info(f"🧹 서버 {self.guild_id} 리소스 정리 완료")
+            
+            # 남은 FFmpeg 프로세스 정리
+            supervisor.kill_guild(self.guild_id)
+            logger.info("🧹 서버 %s 리소스 정리 완료", self.guild_id)
             
         except Exception as e:
-            logger.error(f"❌ 서버 {self.guild_id} 리소스 정리 오류: {e}")
+            logger.error("❌ 서버 %s 리소스 정리 오류: %s", self.guild_id, e)
 
     async def update_ui(self):
         """UI 업데이트"""
@@ -825,17 +1474,20 @@ class GuildPlayer:
             await self._perform_ui_update()
             
         except Exception as e:
-            logger.error(f"❌ UI 업데이트 스케줄링 오류: {e}")
+            logger.error("❌ UI 업데이트 스케줄링 오류: %s", e)
 
     async def _perform_ui_update(self):
         """실제 UI 업데이트 수행 - 대기열 표시 제거"""
         try:
             if self.vc and self.vc.is_playing() and self._ui_update_blocked:
-                logger.debug(f"🔄 재생 중이므로 UI 업데이트 건너뛰기")
+                logger.debug("🔄 재생 중이므로 UI 업데이트 건너뛰기")
                 return
             
             self._last_ui_update = time.time()
             
+            if not self.message:
+                await self._ensure_message()
+            
             if not self.current:
                 # 재생 중인 곡이 없을 때
                 embed = discord.Embed(
@@ -867,30 +1519,125 @@ class GuildPlayer:
                 
                 # 드롭다운에서 대기열을 확인할 수 있으므로 여기서는 표시하지 않음
             
+            if self.radio_enabled:
+                embed.set_footer(text="📻 라디오 모드 - 대기열이 줄어들면 비슷한 곡을 이어서 추가합니다")
+            
             if self.message:
                 try:
                     await self.message.edit(embed=embed, view=MusicView(self))
-                    logger.debug(f"🔄 UI 업데이트 완료: 서버 {self.guild_id}")
+                    logger.debug("🔄 UI 업데이트 완료: 서버 %s", self.guild_id)
                 except discord.NotFound:
-                    logger.warning(f"⚠️ 메시지 없음: 서버 {self.guild_id}")
+                    logger.warning("⚠️ 메시지 없음: 서버 %s", self.guild_id)
                     self.message = None
+                    self._message_resolved = False
                 except Exception as e:
-                    logger.error(f"❌ 메시지 편집 실패: {e}")
+                    logger.error("❌ 메시지 편집 실패: %s", e)
             
         except Exception as e:
-            logger.error(f"❌ UI 업데이트 수행 오류: {e}")
+            logger.error("❌ UI 업데이트 수행 오류: %s", e)
+
+class HibernatedPlayer:
+    """휴면 플레이어 - 다시 만들 때 필요한 채널/메시지 ID만 보관"""
+
+    __slots__ = ('channel_id', 'message_id', 'hibernated_at')
+
+    def __init__(self, channel_id, message_id):
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.hibernated_at = time.monotonic()
 
 # 플레이어 매니저
 players = {}
+hibernated_players = {}
+
+# 음성 연결/대기열 없이 이 시간(초)이 지나면 휴면 (0이면 비활성화)
+PLAYER_IDLE_TIMEOUT = getattr(config, 'PLAYER_IDLE_TIMEOUT', 600.0)
+PLAYER_SWEEP_INTERVAL = getattr(config, 'PLAYER_SWEEP_INTERVAL', 60.0)
+_sweeper_task = None
+
+# 플레이어 메시지 조회 동시 실행 수
+INIT_CONCURRENCY = getattr(config, 'INIT_CONCURRENCY', 10)
+_init_semaphore = None
+
+def _get_init_semaphore():
+    global _init_semaphore
+    if _init_semaphore is None:
+        _init_semaphore = asyncio.Semaphore(INIT_CONCURRENCY)
+    return _init_semaphore
 
 def get_player(guild_id, bot):
-    """플레이어 인스턴스 가져오기"""
-    if guild_id not in players:
-        players[guild_id] = GuildPlayer(guild_id, bot)
-    return players[guild_id]
+    """플레이어 인스턴스 가져오기 (휴면 중이면 다시 생성)"""
+    player = players.get(guild_id)
+    if player is None:
+        player = players[guild_id] = GuildPlayer(guild_id, bot)
+        record = hibernated_players.pop(guild_id, None)
+        if record:
+            player.restore(record)
+            logger.debug("⏰ 서버 %s 플레이어 휴면 해제", guild_id)
+    return player
+
+async def hibernate_player(guild_id):
+    """유휴 플레이어를 레지스트리에서 빼고 휴면 기록으로 교체"""
+    player = players.get(guild_id)
+    if player is None or player.is_busy():
+        return False
+    
+    # 정리 중 도착한 메시지는 새 플레이어가 처리하도록 먼저 제거
+    del players[guild_id]
+    try:
+        record = await player.hibernate()
+        if guild_id not in players:
+            hibernated_players[guild_id] = record
+        logger.debug("💤 서버 %s 플레이어 휴면 (%.0f초 유휴)", guild_id, player.idle_seconds())
+        return True
+    except Exception as e:
+        logger.error("❌ 서버 %s 플레이어 휴면 오류: %s", guild_id, e)
+        return False
+
+async def _sweep_idle_players():
+    while True:
+        await asyncio.sleep(PLAYER_SWEEP_INTERVAL)
+        try:
+            hibernated = 0
+            for guild_id, player in list(players.items()):
+                if player.is_busy():
+                    player.touch()
+                elif player.idle_seconds() >= PLAYER_IDLE_TIMEOUT:
+                    if await hibernate_player(guild_id):
+                        hibernated += 1
+            if hibernated:
+                logger.info("💤 유휴 플레이어 %s개 휴면 (활성 %s, 휴면 %s)",
+                            hibernated, len(players), len(hibernated_players))
+        except Exception as e:
+            logger.error("❌ 유휴 플레이어 정리 오류: %s", e)
+
+def start_idle_sweeper():
+    """유휴 플레이어 정리 태스크 시작 (이벤트 루프 안에서 호출)"""
+    global _sweeper_task
+    if PLAYER_IDLE_TIMEOUT <= 0:
+        return
+    if _sweeper_task is None or _sweeper_task.done():
+        _sweeper_task = asyncio.create_task(_sweep_idle_players())
+
+def stop_idle_sweeper():
+    if _sweeper_task and not _sweeper_task.done():
+        _sweeper_task.cancel()
+
+def _collect_executor_backlog():
+    backlog = {('search',): 0, ('mix_extract',): 0}
+    for player in list(players.values()):
+        backlog[('search',)] += player.search_executor._work_queue.qsize()
+        backlog[('mix_extract',)] += player.mix_extraction_executor._work_queue.qsize()
+    return backlog
+
+metrics.EXECUTOR_BACKLOG.set_function(_collect_executor_backlog)
+metrics.ACTIVE_PLAYERS.set_function(lambda: {(): len(players)})
+metrics.HIBERNATED_PLAYERS.set_function(lambda: {(): len(hibernated_players)})
+metrics.QUEUE_LENGTH.set_function(lambda: {(): sum(len(p.queue) for p in list(players.values()))})
 
 async def cleanup_player(guild_id):
     """플레이어 정리"""
+    hibernated_players.pop(guild_id, None)
     if guild_id in players:
         await players[guild_id].cleanup()
         del players[guild_id]
\ No newline at end of file
@@ -0,0 +1,199 @@
+# music/search_index.py - /play 자동완성용 서버별 로컬 검색 인덱스 (단어 접두사 + 트라이그램, 전부 메모리 조회)
+
+import config
+import heapq
+import logging
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 서버별 인덱스에 보관할 최대 곡 수 (초과 시 가장 오래 쓰이지 않은 곡부터 제거)
+SEARCH_INDEX_MAX_ENTRIES = getattr(config, 'SEARCH_INDEX_MAX_ENTRIES', 2000)
+# 단어 접두사 최대 길이 (이보다 긴 입력은 이 길이까지만 접두사로 비교)
+SEARCH_PREFIX_MAX = getattr(config, 'SEARCH_PREFIX_MAX', 12)
+# 트라이그램 일치 비율이 이보다 낮으면 제외
+SEARCH_TRIGRAM_MIN_SCORE = getattr(config, 'SEARCH_TRIGRAM_MIN_SCORE', 0.5)
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def normalize(text: str) -> str:
+    return text.casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(normalize(text))
+
+
+def trigrams(text: str) -> Set[str]:
+    compact = ''.join(tokenize(text))
+    if len(compact) < 3:
+        return {compact} if compact else set()
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+class IndexedTrack:
+    __slots__ = ('video_id', 'title', 'uploader', 'duration', 'plays', 'prefixes', 'grams')
+
+    def __init__(self, video_id: str, title: str, uploader: str, duration: int):
+        self.video_id = video_id
+        self.title = title
+        self.uploader = uploader
+        self.duration = duration
+        self.plays = 0
+        self.prefixes: Set[str] = set()
+        self.grams: Set[str] = set()
+
+    def to_info(self) -> Dict:
+        return {'id': self.video_id, 'title': self.title, 'uploader': self.uploader, 'duration': self.duration}
+
+
+class SearchIndex:
+    """제목/채널명 단어 접두사 → 곡, 트라이그램 → 곡 역인덱스
+
+    모든 입력 단어가 어떤 단어의 접두사인 곡을 먼저 찾고, 없으면 (오타, 띄어쓰기 차이)
+    트라이그램 일치 비율로 찾습니다. 같은 점수면 재생 횟수가 많은 곡이 먼저입니다.
+    """
+
+    def __init__(self, max_entries: int = SEARCH_INDEX_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._tracks: 'OrderedDict[str, IndexedTrack]' = OrderedDict()
+        self._prefix_index: Dict[str, Set[str]] = {}
+        self._trigram_index: Dict[str, Set[str]] = {}
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def get(self, video_id: str) -> Optional[IndexedTrack]:
+        return self._tracks.get(video_id)
+
+    # ---------- 추가 / 제거 ----------
+
+    def add(self, video_id: str, title: str, uploader: str = 'Unknown', duration: int = 0,
+            plays: int = 1) -> Optional[IndexedTrack]:
+        if not video_id or not title:
+            return None
+
+        track = self._tracks.get(video_id)
+        if track is None:
+            track = self._tracks[video_id] = IndexedTrack(video_id, title, uploader, duration)
+            self._index(track)
+            while len(self._tracks) > self.max_entries:
+                self._remove(next(iter(self._tracks)))
+        else:
+            self._tracks.move_to_end(video_id)
+        track.plays += plays
+        return track
+
+    def add_track(self, track: Dict, plays: int = 1):
+        """플레이어 트랙 dict 추가"""
+        return self.add(track.get('id'), track.get('title'), track.get('uploader') or 'Unknown',
+                        int(track.get('duration') or 0), plays)
+
+
+    def _index(self, track: IndexedTrack):
+        for token in set(tokenize(f'{track.title} {track.uploader}')):
+            for length in range(1, min(len(token), SEARCH_PREFIX_MAX) + 1):
+                track.prefixes.add(token[:length])
+        track.grams = trigrams(track.title)
+
+        for prefix in track.prefixes:
+            self._prefix_index.setdefault(prefix, set()).add(track.video_id)
+        for gram in track.grams:
+            self._trigram_index.setdefault(gram, set()).add(track.video_id)
+
+    def _remove(self, video_id: str):
+        track = self._tracks.pop(video_id)
+        for index, keys in ((self._prefix_index, track.prefixes), (self._trigram_index, track.grams)):
+            for key in keys:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(video_id)
+                    if not ids:
+                        del index[key]
+
+    # ---------- 검색 ----------
+
+    def search(self, query: str, limit: int = 25) -> List[IndexedTrack]:
+        tokens = [token[:SEARCH_PREFIX_MAX] for token in tokenize(query)]
+        if not tokens:
+            # 입력 전에는 자주 재생된 곡
+            return heapq.nlargest(limit, self._tracks.values(), key=lambda t: t.plays)
+
+        matches = self._prefix_matches(tokens)
+        if matches:
+            return heapq.nlargest(limit, (self._tracks[video_id] for video_id in matches), key=lambda t: t.plays)
+
+        return self._trigram_matches(query, limit)
+
+    def _prefix_matches(self, tokens: List[str]) -> Set[str]:
+        # 가장 작은 집합부터 교집합
+        sets = sorted((self._prefix_index.get(token, set()) for token in set(tokens)), key=len)
+        if not sets or not sets[0]:
+            return set()
+        result = set(sets[0])
+        for ids in sets[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def _trigram_matches(self, query: str, limit: int) -> List[IndexedTrack]:
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        hits: Dict[str, int] = {}
+        for gram in grams:
+            for video_id in self._trigram_index.get(gram, ()):
+                hits[video_id] = hits.get(video_id, 0) + 1
+
+        scored = []
+        for video_id, count in hits.items():
+            score = count / len(grams)
+            if score >= SEARCH_TRIGRAM_MIN_SCORE:
+                track = self._tracks[video_id]
+                scored.append((score, track.plays, track))
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [track for _, _, track in scored[:limit]]
+
+
+class GuildSearchIndexes:
+    """서버 ID → SearchIndex - 다른 서버에서 재생/검색한 곡은 자동완성에 나오지 않음"""
+
+    def __init__(self, max_entries: int = SEARCH_INDEX_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._guilds: Dict[int, SearchIndex] = {}
+
+    def __len__(self):
+        return sum(len(index) for index in self._guilds.values())
+
+    def guild(self, guild_id: int) -> SearchIndex:
+        index = self._guilds.get(guild_id)
+        if index is None:
+            index = self._guilds[guild_id] = SearchIndex(self.max_entries)
+        return index
+
+    def get(self, guild_id: int, video_id: str) -> Optional[IndexedTrack]:
+        index = self._guilds.get(guild_id)
+        return index.get(video_id) if index else None
+
+    def add_track(self, guild_id: int, track: Dict, plays: int = 1):
+        return self.guild(guild_id).add_track(track, plays)
+
+    def add_many(self, entries: Iterable):
+        """(서버 ID, 재생 기록 항목) 들로 구성 (봇 시작 시)"""
+        for guild_id, entry in entries:
+            self.guild(guild_id).add(entry.video_id, entry.title, entry.uploader, entry.duration)
+
+    def search(self, guild_id: int, query: str, limit: int = 25) -> List[IndexedTrack]:
+        index = self._guilds.get(guild_id)
+        return index.search(query, limit) if index else []
+
+    def remove_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+
+
+search_index = GuildSearchIndexes()
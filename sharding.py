@@ -0,0 +1,229 @@
+# sharding.py - 멀티 프로세스 샤딩 실행 (프로세스별 AutoShardedBot + 로컬 IPC)
+
+import config
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import time
+from typing import Dict, List
+from utils.logging_setup import WORKER_PROCESS_PREFIX, shutdown_logging
+
+logger = logging.getLogger(__name__)
+
+# 샤드 묶음 사이 시작 지연 (Discord IDENTIFY 속도 제한 대응, 초)
+SHARD_START_DELAY = getattr(config, 'SHARD_START_DELAY', 5.0)
+# 워커 통계 공유 주기 (초)
+CLUSTER_STATS_INTERVAL = getattr(config, 'CLUSTER_STATS_INTERVAL', 10.0)
+# 워커 비정상 종료 시 재시작 대기 (초, 최대값)
+WORKER_RESTART_DELAY = getattr(config, 'WORKER_RESTART_DELAY', 5.0)
+WORKER_RESTART_DELAY_MAX = getattr(config, 'WORKER_RESTART_DELAY_MAX', 120.0)
+# 이 시간 이상 정상 동작한 뒤 종료된 워커는 재시작 대기를 처음 값으로 되돌림 (초)
+WORKER_STABLE_UPTIME = getattr(config, 'WORKER_STABLE_UPTIME', 600.0)
+
+# 설정 오류(토큰/인텐트)처럼 재시작해도 해결되지 않는 종료 코드
+EXIT_FATAL = 2
+
+# 워커마다 모듈 싱글톤이 따로 생기므로, 호스트 전체 기준인 아래 제한은 워커 수로 나눠 적용:
+#   FFMPEG_MAX_PROCESSES, EXTRACT_CONCURRENCY (헤지 한도 포함), COOKIE_IDENTITY_RATE
+# 다음은 워커(프로세스)별로 동작: YouTube 차단 감지(circuit_breaker), 쿠키 신원 휴식 상태,
+#   player_client 상태, 추출 소요 시간 통계, 재생 기록/검색 인덱스 메모리, 속도 제한 버킷
+
+
+def resolve_shard_layout(processes, shard_count=None) -> List[List[int]]:
+    """프로세스별 담당 샤드 ID 목록 계산"""
+    if processes == 'auto':
+        processes = os.cpu_count() or 1
+    processes = max(1, int(processes))
+    shard_count = max(processes, int(shard_count or processes))
+
+    layout = [[] for _ in range(processes)]
+    for shard_id in range(shard_count):
+        layout[shard_id % processes].append(shard_id)
+    return layout
+
+
+class ClusterLink:
+    """워커 프로세스 간 공유 통계 채널 (Manager dict 기반)"""
+
+    def __init__(self, index: int, shared_stats):
+        self.index = index
+        self.shared_stats = shared_stats
+        self._task = None
+
+    def start(self, bot):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._publish_loop(bot))
+
+    def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+    def _collect(self, bot) -> Dict:
+        from music.player import players
+        from utils.guild_settings import guild_settings
+        return {
+            'pid': os.getpid(),
+            'shards': list(bot.shard_ids or []),
+            'guilds': len(bot.guilds),
+            'music_guilds': len([g for g in bot.guilds if guild_settings.is_music_enabled(g.id)]),
+            'players': len(players),
+            'playing': len([p for p in players.values() if p.vc and p.vc.is_playing()]),
+            'latency_ms': round(bot.latency * 1000, 1) if math.isfinite(bot.latency) else None,
+            'updated_at': time.time()
+        }
+
+    async def _publish_loop(self, bot):
+        loop = asyncio.get_running_loop()
+        try:
+            while not bot.is_closed():
+                try:
+                    stats = self._collect(bot)
+                    # Manager 프록시 호출은 소켓 왕복이므로 이벤트 루프 밖에서 수행
+                    await loop.run_in_executor(None, self.shared_stats.__setitem__, self.index, stats)
+                except Exception as e:
+                    logger.debug("⚠️ 클러스터 통계 전송 실패: %s", e)
+                await asyncio.sleep(CLUSTER_STATS_INTERVAL)
+        except asyncio.CancelledError:
+            pass
+
+    async def totals(self) -> Dict:
+        """전체 워커 합계"""
+        loop = asyncio.get_running_loop()
+        snapshot = await loop.run_in_executor(None, self.shared_stats.copy)
+
+        totals = {'workers': len(snapshot), 'guilds': 0, 'music_guilds': 0, 'players': 0, 'playing': 0}
+        for stats in snapshot.values():
+            for key in ('guilds', 'music_guilds', 'players', 'playing'):
+                totals[key] += stats.get(key, 0)
+        return totals
+
+
+def _share_host_limits(processes: int):
+    """호스트 전체 제한을 워커 수로 나눠 이 워커의 싱글톤에 적용 (워커당 최소 1)"""
+    if processes <= 1:
+        return
+    from music import extractor
+    from music.cookie_pool import cookie_pool, COOKIE_IDENTITY_RATE
+    from music.ffmpeg_supervisor import supervisor
+
+    supervisor.max_processes = max(1, supervisor.max_processes // processes)
+    extractor.scheduler.max_workers = max(1, extractor.scheduler.max_workers // processes)
+    extractor.scheduler.max_hedges = max(1, extractor.scheduler.max_hedges // processes)
+    if COOKIE_IDENTITY_RATE:
+        burst, refill_seconds = COOKIE_IDENTITY_RATE
+        cookie_pool.set_rate((max(1, burst // processes), refill_seconds * processes))
+
+    logger.info(
+        "🧩 워커당 제한: FFmpeg %s개, 추출 동시 실행 %s개",
+        supervisor.max_processes, extractor.scheduler.max_workers
+    )
+
+
+def _worker_main(index: int, shard_ids: List[int], shard_count: int, shared_stats, processes: int = 1):
+    """워커 프로세스 진입점"""
+    import discord
+    import main
+
+    _share_host_limits(processes)
+
+    bot = main.create_bot(
+        bot_class=main.ShardedMusicBot,
+        shard_ids=shard_ids,
+        shard_count=shard_count
+    )
+    bot.cluster = ClusterLink(index, shared_stats)
+    bot.cluster_index = index
+
+    logger.info("🧩 워커 %s 시작 (pid %s, 샤드 %s/%s)", index, os.getpid(), shard_ids, shard_count)
+    try:
+        bot.run(config.BOT_TOKEN, log_handler=None)  # discord 로그도 큐 핸들러로만 기록
+    except (discord.LoginFailure, discord.PrivilegedIntentsRequired) as e:
+        logger.error("❌ 워커 %s 설정 오류: %s", index, e)
+        shutdown_logging()
+        os._exit(EXIT_FATAL)
+    except Exception as e:
+        logger.error("❌ 워커 %s 실행 오류: %s", index, e)
+        shutdown_logging()
+        os._exit(1)
+
+
+def run_cluster(processes, shard_count=None) -> bool:
+    """워커 프로세스들을 띄우고 감시 (비정상 종료된 워커는 재시작)"""
+    layout = resolve_shard_layout(processes, shard_count)
+    total_shards = sum(len(shards) for shards in layout)
+    logger.info("🧩 샤딩 모드: 프로세스 %s개, 샤드 %s개", len(layout), total_shards)
+
+    # fork 후 스레드 상태 문제를 피하기 위해 spawn 사용
+    ctx = multiprocessing.get_context('spawn')
+    manager = ctx.Manager()
+    shared_stats = manager.dict()
+
+    workers = {}
+    started_at = {}
+    restart_delays = {}
+    stopping = False
+
+    def start_worker(index):
+        process = ctx.Process(
+            target=_worker_main,
+            args=(index, layout[index], total_shards, shared_stats, len(layout)),
+            name=f"{WORKER_PROCESS_PREFIX}{index}",
+            daemon=False
+        )
+        process.start()
+        workers[index] = process
+        started_at[index] = time.monotonic()
+
+    def handle_signal(signum, frame):
+        nonlocal stopping
+        logger.info("📡 종료 시그널 수신: %s, 워커 종료 중...", signum)
+        stopping = True
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    success = True
+    try:
+        for index in range(len(layout)):
+            if stopping:
+                break
+            start_worker(index)
+            time.sleep(SHARD_START_DELAY * len(layout[index]))
+
+        while not stopping:
+            time.sleep(1.0)
+            for index, process in list(workers.items()):
+                if stopping or process.is_alive():
+                    continue
+
+                if process.exitcode == EXIT_FATAL:
+                    logger.error("❌ 워커 %s 설정 오류로 종료, 클러스터 중지", index)
+                    stopping = True
+                    success = False
+                    break
+
+                if time.monotonic() - started_at[index] >= WORKER_STABLE_UPTIME:
+                    # 오래 정상 동작했으면 연속 장애가 아니므로 대기 시간 초기화
+                    restart_delays.pop(index, None)
+                delay = restart_delays.get(index, WORKER_RESTART_DELAY)
+                logger.warning("⚠️ 워커 %s 종료 (코드 %s), %.0f초 후 재시작", index, process.exitcode, delay)
+                shared_stats.pop(index, None)
+                time.sleep(delay)
+                restart_delays[index] = min(delay * 2, WORKER_RESTART_DELAY_MAX)
+                start_worker(index)
+
+    finally:
+        for process in workers.values():
+            if process.is_alive():
+                process.terminate()
+        for process in workers.values():
+            process.join(timeout=15)
+            if process.is_alive():
+                process.kill()
+        manager.shutdown()
+        logger.info("👋 클러스터 종료")
+
+    return success
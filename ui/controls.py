@@ -6,10 +6,19 @@ from discord import SelectOption, ButtonStyle
 from datetime import timedelta
 import asyncio
 import logging
-import time
+from music.history import play_history
+from utils.rate_limiter import rate_limiter
 
 logger = logging.getLogger(__name__)
 
+def _resolve_player(guild_id, bot):
+    """현재 플레이어 조회 (휴면 상태였다면 다시 생성)
+
+    View는 메시지에 오래 붙어 있으므로 플레이어 객체 대신 서버 ID만 보관합니다.
+    """
+    from music.player import get_player
+    return get_player(guild_id, bot)
+
 class MusicDropdown(Select):
     def __init__(self, guild_player):
         options = []
@@ -44,7 +53,12 @@ class MusicDropdown(Select):
             placeholder_text = "대기열이 비어있습니다"
         
         super().__init__(placeholder=placeholder_text, max_values=1, min_values=1, options=options)
-        self.guild_player = guild_player
+        self.guild_id = guild_player.guild_id
+        self.bot = guild_player.bot
+
+    @property
+    def guild_player(self):
+        return _resolve_player(self.guild_id, self.bot)
 
     async def callback(self, interaction: discord.Interaction):
         if not self.guild_player.queue or self.values[0] == "empty":
@@ -74,21 +88,84 @@ class MusicDropdown(Select):
         except (ValueError, IndexError):
             await interaction.response.send_message("잘못된 선택입니다.", ephemeral=True)
 
+class HistoryDropdown(Select):
+    """최근 재생한 곡을 검색 없이 다시 추가"""
+
+    def __init__(self, guild_player, entries):
+        options = []
+        for entry in entries:
+            duration = entry.duration
+            options.append(SelectOption(
+                label=entry.title[:100],
+                description=f"{entry.uploader} - {duration//60}:{duration%60:02d}"[:100],
+                value=entry.video_id
+            ))
+        
+        super().__init__(placeholder="🔁 최근 재생한 곡 다시 듣기", max_values=1, min_values=1, options=options)
+        self.guild_id = guild_player.guild_id
+        self.bot = guild_player.bot
+
+    @property
+    def guild_player(self):
+        return _resolve_player(self.guild_id, self.bot)
+
+    async def callback(self, interaction: discord.Interaction):
+        user_id = interaction.user.id
+        try:
+            if not await self.view._check_interaction_cooldown(interaction, 3.0):
+                return
+            
+            if not interaction.user.voice or not interaction.user.voice.channel:
+                await interaction.response.send_message("❌ 음성 채널에 먼저 참여해주세요.", ephemeral=True)
+                return
+            
+            entry = play_history.get(self.guild_id, self.values[0])
+            if entry is None:
+                await interaction.response.send_message("❌ 재생 기록에서 곡을 찾을 수 없습니다.", ephemeral=True)
+                return
+            
+            await interaction.response.send_message(f"🔁 '{entry.title[:50]}'을(를) 대기열에 추가했습니다.", ephemeral=True)
+            asyncio.create_task(self.guild_player.enqueue_known_track({
+                'id': entry.video_id,
+                'title': entry.title,
+                'duration': entry.duration,
+                'uploader': entry.uploader
+            }, interaction.user))
+            
+        except Exception as e:
+            logger.error("❌ 재생 기록 선택 오류: %s", e)
+            if not interaction.response.is_done():
+                await interaction.response.send_message("❌ 오류가 발생했습니다.", ephemeral=True)
+        finally:
+            self.view._processing_users.discard(user_id)
+
 class MusicView(View):
     def __init__(self, guild_player):
         super().__init__(timeout=None)
-        self.guild_player = guild_player
-        self._last_interaction = {}
+        self.guild_id = guild_player.guild_id
+        self.bot = guild_player.bot
         self._processing_users = set()  # 처리 중인 사용자 추적
         
+        # 라디오 모드 상태 표시
+        if guild_player.radio_enabled:
+            self.radio_button.style = ButtonStyle.primary
+        
         # 대기열이 있을 때만 드롭다운 추가
         if guild_player.queue:
             self.add_item(MusicDropdown(guild_player))
+        
+        # 재생 기록이 있으면 다시 듣기 드롭다운 추가
+        recent = play_history.recent(guild_player.guild_id)
+        if recent:
+            self.add_item(HistoryDropdown(guild_player, recent))
+
+    @property
+    def guild_player(self):
+        return _resolve_player(self.guild_id, self.bot)
 
     async def _check_interaction_cooldown(self, interaction: discord.Interaction, cooldown_seconds: float = 3.0) -> bool:
-        """상호작용 쿨다운 체크"""
+        """상호작용 쿨다운 체크 (봇 전체 공용 토큰 버킷, 무거운 버튼일수록 토큰을 많이 사용)"""
         user_id = interaction.user.id
-        current_time = time.time()
         
         # 이미 처리 중인 사용자 체크
         if user_id in self._processing_users:
@@ -98,21 +175,18 @@ class MusicView(View):
             )
             return False
         
-        # 재생 중일 때는 쿨다운 증가
-        if self.guild_player.vc and self.guild_player.vc.is_playing():
-            cooldown_seconds *= 1.5
-        
-        if user_id in self._last_interaction:
-            time_diff = current_time - self._last_interaction[user_id]
-            if time_diff < cooldown_seconds:
-                remaining = cooldown_seconds - time_diff
+        decision = rate_limiter.check('interaction', user_id, self.guild_id, cost=cooldown_seconds / 2.0)
+        if not decision:
+            if decision.notify:
                 await interaction.response.send_message(
-                    f"⏳ 너무 빠른 요청입니다. {remaining:.1f}초 후에 다시 시도해주세요.",
+                    f"⏳ 너무 빠른 요청입니다. {decision.retry_after:.1f}초 후에 다시 시도해주세요.",
                     ephemeral=True
                 )
-                return False
+            else:
+                # 연속 거절은 알림 없이 응답만 (상호작용 실패 표시 방지)
+                await interaction.response.defer()
+            return False
         
-        self._last_interaction[user_id] = current_time
         self._processing_users.add(user_id)  # 처리 시작
         return True
 
@@ -139,7 +213,7 @@ class MusicView(View):
                 await interaction.response.send_message("⏸️ 재생 중인 음악이 없습니다.", ephemeral=True)
                 
         except Exception as e:
-            logger.error(f"❌ 정지 버튼 오류: {e}")
+            logger.error("❌ 정지 버튼 오류: %s", e)
             await interaction.response.send_message("❌ 오류가 발생했습니다.", ephemeral=True)
         finally:
             if interaction.user.id in self._processing_users:
@@ -152,20 +226,17 @@ class MusicView(View):
             if not await self._check_interaction_cooldown(interaction, 2.0):
                 return
             
-            if not self.guild_player.vc or not self.guild_player.vc.is_playing():
+            # 끊김 복구 중 (스트림 재추출) 인 곡도 건너뛸 수 있음
+            skipped = self.guild_player.skip_current()
+            if skipped is None:
                 await interaction.response.send_message("⏸️ 재생 중인 음악이 없습니다.", ephemeral=True)
                 return
             
-            # 현재 재생 중인 곡 정보
-            current_title = "알 수 없음"
-            if self.guild_player.current:
-                current_title = self.guild_player.current[0].get('title', '알 수 없음')[:30]
-            
-            self.guild_player.vc.stop()
+            current_title = skipped.get('title', '알 수 없음')[:30]
             await interaction.response.send_message(f"⏭️ '{current_title}'을(를) 건너뛰었습니다.", ephemeral=True)
             
         except Exception as e:
-            logger.error(f"❌ 건너뛰기 버튼 오류: {e}")
+            logger.error("❌ 건너뛰기 버튼 오류: %s", e)
             await interaction.response.send_message("❌ 오류가 발생했습니다.", ephemeral=True)
         finally:
             if interaction.user.id in self._processing_users:
@@ -177,6 +248,30 @@ class MusicView(View):
         """믹스 20곡 추가"""
         await self._handle_mix_button(interaction, 20)
         
+    @discord.ui.button(label="📻", style=ButtonStyle.secondary, row=0)
+    async def radio_button(self, interaction: discord.Interaction, button: Button):
+        """라디오 모드 켜기/끄기 (대기열이 줄어들면 믹스에서 자동으로 채움)"""
+        try:
+            if not await self._check_interaction_cooldown(interaction, 2.0):
+                return
+            
+            enabled = not self.guild_player.radio_enabled
+            self.guild_player.set_radio(enabled)
+            button.style = ButtonStyle.primary if enabled else ButtonStyle.secondary
+            await interaction.response.edit_message(view=self)
+            
+            if enabled and not self.guild_player.current:
+                await interaction.followup.send(
+                    "📻 라디오 모드를 켰습니다. 곡을 재생하면 비슷한 곡이 이어서 재생됩니다.", ephemeral=True
+                )
+            
+        except Exception as e:
+            logger.error("❌ 라디오 버튼 오류: %s", e)
+            await interaction.response.send_message("❌ 오류가 발생했습니다.", ephemeral=True)
+        finally:
+            if interaction.user.id in self._processing_users:
+                self._processing_users.remove(interaction.user.id)
+
     @discord.ui.button(label="🛑", style=ButtonStyle.danger, row=0)
     async def stop_button(self, interaction: discord.Interaction, button: Button):
         """완전 중지 버튼"""
@@ -188,7 +283,9 @@ class MusicView(View):
                 await interaction.response.send_message("❌ 음성 채널에 연결되지 않았습니다.", ephemeral=True)
                 return
             
-            # 완전 중지
+            # 완전 중지 (라디오가 다시 채우지 않도록 함께 끔)
+            if self.guild_player.radio_enabled:
+                self.guild_player.set_radio(False)
             self.guild_player.queue.clear()
             self.guild_player.current = []
             if self.guild_player.vc.is_playing():
@@ -198,7 +295,7 @@ class MusicView(View):
             await interaction.response.send_message("🛑 플레이어를 완전히 중지했습니다.", ephemeral=True)
             
         except Exception as e:
-            logger.error(f"❌ 중지 버튼 오류: {e}")
+            logger.error("❌ 중지 버튼 오류: %s", e)
             await interaction.response.send_message("❌ 오류가 발생했습니다.", ephemeral=True)
         finally:
             if interaction.user.id in self._processing_users:
@@ -244,7 +341,7 @@ class MusicView(View):
             asyncio.create_task(self._process_mix_addition_delayed(video_id, count, user_id))
             
         except Exception as e:
-            logger.error(f"❌ 믹스 버튼 처리 오류: {e}")
+            logger.error("❌ 믹스 버튼 처리 오류: %s", e)
             try:
                 await interaction.followup.send(f"❌ 오류 발생", ephemeral=True)
             except:
@@ -267,12 +364,12 @@ class MusicView(View):
             
             # 결과는 로그로만 확인
             if result['success']:
-                logger.info(f"✅ 믹스 {result['added_count']}곡 즉시 추가 완료 (사용자: {user_id})")
+                logger.info("✅ 믹스 %s곡 즉시 추가 완료 (사용자: %s)", result['added_count'], user_id)
             else:
-                logger.warning(f"⚠️ 믹스 추가 실패: {result['message']} (사용자: {user_id})")
+                logger.warning("⚠️ 믹스 추가 실패: %s (사용자: %s)", result['message'], user_id)
                 
         except Exception as e:
-            logger.error(f"❌ 백그라운드 믹스 처리 오류: {e} (사용자: {user_id})")
+            logger.error("❌ 백그라운드 믹스 처리 오류: %s (사용자: %s)", e, user_id)
         finally:
             # 처리 완료
             if user_id in self._processing_users:
@@ -0,0 +1,222 @@
+# utils/guild_settings.py - 서버별 음악 채널 설정 저장소 (메모리 인덱스 + 지연 원자적 저장)
+
+import config
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+GUILD_SETTINGS_FILE = getattr(config, 'GUILD_SETTINGS_FILE', 'guild_settings.json')
+# 마지막 변경 후 파일에 쓰기까지 대기 시간 (초)
+SETTINGS_SAVE_DELAY = getattr(config, 'SETTINGS_SAVE_DELAY', 2.0)
+
+
+class GuildSettings:
+    """서버 ID 인덱스와 채널 ID → 서버 ID 역인덱스를 가진 설정 저장소
+
+    조회는 모두 메모리 dict/set 조회이고, 변경은 모아서 임시 파일 작성 후
+    rename 하는 방식으로 이벤트 루프 밖에서 저장합니다.
+    """
+
+    def __init__(self, path: str = GUILD_SETTINGS_FILE, save_delay: float = SETTINGS_SAVE_DELAY):
+        self.path = path
+        self.save_delay = save_delay
+        self._settings: Dict[int, Dict[str, int]] = {}
+        self._channel_index: Dict[int, int] = {}
+        self._dirty = set()
+        self._save_handle = None
+        self._save_task = None
+        self._write_lock = threading.Lock()
+        self._load()
+
+    # ---------- 조회 ----------
+
+    def is_music_channel(self, channel_id: int) -> bool:
+        """음악 채널 여부 (on_message 핫패스용 단일 조회)"""
+        return channel_id in self._channel_index
+
+    def guild_for_channel(self, channel_id: int) -> Optional[int]:
+        return self._channel_index.get(channel_id)
+
+    def is_music_enabled(self, guild_id: int) -> bool:
+        return bool(self._settings.get(guild_id, {}).get('music_channel_id'))
+
+    def get_music_channel(self, guild_id: int) -> Optional[int]:
+        return self._settings.get(guild_id, {}).get('music_channel_id')
+
+    def get_music_message(self, guild_id: int) -> Optional[int]:
+        return self._settings.get(guild_id, {}).get('music_message_id')
+
+    def is_radio_enabled(self, guild_id: int) -> bool:
+        return bool(self._settings.get(guild_id, {}).get('radio'))
+
+    def music_guild_ids(self):
+        return [guild_id for guild_id in self._settings if self.is_music_enabled(guild_id)]
+
+    # ---------- 변경 ----------
+
+    def set_music_channel(self, guild_id: int, channel_id: int):
+        entry = self._settings.setdefault(guild_id, {})
+        old_channel_id = entry.get('music_channel_id')
+        if old_channel_id and self._channel_index.get(old_channel_id) == guild_id:
+            del self._channel_index[old_channel_id]
+
+        entry['music_channel_id'] = channel_id
+        self._channel_index[channel_id] = guild_id
+        self._mark_dirty(guild_id)
+
+    def set_music_message(self, guild_id: int, message_id: int):
+        entry = self._settings.setdefault(guild_id, {})
+        if entry.get('music_message_id') == message_id:
+            return
+        entry['music_message_id'] = message_id
+        self._mark_dirty(guild_id)
+
+    def set_radio_enabled(self, guild_id: int, enabled: bool):
+        entry = self._settings.setdefault(guild_id, {})
+        if bool(entry.get('radio')) == enabled:
+            return
+        if enabled:
+            entry['radio'] = True
+        else:
+            entry.pop('radio', None)
+        self._mark_dirty(guild_id)
+
+    def remove_guild(self, guild_id: int):
+        entry = self._settings.pop(guild_id, None)
+        if entry is None:
+            return
+        channel_id = entry.get('music_channel_id')
+        if channel_id and self._channel_index.get(channel_id) == guild_id:
+            del self._channel_index[channel_id]
+        self._mark_dirty(guild_id)
+
+    # ---------- 저장 ----------
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except Exception as e:
+            logger.error("❌ 서버 설정 로드 실패: %s", e)
+            data = {}
+
+        for guild_id, entry in data.items():
+            guild_id = int(guild_id)
+            self._settings[guild_id] = dict(entry)
+            channel_id = entry.get('music_channel_id')
+            if channel_id:
+                self._channel_index[channel_id] = guild_id
+
+        logger.info("📁 서버 설정 로드: %s개 서버", len(self._settings))
+
+    def _mark_dirty(self, guild_id: int):
+        self._dirty.add(guild_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖(시작 전/종료 후)에서는 즉시 저장
+            self.flush()
+            return
+
+        self._schedule_save(loop)
+
+    def _schedule_save(self, loop):
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.save_delay, self._start_save, loop)
+
+    def _take_changes(self) -> Dict[int, Optional[Dict[str, int]]]:
+        changes = {}
+        for guild_id in self._dirty:
+            entry = self._settings.get(guild_id)
+            changes[guild_id] = dict(entry) if entry is not None else None
+        self._dirty = set()
+        return changes
+
+    def _start_save(self, loop):
+        self._save_handle = None
+        if self._dirty:
+            # 이전 저장이 끝난 뒤에 변경분을 가져가므로 오래된 스냅샷이 새 것을 덮어쓰지 않음
+            self._save_task = loop.create_task(self._save(loop, self._save_task))
+
+    async def _save(self, loop, previous):
+        if previous is not None and not previous.done():
+            await asyncio.wait([previous])
+        changes = self._take_changes()
+        if changes and not await loop.run_in_executor(None, self._write_changes, changes):
+            # 실패한 서버는 다시 변경 대상으로 (값은 저장 시점의 최신 설정을 다시 읽음)
+            self._dirty.update(changes)
+            self._schedule_save(loop)
+
+    def flush(self):
+        """대기 중인 변경 사항을 즉시 저장 (봇 종료 시)"""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        changes = self._take_changes()
+        if changes and not self._write_changes(changes):
+            self._dirty.update(changes)
+
+    def _write_changes(self, changes: Dict[int, Optional[Dict[str, int]]]) -> bool:
+        """파일 잠금 → 최신 파일에 변경분 병합 → 임시 파일 작성 → rename (성공 여부 반환)
+
+        샤딩 모드에서 여러 워커가 같은 파일을 쓰므로 전체 덮어쓰기 대신
+        자기 변경분만 병합합니다.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with self._write_lock:
+            lock_file = None
+            try:
+                if fcntl:
+                    lock_file = open(self.path + '.lock', 'w')
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    data = {}
+
+                for guild_id, entry in changes.items():
+                    if entry is None:
+                        data.pop(str(guild_id), None)
+                    else:
+                        data[str(guild_id)] = entry
+
+                fd, temp_path = tempfile.mkstemp(prefix='.guild_settings-', suffix='.tmp', dir=directory)
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, indent=2, ensure_ascii=False)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temp_path, self.path)
+                except Exception:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    raise
+
+                logger.debug("💾 서버 설정 저장: %d개 변경", len(changes))
+                return True
+
+            except Exception as e:
+                logger.error("❌ 서버 설정 저장 실패: %s", e)
+                return False
+            finally:
+                if lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+
+
+guild_settings = GuildSettings()
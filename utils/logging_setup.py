@@ -0,0 +1,136 @@
+# utils/logging_setup.py - 큐 기반 비동기 로깅 (백그라운드 스레드에서 파일 쓰기 + 크기 기준 회전/압축)
+
+import config
+import atexit
+import gzip
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import threading
+from typing import Optional
+
+LOG_FILE = getattr(config, 'LOG_FILE', 'bot.log')
+LOG_LEVEL = getattr(config, 'LOG_LEVEL', 'INFO')
+# 파일 하나의 최대 크기 / 보관할 압축 파일 수
+LOG_MAX_BYTES = getattr(config, 'LOG_MAX_BYTES', 10 * 1024 * 1024)
+LOG_BACKUP_COUNT = getattr(config, 'LOG_BACKUP_COUNT', 5)
+# 대기열이 가득 차면 (디스크 정지 등) 기록을 버리고 호출 스레드는 막지 않음
+LOG_QUEUE_SIZE = getattr(config, 'LOG_QUEUE_SIZE', 10000)
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 샤딩 워커 프로세스 이름 접두사 (워커별 로그 파일 구분용)
+WORKER_PROCESS_PREFIX = 'music-bot-worker-'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional['NonBlockingQueueHandler'] = None
+_setup_lock = threading.Lock()
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """put_nowait만 사용하는 QueueHandler - 가득 차면 기록을 버리고 개수만 셈"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _gzip_namer(name: str) -> str:
+    return name + '.gz'
+
+
+def _gzip_rotator(source: str, dest: str):
+    """회전된 로그를 gzip으로 압축 (리스너 스레드에서 실행)"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def worker_log_file(index: int, base: str = LOG_FILE) -> str:
+    """샤딩 워커별 로그 파일 경로 (bot.log → bot.worker-0.log)"""
+    root, ext = os.path.splitext(base)
+    return f'{root}.worker-{index}{ext or ".log"}'
+
+
+def _default_log_file() -> str:
+    # spawn으로 시작된 워커는 메인 모듈을 다시 import 하므로 프로세스 이름으로 구분
+    name = multiprocessing.current_process().name
+    if name.startswith(WORKER_PROCESS_PREFIX):
+        suffix = name[len(WORKER_PROCESS_PREFIX):]
+        if suffix.isdigit():
+            return worker_log_file(int(suffix))
+    return LOG_FILE
+
+
+def setup_logging(log_file: Optional[str] = None, level=None, console: bool = True):
+    """루트 로거를 큐 핸들러 하나로 교체하고 파일/콘솔 쓰기는 리스너 스레드에서 수행 (최초 1회)"""
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        log_file = log_file or _default_log_file()
+        formatter = logging.Formatter(LOG_FORMAT)
+
+        handlers = []
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8',
+            delay=True
+        )
+        file_handler.namer = _gzip_namer
+        file_handler.rotator = _gzip_rotator
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+        if console:
+            console_handler = logging.StreamHandler(sys.stderr)
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _queue_handler = NonBlockingQueueHandler(log_queue)
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_queue_handler)
+        root.setLevel(level or LOG_LEVEL)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """대기 중인 로그를 모두 쓰고 리스너 종료"""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        try:
+            handler.flush()
+            handler.close()
+        except Exception:
+            pass
+
+
+def dropped_records() -> int:
+    """대기열이 가득 차서 버려진 로그 수"""
+    return _queue_handler.dropped if _queue_handler else 0
@@ -0,0 +1,195 @@
+# utils/loop_watchdog.py - 이벤트 루프 지연 감시 (막힌 순간의 스택을 호출 위치별로 집계)
+
+import config
+import asyncio
+import io
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# 하트비트 주기 / 막힘으로 판단할 지연 (초)
+LOOP_WATCHDOG_INTERVAL = getattr(config, 'LOOP_WATCHDOG_INTERVAL', 0.1)
+LOOP_BLOCK_THRESHOLD = getattr(config, 'LOOP_BLOCK_THRESHOLD', 0.25)
+# 호출 위치별로 보관할 스택 깊이
+LOOP_STACK_DEPTH = getattr(config, 'LOOP_STACK_DEPTH', 12)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+LOOP_LAG = metrics.registry.histogram(
+    'musicbot_event_loop_lag_seconds', 'Event loop heartbeat latency',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+LOOP_BLOCKS = metrics.registry.counter(
+    'musicbot_event_loop_blocks_total', 'Heartbeats delayed past the block threshold')
+
+
+def _is_project_frame(filename: str) -> bool:
+    path = os.path.abspath(filename)
+    return (path.startswith(_PROJECT_ROOT + os.sep) and path != _THIS_FILE and
+            'site-packages' not in path)
+
+
+def _describe(frame) -> Tuple[str, List[str]]:
+    """막고 있는 프레임의 호출 위치 (가장 안쪽의 봇 코드) 와 스택 요약"""
+    if frame is None:
+        return 'unknown', []
+
+    stack = traceback.format_stack(frame, limit=LOOP_STACK_DEPTH)
+    current = frame
+    while current is not None:
+        code = current.f_code
+        if _is_project_frame(code.co_filename):
+            path = os.path.relpath(code.co_filename, _PROJECT_ROOT)
+            return f'{path}:{current.f_lineno} ({code.co_name})', stack
+        current = current.f_back
+
+    code = frame.f_code
+    return f'{os.path.basename(code.co_filename)}:{frame.f_lineno} ({code.co_name})', stack
+
+
+class Offender:
+    """호출 위치 하나의 막힘 통계"""
+
+    __slots__ = ('site', 'count', 'total', 'max', 'last_seen', 'stack')
+
+    def __init__(self, site: str):
+        self.site = site
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last_seen = 0.0
+        self.stack: List[str] = []
+
+
+class LoopWatchdog:
+    """별도 스레드에서 call_soon_threadsafe 하트비트를 보내 루프 응답 시간을 측정
+
+    응답이 threshold를 넘으면 그 순간 이벤트 루프 스레드의 스택을 캡처해
+    가장 안쪽 봇 코드 위치 기준으로 횟수/누적 시간을 집계합니다.
+    """
+
+    def __init__(self, interval: float = LOOP_WATCHDOG_INTERVAL, threshold: float = LOOP_BLOCK_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.offenders: Dict[str, Offender] = {}
+        self.heartbeats = 0
+        self.blocks = 0
+        self.max_lag = 0.0
+        self.started_at = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._beat = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """이벤트 루프 스레드에서 호출 (중복 호출 무시)"""
+        if self.running or self.threshold <= 0:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop_event.clear()
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='loop-watchdog', daemon=True)
+        self._thread.start()
+        logger.info("🐢 이벤트 루프 감시 시작 (임계값 %.0fms)", self.threshold * 1000)
+
+    def stop(self):
+        self._stop_event.set()
+        self._beat.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self._beat.clear()
+            sent = time.perf_counter()
+            try:
+                self._loop.call_soon_threadsafe(self._beat.set)
+            except RuntimeError:
+                # 루프 종료됨
+                return
+
+            if not self._beat.wait(self.threshold):
+                # 루프가 아직 막혀 있는 동안 스택 캡처
+                frame = sys._current_frames().get(self._loop_thread_id)
+                site, stack = _describe(frame)
+                del frame
+                while not self._beat.wait(self.interval):
+                    if self._stop_event.is_set():
+                        return
+                self._record_block(site, stack, time.perf_counter() - sent)
+
+            lag = time.perf_counter() - sent
+            LOOP_LAG.observe(lag)
+            self.heartbeats += 1
+            if lag > self.max_lag:
+                self.max_lag = lag
+
+    def _record_block(self, site: str, stack: List[str], lag: float):
+        with self._lock:
+            offender = self.offenders.get(site)
+            if offender is None:
+                offender = self.offenders[site] = Offender(site)
+            offender.count += 1
+            offender.total += lag
+            offender.max = max(offender.max, lag)
+            offender.last_seen = time.time()
+            offender.stack = stack
+            self.blocks += 1
+
+        LOOP_BLOCKS.inc()
+        logger.warning("🐢 이벤트 루프 %.0fms 막힘: %s\n%s", lag * 1000, site, ''.join(stack))
+
+    def reset(self):
+        with self._lock:
+            self.offenders.clear()
+            self.heartbeats = 0
+            self.blocks = 0
+            self.max_lag = 0.0
+            self.started_at = time.monotonic()
+
+    def top_offenders(self, top: int = 10) -> List[Offender]:
+        with self._lock:
+            offenders = list(self.offenders.values())
+        return sorted(offenders, key=lambda o: o.total, reverse=True)[:top]
+
+    def render_summary(self, top: int = 10) -> str:
+        """누적 막힘 시간 기준 상위 호출 위치"""
+        uptime = time.monotonic() - self.started_at if self.started_at else 0.0
+        out = io.StringIO()
+        out.write(
+            f"감시 {uptime / 60:.0f}분, 하트비트 {self.heartbeats}회, "
+            f"막힘 {self.blocks}회 (임계값 {self.threshold * 1000:.0f}ms), 최대 {self.max_lag * 1000:.0f}ms\n"
+        )
+        offenders = self.top_offenders(top)
+        if not offenders:
+            out.write("\n막힘 기록 없음\n")
+            return out.getvalue()
+
+        out.write("\n  횟수    누적(s)   최대(ms)  위치\n")
+        for offender in offenders:
+            out.write(f"{offender.count:6d}  {offender.total:9.2f}  {offender.max * 1000:9.0f}  {offender.site}\n")
+        return out.getvalue()
+
+    def render_stacks(self, top: int = 10) -> str:
+        """상위 호출 위치별 마지막 캡처 스택"""
+        out = io.StringIO()
+        for offender in self.top_offenders(top):
+            out.write(f"=== {offender.site} ({offender.count}회, 최대 {offender.max * 1000:.0f}ms)\n")
+            out.write(''.join(offender.stack))
+            out.write('\n')
+        return out.getvalue()
+
+
+loop_watchdog = LoopWatchdog()
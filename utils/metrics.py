@@ -0,0 +1,241 @@
+# utils/metrics.py - 경량 메트릭 레지스트리 + Prometheus 텍스트 형식 HTTP 엔드포인트
+
+import config
+import asyncio
+import bisect
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 0이면 엔드포인트 비활성화
+METRICS_HOST = getattr(config, 'METRICS_HOST', '127.0.0.1')
+METRICS_PORT = getattr(config, 'METRICS_PORT', 9108)
+
+# 초 단위 지연 시간 기본 버킷
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터 (스레드 안전)"""
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _render_samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {value}' for key, value in items]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지 - 값은 스크레이프 시점에 콜백으로 계산 (평소 비용 없음)"""
+    type_name = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 collect: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, collect: Callable[[], Dict[Tuple[str, ...], float]]):
+        self._collect = collect
+
+    def _render_samples(self):
+        if self._collect:
+            try:
+                items = list(self._collect().items())
+            except Exception as e:
+                logger.debug("⚠️ 게이지 수집 실패 %s: %s", self.name, e)
+                items = []
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {value}' for key, value in items]
+
+
+class Histogram(_Metric):
+    """고정 버킷 히스토그램 (관측 1회 = 이진 탐색 + 정수 증가)"""
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [버킷별 개수..., +Inf 개수, 합계]
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def _render_samples(self):
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, 'le="%s"' % bound)
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            cumulative += series[len(self.buckets)]
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {series[-1]}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._server = None
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), collect=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, collect))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    async def start_server(self, host: str = METRICS_HOST, port: int = METRICS_PORT):
+        """/metrics 엔드포인트 시작 (port가 0이면 비활성화)"""
+        if not port or self._server:
+            return
+        try:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+            logger.info("📈 메트릭 엔드포인트: http://%s:%s/metrics", host, port)
+        except OSError as e:
+            logger.error("❌ 메트릭 엔드포인트 시작 실패 (%s:%s): %s", host, port, e)
+
+    async def stop_server(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            # 헤더는 읽고 버림
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+                if not line or line in (b'\r\n', b'\n'):
+                    break
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) >= 2 and parts[0] == 'GET' and parts[1].split('?')[0] in ('/metrics', '/'):
+                body = self.render().encode('utf-8')
+                status = '200 OK'
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            else:
+                body = b'not found\n'
+                status = '404 Not Found'
+                content_type = 'text/plain'
+
+            writer.write(
+                f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+                f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug("⚠️ 메트릭 요청 처리 실패: %s", e)
+        finally:
+            writer.close()
+
+
+registry = MetricsRegistry()
+
+# ---------- 봇 공용 메트릭 ----------
+
+SEARCH_API_LATENCY = registry.histogram(
+    'musicbot_search_api_seconds', 'YouTube Data API search latency')
+EXTRACT_LATENCY = registry.histogram(
+    'musicbot_extract_info_seconds', 'yt-dlp extract_info latency per option profile', ('profile',))
+VOICE_CONNECT_LATENCY = registry.histogram(
+    'musicbot_voice_connect_seconds', 'Voice channel connect/move latency')
+TIME_TO_FIRST_AUDIO = registry.histogram(
+    'musicbot_time_to_first_audio_seconds', 'Message receipt to audio start latency')
+STAGE_FAILURES = registry.counter(
+    'musicbot_stage_failures_total', 'Pipeline failures by stage and kind', ('stage', 'kind'))
+
+EXECUTOR_BACKLOG = registry.gauge(
+    'musicbot_executor_backlog', 'Queued work items in player thread pools', ('pool',))
+ACTIVE_PLAYERS = registry.gauge(
+    'musicbot_active_players', 'Guild players in memory')
+HIBERNATED_PLAYERS = registry.gauge(
+    'musicbot_hibernated_players', 'Idle guild players reduced to channel/message IDs')
+QUEUE_LENGTH = registry.gauge(
+    'musicbot_queue_tracks', 'Tracks waiting in all guild queues')
+FFMPEG_PROCESSES = registry.gauge(
+    'musicbot_ffmpeg_processes', 'Running ffmpeg processes')
+
+
+def record_failure(stage: str, error: BaseException = None, kind: str = None):
+    """단계별 실패 카운트 (타임아웃은 kind='timeout')"""
+    if kind is None:
+        kind = 'timeout' if isinstance(error, asyncio.TimeoutError) else 'error'
+    STAGE_FAILURES.inc(stage=stage, kind=kind)
@@ -0,0 +1,148 @@
+# utils/profiler.py - 런타임 샘플링 프로파일러 (실행 중에만 비용 발생)
+
+import asyncio
+import collections
+import io
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 샘플링 간격 (초)
+PROFILE_SAMPLE_INTERVAL = 0.005
+# 이벤트 루프 지연 측정 간격 (초)
+LOOP_LAG_PROBE_INTERVAL = 0.05
+
+
+def _thread_label(thread_id: int, names: Dict[int, str], main_thread_id: int) -> str:
+    if thread_id == main_thread_id:
+        return 'event-loop'
+    return names.get(thread_id, f'thread-{thread_id}')
+
+
+def _collapse(frame) -> str:
+    """스택을 'root;...;leaf' 형식으로 변환"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{frame.f_lineno})')
+        frame = frame.f_back
+    parts.reverse()
+    return ';'.join(parts)
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class SamplingProfiler:
+    """sys._current_frames() 기반 샘플링 프로파일러 (이벤트 루프 + 추출 스레드)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running = False
+
+    async def profile(self, seconds: float, loop: Optional[asyncio.AbstractEventLoop] = None) -> Dict:
+        """seconds 동안 샘플링 후 결과 반환 (동시에 하나만 실행)"""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("이미 프로파일링이 실행 중입니다.")
+
+        self.running = True
+        loop = loop or asyncio.get_running_loop()
+        stop_event = threading.Event()
+        lag_samples: List[float] = []
+
+        try:
+            lag_task = asyncio.create_task(self._measure_loop_lag(seconds, lag_samples))
+            # 기본 executor가 추출 작업으로 밀려 있어도 바로 시작하도록 전용 스레드 사용
+            sampler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profiler")
+            try:
+                stacks = await loop.run_in_executor(
+                    sampler, self._sample_threads, seconds, threading.main_thread().ident, stop_event
+                )
+            finally:
+                sampler.shutdown(wait=False)
+            await lag_task
+        finally:
+            stop_event.set()
+            self.running = False
+            self._lock.release()
+
+        return {
+            'seconds': seconds,
+            'stacks': stacks,
+            'loop_lag_ms': {
+                'samples': len(lag_samples),
+                'p50': _percentile(lag_samples, 50) * 1000,
+                'p90': _percentile(lag_samples, 90) * 1000,
+                'p99': _percentile(lag_samples, 99) * 1000,
+                'max': max(lag_samples, default=0.0) * 1000,
+            }
+        }
+
+    def _sample_threads(self, seconds: float, main_thread_id: int, stop_event: threading.Event):
+        stacks = collections.Counter()
+        own_id = threading.get_ident()
+        deadline = time.perf_counter() + seconds
+
+        while time.perf_counter() < deadline and not stop_event.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                label = _thread_label(thread_id, names, main_thread_id)
+                stacks[f'{label};{_collapse(frame)}'] += 1
+            time.sleep(PROFILE_SAMPLE_INTERVAL)
+
+        return stacks
+
+    async def _measure_loop_lag(self, seconds: float, samples: List[float]):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            expected = time.perf_counter() + LOOP_LAG_PROBE_INTERVAL
+            await asyncio.sleep(LOOP_LAG_PROBE_INTERVAL)
+            samples.append(max(0.0, time.perf_counter() - expected))
+
+
+def render_collapsed(result: Dict) -> bytes:
+    """flamegraph.pl / speedscope 호환 collapsed-stack 파일"""
+    lines = [f'{stack} {count}' for stack, count in result['stacks'].most_common()]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def render_summary(result: Dict, top: int = 15) -> str:
+    """가장 많이 샘플링된 leaf 함수 요약"""
+    lag = result['loop_lag_ms']
+    leaf_counts = collections.Counter()
+    thread_counts = collections.Counter()
+    total = 0
+    for stack, count in result['stacks'].items():
+        parts = stack.split(';')
+        thread_counts[parts[0]] += count
+        leaf_counts[f'[{parts[0]}] {parts[-1]}'] += count
+        total += count
+
+    out = io.StringIO()
+    out.write(f"샘플링 {result['seconds']:.0f}초, 샘플 {total}개\n")
+    out.write(
+        f"이벤트 루프 지연: p50 {lag['p50']:.1f}ms / p90 {lag['p90']:.1f}ms / "
+        f"p99 {lag['p99']:.1f}ms / 최대 {lag['max']:.1f}ms ({lag['samples']}회 측정)\n\n"
+    )
+    out.write("스레드별 샘플:\n")
+    for name, count in thread_counts.most_common(10):
+        out.write(f"  {count:6d}  {name}\n")
+    out.write("\n상위 leaf 함수:\n")
+    for name, count in leaf_counts.most_common(top):
+        out.write(f"  {count:6d}  {name}\n")
+    return out.getvalue()
+
+
+profiler = SamplingProfiler()
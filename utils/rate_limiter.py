@@ -0,0 +1,146 @@
+# utils/rate_limiter.py - 봇 전체 공용 토큰 버킷 (사용자별 + 서버별, 크기/시간 제한 저장소)
+
+import config
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+from utils import metrics
+
+# 종류별 (버스트 토큰 수, 토큰 1개 충전 시간(초))
+RATE_LIMITS = {
+    'message': {
+        'user': getattr(config, 'MESSAGE_RATE_USER', (3, 5.0)),
+        'guild': getattr(config, 'MESSAGE_RATE_GUILD', (10, 1.0)),
+    },
+    'interaction': {
+        'user': getattr(config, 'INTERACTION_RATE_USER', (4, 2.0)),
+        'guild': getattr(config, 'INTERACTION_RATE_GUILD', (15, 0.5)),
+    },
+}
+# 버킷 저장소 최대 크기 / 미사용 버킷 제거 시간 (초)
+RATE_LIMIT_MAX_ENTRIES = getattr(config, 'RATE_LIMIT_MAX_ENTRIES', 50000)
+RATE_LIMIT_TTL = getattr(config, 'RATE_LIMIT_TTL', 600.0)
+
+RATE_LIMITED = metrics.registry.counter(
+    'musicbot_rate_limited_total', 'Requests rejected by the rate limiter', ('kind', 'scope'))
+
+
+class TokenBucket:
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+
+    def refill(self, now: float, burst: int, refill_seconds: float):
+        if now > self.updated:
+            self.tokens = min(burst, self.tokens + (now - self.updated) / refill_seconds)
+            self.updated = now
+
+    def retry_after(self, cost: float, refill_seconds: float) -> float:
+        return max(0.0, (cost - self.tokens) * refill_seconds)
+
+
+class ExpiringDict:
+    """접근 순서 기준 OrderedDict - 최대 크기 초과 또는 TTL 지난 항목을 앞에서부터 제거"""
+
+    def __init__(self, max_entries: int = RATE_LIMIT_MAX_ENTRIES, ttl: float = RATE_LIMIT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: 'OrderedDict[Hashable, Tuple[float, object]]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable, now: float):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if now - item[0] > self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        self._data[key] = (now, item[1])
+        return item[1]
+
+    def set(self, key: Hashable, value, now: float):
+        self._data[key] = (now, value)
+        self._data.move_to_end(key)
+        self._evict(now)
+
+    def _evict(self, now: float):
+        data = self._data
+        while data:
+            key, (touched, _) = next(iter(data.items()))
+            if len(data) > self.max_entries or now - touched > self.ttl:
+                del data[key]
+            else:
+                break
+
+
+class RateDecision:
+    __slots__ = ('allowed', 'retry_after', 'scope', 'notify')
+
+    def __init__(self, allowed: bool, retry_after: float = 0.0, scope: Optional[str] = None, notify: bool = False):
+        self.allowed = allowed
+        self.retry_after = retry_after
+        self.scope = scope
+        # 거절 알림을 보내야 하는지 (같은 사용자의 연속 거절은 알림 하나로 합침)
+        self.notify = notify
+
+    def __bool__(self):
+        return self.allowed
+
+
+class RateLimiter:
+    """사용자/서버 버킷을 모두 통과해야 허용 - 거절되면 어느 쪽 토큰도 소비하지 않음"""
+
+    def __init__(self, limits: Dict = RATE_LIMITS, max_entries: int = RATE_LIMIT_MAX_ENTRIES,
+                 ttl: float = RATE_LIMIT_TTL):
+        self.limits = limits
+        self._buckets = ExpiringDict(max_entries, ttl)
+        # (종류, 사용자) → 이 시각까지 추가 거절 알림 생략
+        self._notices = ExpiringDict(max_entries, ttl)
+
+    def _bucket(self, key, burst: int, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key, now)
+        if bucket is None:
+            bucket = TokenBucket(burst, now)
+            self._buckets.set(key, bucket, now)
+        return bucket
+
+    def check(self, kind: str, user_id: int, guild_id: Optional[int], cost: float = 1.0) -> RateDecision:
+        now = time.monotonic()
+        limits = self.limits[kind]
+        scopes = [('user', user_id)]
+        if guild_id is not None:
+            scopes.append(('guild', guild_id))
+
+        buckets = []
+        for scope, key in scopes:
+            burst, refill_seconds = limits[scope]
+            bucket = self._bucket((kind, scope, key), burst, now)
+            bucket.refill(now, burst, refill_seconds)
+            if bucket.tokens < cost:
+                RATE_LIMITED.inc(kind=kind, scope=scope)
+                retry_after = bucket.retry_after(cost, refill_seconds)
+                return RateDecision(False, retry_after, scope, self._should_notify(kind, user_id, now, retry_after))
+            buckets.append(bucket)
+
+        for bucket in buckets:
+            bucket.tokens -= cost
+        return RateDecision(True)
+
+    def _should_notify(self, kind: str, user_id: int, now: float, retry_after: float) -> bool:
+        key = (kind, user_id)
+        quiet_until = self._notices.get(key, now)
+        if quiet_until is not None and now < quiet_until:
+            return False
+        self._notices.set(key, now + max(retry_after, 1.0), now)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {'buckets': len(self._buckets), 'notices': len(self._notices)}
+
+
+rate_limiter = RateLimiter()
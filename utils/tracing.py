@@ -0,0 +1,101 @@
+# utils/tracing.py - 요청 단위 추적 (contextvars로 스레드/이벤트 루프 경계를 넘어 전달)
+
+import config
+import contextvars
+import functools
+import json
+import logging
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+trace_logger = logging.getLogger('musicbot.trace')
+
+# 추적할 요청 비율 (0.0 ~ 1.0)
+TRACE_SAMPLE_RATE = getattr(config, 'TRACE_SAMPLE_RATE', 0.1)
+
+_current_trace = contextvars.ContextVar('musicbot_trace', default=None)
+
+
+class Trace:
+    """요청 하나의 추적 정보 - 스팬은 구조화된 JSON 로그 한 줄로 출력"""
+
+    __slots__ = ('request_id', 'name', 'started', 'attrs')
+
+    def __init__(self, name: str, **attrs):
+        self.request_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started = time.perf_counter()
+        self.attrs = attrs
+
+    def emit(self, span: str, duration: float, status: str = 'ok', **attrs):
+        record = {
+            'trace': self.name,
+            'request_id': self.request_id,
+            'span': span,
+            'duration_ms': round(duration * 1000, 1),
+            'offset_ms': round((time.perf_counter() - self.started - duration) * 1000, 1),
+            'status': status,
+        }
+        record.update(self.attrs)
+        record.update(attrs)
+        trace_logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+    def finish(self, status: str = 'ok', **attrs):
+        """요청 전체 소요 시간 기록"""
+        self.emit('total', time.perf_counter() - self.started, status, **attrs)
+
+
+def start_trace(name: str, sample_rate: float = None, **attrs) -> Optional[Trace]:
+    """샘플링에 당첨되면 새 추적 생성 (현재 컨텍스트에는 설정하지 않음)"""
+    rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate <= 0 or (rate < 1 and random.random() >= rate):
+        return None
+    return Trace(name, **attrs)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def attach(trace: Optional[Trace]):
+    """현재 컨텍스트(태스크)에 추적 연결"""
+    _current_trace.set(trace)
+
+
+@contextmanager
+def use(trace: Optional[Trace]):
+    """블록 동안만 추적 연결 (콜백 등 다른 컨텍스트에서 사용)"""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """시간 측정 스팬 (추적 중이 아니면 비용 거의 없음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        trace.emit(name, time.perf_counter() - started, 'error', error=type(e).__name__, **attrs)
+        raise
+    trace.emit(name, time.perf_counter() - started, **attrs)
+
+
+def bind(fn):
+    """현재 컨텍스트를 복사해서 run_in_executor 스레드에서도 추적이 이어지도록 감쌈"""
+    if _current_trace.get() is None:
+        return fn
+    context = contextvars.copy_context()
+    return functools.partial(context.run, fn)